@@ -0,0 +1,212 @@
+# core/backends.py
+
+import json
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Backend inferensi CPU yang didukung DetectMultiBackend, urut dari yang biasanya
+# paling cepat di laptop CPU-only. Dipakai oleh mode 'auto' jika belum ada laporan benchmark.
+BACKENDS = ('openvino', 'onnx', 'torchscript', 'pytorch')
+BACKEND_LABELS = {'auto': "Auto (fastest)", 'pytorch': "PyTorch", 'torchscript': "TorchScript",
+                  'onnx': "ONNX Runtime", 'openvino': "OpenVINO"}
+# Backend yang menerima ukuran input berbeda-beda (dibutuhkan oleh input ROI persegi panjang).
+DYNAMIC_SHAPE_BACKENDS = ('pytorch', 'onnx')
+# Backend yang menerima batch > 1 (ONNX diekspor dengan dynamic=True, termasuk sumbu batch).
+# TorchScript dan OpenVINO diekspor dengan batch 1, jadi kamera diinferensi satu per satu.
+BATCH_BACKENDS = ('pytorch', 'onnx')
+
+
+def artefact_path(weights, backend, int8=False):
+    """
+    Mengembalikan path artefak hasil ekspor yang disimpan di samping file bobot.
+
+    Args:
+        weights (str | Path): Path ke best.pt.
+        backend (str): Salah satu dari BACKENDS.
+        int8 (bool): True untuk varian terkuantisasi INT8.
+
+    Returns:
+        Path: Path artefak (file atau folder untuk OpenVINO).
+    """
+    weights = Path(weights)
+    stem = weights.stem + ('_int8' if int8 else '')
+    if backend == 'pytorch':
+        return weights
+    if backend == 'torchscript':
+        return weights.with_name(f"{stem}.torchscript")
+    if backend == 'onnx':
+        return weights.with_name(f"{stem}.onnx")
+    if backend == 'openvino':
+        return weights.with_name(f"{stem}_openvino_model")
+    raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+
+
+def is_cached(weights, backend, int8=False):
+    """True jika artefak sudah ada dan tidak lebih tua dari file bobotnya."""
+    path = artefact_path(weights, backend, int8)
+    if not path.exists():
+        return False
+    return path.stat().st_mtime >= Path(weights).stat().st_mtime
+
+
+def backend_available(backend):
+    """Mengecek apakah runtime untuk backend tersebut terpasang."""
+    modules = {'onnx': 'onnxruntime', 'openvino': 'openvino'}
+    if backend not in modules:
+        return True
+    try:
+        __import__(modules[backend])
+        return True
+    except ImportError:
+        return False
+
+
+def report_path(weights):
+    """Path laporan perbandingan backend (ditulis oleh tools/compare_backends.py)."""
+    weights = Path(weights)
+    return weights.with_name(f"{weights.stem}.backends.json")
+
+
+def _iter_calibration_images(calibration, limit=300):
+    """Menghasilkan frame BGR dari folder gambar atau file video rekaman untuk kalibrasi INT8."""
+    import cv2
+    path = Path(calibration)
+    if path.is_dir():
+        files = sorted(p for p in path.iterdir() if p.suffix.lower() in ('.jpg', '.jpeg', '.png', '.bmp'))
+        for image_path in files[:limit]:
+            frame = cv2.imread(str(image_path))
+            if frame is not None:
+                yield frame
+        return
+    cap = cv2.VideoCapture(str(path))
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or limit
+    step = max(1, total // limit) # Ambil sampel merata di sepanjang rekaman
+    index = 0
+    while cap.isOpened():
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if index % step == 0:
+            yield frame
+        index += 1
+    cap.release()
+
+
+def _quantize_onnx(fp32_path, int8_path, calibration, img_size):
+    """Kuantisasi statis INT8 (QDQ) memakai ONNX Runtime dengan frame rekaman sebagai kalibrasi."""
+    import onnxruntime
+    from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+    from core.preprocess import LetterboxPreprocessor
+
+    input_name = onnxruntime.InferenceSession(str(fp32_path), providers=['CPUExecutionProvider']).get_inputs()[0].name
+
+    class RecordingCalibrationReader(CalibrationDataReader):
+        def __init__(self):
+            self.preprocessor = LetterboxPreprocessor(img_size)
+            self.frames = _iter_calibration_images(calibration)
+
+        def get_next(self):
+            frame = next(self.frames, None)
+            if frame is None:
+                return None
+            # Salin karena buffer preprocessor dipakai ulang di frame berikutnya.
+            return {input_name: self.preprocessor(frame).numpy().copy()}
+
+    quantize_static(str(fp32_path), str(int8_path), RecordingCalibrationReader(),
+                    quant_format=QuantFormat.QDQ, activation_type=QuantType.QUInt8,
+                    weight_type=QuantType.QInt8, per_channel=True)
+
+
+def export_backend(weights, backend, img_size=640, int8=False, calibration=None):
+    """
+    Mengekspor best.pt ke backend tertentu memakai export.py milik YOLOv5 dan
+    menyimpannya di samping file bobot. Tidak melakukan apa-apa jika sudah ter-cache.
+
+    Args:
+        weights (str | Path): Path ke best.pt.
+        backend (str): 'torchscript', 'onnx', atau 'openvino'.
+        img_size (int): Ukuran input saat ekspor.
+        int8 (bool): Kuantisasi INT8 (ONNX / OpenVINO), membutuhkan calibration.
+        calibration (str | Path | None): Folder gambar atau video rekaman untuk kalibrasi INT8.
+
+    Returns:
+        Path: Path artefak yang siap dimuat DetectMultiBackend.
+    """
+    target = artefact_path(weights, backend, int8)
+    if backend == 'pytorch' or is_cached(weights, backend, int8):
+        return target
+    if int8 and backend == 'torchscript':
+        raise ValueError("INT8 is only supported for the ONNX and OpenVINO backends.")
+    if int8 and calibration is None:
+        raise ValueError("INT8 export needs a calibration set (folder of images or a recorded video).")
+
+    from core.detector import YOLOV5_ROOT_PATH # Memastikan path YOLOv5 sudah terdaftar
+    import export as yolov5_export
+
+    print(f"Mengekspor {weights} ke {backend}{' INT8' if int8 else ''}...")
+    if backend == 'onnx':
+        fp32_path = artefact_path(weights, 'onnx')
+        if not is_cached(weights, 'onnx'):
+            # dynamic=True agar input ROI persegi panjang tetap bisa dipakai.
+            yolov5_export.run(weights=str(weights), imgsz=(img_size, img_size), include=('onnx',),
+                              device='cpu', dynamic=True, simplify=True)
+        if int8:
+            _quantize_onnx(fp32_path, target, calibration, img_size)
+    elif backend == 'openvino':
+        data_yaml = None
+        if int8:
+            # Kalibrasi NNCF di export.py membaca dataset dari file yaml; arahkan ke gambar rekaman.
+            calibration_dir = Path(calibration)
+            if not calibration_dir.is_dir():
+                calibration_dir = Path(tempfile.mkdtemp(prefix='asv_calib_'))
+                import cv2
+                for i, frame in enumerate(_iter_calibration_images(calibration)):
+                    cv2.imwrite(str(calibration_dir / f"{i:05d}.jpg"), frame)
+            data_yaml = Path(tempfile.mkdtemp(prefix='asv_calib_')) / 'calibration.yaml'
+            data_yaml.write_text(f"path: {calibration_dir}\ntrain: .\nval: .\nnames: {{0: ball}}\n")
+        extra = {'int8': True, 'data': str(data_yaml)} if int8 else {}
+        yolov5_export.run(weights=str(weights), imgsz=(img_size, img_size), include=('openvino',),
+                          device='cpu', **extra)
+        if int8 and not target.exists():
+            # Versi export.py lama menamai hasil INT8 sama dengan FP32; pindahkan ke nama varian INT8.
+            artefact_path(weights, 'openvino').rename(target)
+    elif backend == 'torchscript':
+        yolov5_export.run(weights=str(weights), imgsz=(img_size, img_size), include=('torchscript',), device='cpu')
+    else:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+    return target
+
+
+def resolve_backend(weights, backend='auto', int8=False, img_size=640, calibration=None):
+    """
+    Menentukan artefak model yang akan dimuat.
+
+    'auto' memilih backend tercepat yang sudah ter-cache: menurut laporan
+    tools/compare_backends.py jika ada, jika tidak menurut urutan BACKENDS.
+    Mode 'auto' tidak pernah mengekspor; backend eksplisit diekspor bila belum ada.
+
+    Returns:
+        tuple: (nama backend, Path artefak)
+    """
+    if backend != 'auto':
+        return backend, export_backend(weights, backend, img_size, int8, calibration)
+
+    order = list(BACKENDS)
+    report = report_path(weights)
+    if report.exists():
+        try:
+            results = json.loads(report.read_text())['results']
+            ranked = sorted((r for r in results if np.isfinite(r.get('median_ms', np.nan))),
+                            key=lambda r: r['median_ms'])
+            order = [r['backend'] for r in ranked if r.get('int8', False) == int8] + order
+        except (ValueError, KeyError) as e:
+            print(f"Laporan backend {report} tidak bisa dibaca: {e}")
+
+    for name in order:
+        if name == 'pytorch':
+            return name, Path(weights)
+        if backend_available(name) and is_cached(weights, name, int8):
+            return name, artefact_path(weights, name, int8)
+    return 'pytorch', Path(weights)
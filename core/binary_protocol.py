@@ -0,0 +1,207 @@
+# core/binary_protocol.py
+
+import binascii
+import struct
+
+import numpy as np
+
+# --- Negosiasi versi (dikirim sebagai baris teks, sehingga firmware lama cukup mengabaikannya) ---
+PROTOCOL_VERSION = 1
+HELLO_REQUEST = f"P:BIN{PROTOCOL_VERSION}" # GUI -> ESP32: minta beralih ke protokol biner
+HELLO_ACK = f"P:BIN{PROTOCOL_VERSION} OK" # ESP32 -> GUI: baris teks terakhir sebelum aliran biner
+# GUI -> ESP32: kembali ke protokol teks. Mode biner firmware bertahan sampai board di-reset,
+# jadi sesi teks memintanya eksplisit; firmware lama mengabaikan baris ini.
+TEXT_REQUEST = "P:TXT"
+
+# --- Tipe pesan ---
+MSG_TELEMETRY = 0x01 # ESP32 -> GUI
+MSG_TEXT = 0x02 # ESP32 -> GUI, pesan/log UTF-8
+MSG_SETPOINT = 0x10 # GUI -> ESP32
+MSG_ESTOP = 0x11 # GUI -> ESP32, tanpa payload
+
+# Perintah teks emergency stop (motor netral, kemudi lurus); di protokol biner dikirim sebagai MSG_ESTOP.
+ESTOP_COMMAND = "S1500;D90"
+
+# Frame (sebelum COBS): [tipe u8][seq u8][payload][crc16 u16 LE]; setelah COBS diakhiri byte 0x00.
+HEADER = struct.Struct('<BB')
+CRC = struct.Struct('<H')
+MAX_FRAME_LENGTH = 256
+
+# Telemetri: waktu ESP32 (ms), flag field valid, lat/lon (1e-7 derajat), satelit,
+# baterai (mV), heading (0.01 derajat), kecepatan (cm/s). 20 byte, little-endian.
+TELEMETRY = struct.Struct('<IBiiBHHH')
+TELEMETRY_DTYPE = np.dtype([('time_ms', '<u4'), ('flags', 'u1'), ('lat', '<i4'), ('lon', '<i4'), ('sats', 'u1'),
+                            ('battery_mv', '<u2'), ('heading_cdeg', '<u2'), ('speed_cms', '<u2')])
+FLAG_GPS, FLAG_BATTERY, FLAG_COMPASS, FLAG_SPEED = 0x01, 0x02, 0x04, 0x08
+# Setpoint: PWM motor (us) dan derajat servo.
+SETPOINT = struct.Struct('<HB')
+
+
+def crc16(data):
+    """CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF), sama dengan implementasi di firmware."""
+    return binascii.crc_hqx(data, 0xFFFF)
+
+
+def cobs_encode(data):
+    """Consistent Overhead Byte Stuffing: hasilnya tidak mengandung byte 0x00."""
+    out = bytearray()
+    for chunk in bytes(data).split(b'\x00'):
+        while len(chunk) >= 254:
+            out.append(0xFF)
+            out += chunk[:254]
+            chunk = chunk[254:]
+        out.append(len(chunk) + 1)
+        out += chunk
+    return bytes(out)
+
+
+def cobs_decode(data):
+    """Kebalikan cobs_encode; ValueError jika data bukan COBS yang valid."""
+    # Jalur cepat: setiap byte kode (selain yang pertama) menandai posisi satu byte 0x00,
+    # jadi cukup ditimpa di tempat. Blok 0xFF (254 byte tanpa nol) memakai jalur umum.
+    out = bytearray(data)
+    i, n = 0, len(out)
+    while i < n:
+        code = out[i]
+        if code == 0 or i + code > n:
+            raise ValueError("invalid COBS block")
+        if code == 0xFF:
+            return _cobs_decode_blocks(data)
+        out[i] = 0
+        i += code
+    return bytes(out[1:])
+
+
+def _cobs_decode_blocks(data):
+    out = bytearray()
+    i, n = 0, len(data)
+    while i < n:
+        code = data[i]
+        end = i + code
+        if code == 0 or end > n:
+            raise ValueError("invalid COBS block")
+        out += data[i + 1:end]
+        i = end
+        if code < 0xFF and i < n:
+            out.append(0)
+    return bytes(out)
+
+
+class FrameEncoder:
+    """Membuat frame biner siap kirim dengan nomor urut per arah."""
+    def __init__(self):
+        self.seq = 0
+
+    def encode(self, msg_type, payload=b''):
+        body = HEADER.pack(msg_type, self.seq) + payload
+        self.seq = (self.seq + 1) & 0xFF
+        return cobs_encode(body + CRC.pack(crc16(body))) + b'\x00'
+
+    def setpoint(self, pwm, degree):
+        """Frame MSG_SETPOINT; ValueError jika nilai tidak muat di payload (PWM u16, derajat u8)."""
+        if not (0 <= pwm <= 0xFFFF and 0 <= degree <= 0xFF):
+            raise ValueError(f"setpoint out of range: pwm={pwm}, degree={degree}")
+        return self.encode(MSG_SETPOINT, SETPOINT.pack(pwm, degree))
+
+    def estop(self):
+        return self.encode(MSG_ESTOP)
+
+    def command(self, text):
+        """
+        Menerjemahkan perintah teks yang dipakai GUI ("S1550;D90") menjadi frame setpoint,
+        sehingga pemanggil send_data tidak perlu tahu protokol yang aktif.
+        """
+        speed, _, degree = text.strip().partition(';')
+        if not (speed.startswith('S') and degree.startswith('D')):
+            raise ValueError(f"unsupported command {text!r}")
+        return self.setpoint(int(speed[1:]), int(degree[1:]))
+
+
+class FrameDecoder:
+    """
+    Memotong aliran byte menjadi frame (pembatas 0x00) di satu bytearray yang dipakai
+    ulang, lalu memeriksa COBS, CRC, dan nomor urut. Frame rusak dibuang dan dihitung.
+    """
+    def __init__(self, max_frame=MAX_FRAME_LENGTH):
+        self.buffer = bytearray()
+        self.max_frame = max_frame
+        self.expected_seq = None
+        self.frames = 0
+        self.crc_errors = 0 # Frame dengan CRC salah (korupsi di jalur)
+        self.malformed = 0 # COBS tidak valid, terlalu pendek, atau terlalu panjang
+        self.lost = 0 # Frame yang hilang menurut lompatan nomor urut
+
+    def feed(self, data):
+        """
+        Menambahkan potongan byte dan mengembalikan semua frame yang valid.
+
+        Returns:
+            list[tuple]: (tipe pesan, seq, payload bytes) per frame.
+        """
+        buf = self.buffer
+        buf += data
+        frames = []
+        start = 0
+        while True:
+            end = buf.find(b'\x00', start)
+            if end < 0:
+                break
+            if end > start:
+                frame = self._decode(buf[start:end])
+                if frame is not None:
+                    frames.append(frame)
+            start = end + 1
+        del buf[:start]
+        if len(buf) > self.max_frame:
+            self.malformed += 1
+            buf.clear()
+        return frames
+
+    def _decode(self, encoded):
+        if len(encoded) > self.max_frame:
+            self.malformed += 1
+            return None
+        try:
+            body = cobs_decode(encoded)
+        except ValueError:
+            self.malformed += 1
+            return None
+        if len(body) < HEADER.size + CRC.size:
+            self.malformed += 1
+            return None
+        if crc16(body[:-CRC.size]) != CRC.unpack_from(body, len(body) - CRC.size)[0]:
+            self.crc_errors += 1
+            return None
+        msg_type, seq = HEADER.unpack_from(body)
+        if self.expected_seq is not None:
+            self.lost += (seq - self.expected_seq) & 0xFF
+        self.expected_seq = (seq + 1) & 0xFF
+        self.frames += 1
+        return msg_type, seq, body[HEADER.size:-CRC.size]
+
+    def reset(self):
+        self.buffer.clear()
+        self.expected_seq = None
+
+
+def pack_telemetry(time_ms=0, lat=None, lon=None, sats=0, battery=None, heading=None, speed=None):
+    """Membuat payload MSG_TELEMETRY; field None ditandai tidak valid lewat flag."""
+    flags = ((FLAG_GPS if lat is not None and lon is not None else 0) | (FLAG_BATTERY if battery is not None else 0)
+             | (FLAG_COMPASS if heading is not None else 0) | (FLAG_SPEED if speed is not None else 0))
+    return TELEMETRY.pack(time_ms & 0xFFFFFFFF, flags, round((lat or 0.0) * 1e7), round((lon or 0.0) * 1e7), sats,
+                          round((battery or 0.0) * 1000), round((heading or 0.0) * 100) % 36000,
+                          round((speed or 0.0) * 100))
+
+
+def decode_telemetry_batch(payloads):
+    """
+    Mendekode banyak payload telemetri sekaligus dengan NumPy (mis. untuk log atau
+    analisis), dalam satuan SI: lat/lon derajat, baterai V, heading derajat, kecepatan m/s.
+
+    Returns:
+        dict[str, np.ndarray]: Satu array per field.
+    """
+    raw = np.frombuffer(b''.join(payloads), dtype=TELEMETRY_DTYPE)
+    return {'time_ms': raw['time_ms'], 'flags': raw['flags'], 'lat': raw['lat'] * 1e-7, 'lon': raw['lon'] * 1e-7,
+            'sats': raw['sats'], 'battery': raw['battery_mv'] / 1000.0, 'heading': raw['heading_cdeg'] / 100.0,
+            'speed': raw['speed_cms'] / 100.0}
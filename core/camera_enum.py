@@ -0,0 +1,204 @@
+# core/camera_enum.py
+
+import glob
+import os
+import re
+import struct
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+# Impor QThread dan pyqtSignal agar pemindaian kamera tidak membekukan GUI
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# --- Konstanta V4L2 (linux/videodev2.h) untuk membaca info kamera tanpa membuka stream ---
+def _iowr(nr, size, read_only=False):
+    direction = 2 if read_only else 3 # _IOC_READ atau _IOC_READ|_IOC_WRITE
+    return (direction << 30) | (size << 16) | (ord('V') << 8) | nr
+
+_CAPABILITY_FMT = '16s32s32sIII3I' # struct v4l2_capability (104 byte)
+_FMTDESC_FMT = 'III32sII3I' # struct v4l2_fmtdesc (64 byte)
+_FRMSIZE_FMT = 'III6I2I' # struct v4l2_frmsizeenum (44 byte)
+VIDIOC_QUERYCAP = _iowr(0, struct.calcsize(_CAPABILITY_FMT), read_only=True)
+VIDIOC_ENUM_FMT = _iowr(2, struct.calcsize(_FMTDESC_FMT))
+VIDIOC_ENUM_FRAMESIZES = _iowr(74, struct.calcsize(_FRMSIZE_FMT))
+V4L2_CAP_VIDEO_CAPTURE = 0x00000001
+V4L2_CAP_DEVICE_CAPS = 0x80000000
+V4L2_BUF_TYPE_VIDEO_CAPTURE = 1
+V4L2_FRMSIZE_TYPE_DISCRETE = 1
+
+
+class CameraInfo:
+    """Informasi satu kamera yang ditemukan."""
+    __slots__ = ('index', 'device', 'name', 'formats')
+
+    def __init__(self, index, device=None, name=None, formats=None):
+        self.index = index # Indeks untuk cv2.VideoCapture
+        self.device = device # Path node perangkat, mis. /dev/video0 (Linux)
+        self.name = name or f"Camera {index}"
+        self.formats = formats or {} # FOURCC -> daftar resolusi (lebar, tinggi)
+
+    @property
+    def resolutions(self):
+        """Semua resolusi unik yang didukung, dari yang terbesar."""
+        sizes = {size for sizes in self.formats.values() for size in sizes}
+        return sorted(sizes, key=lambda s: s[0] * s[1], reverse=True)
+
+    def label(self):
+        """Teks untuk dropdown, diawali 'Camera N' seperti sebelumnya."""
+        text = f"Camera {self.index}: {self.name}"
+        if self.resolutions:
+            w, h = self.resolutions[0]
+            text += f" (up to {w}x{h})"
+        return text
+
+
+def _query_v4l2(device):
+    """
+    Membaca nama, kapabilitas, format, dan resolusi kamera lewat ioctl V4L2.
+    Node hanya dibuka sebagai file; stream video tidak pernah dimulai.
+
+    Returns:
+        tuple | None: (nama, {fourcc: [(w, h), ...]}) atau None jika bukan node capture.
+    """
+    import fcntl
+    fd = os.open(device, os.O_RDWR | os.O_NONBLOCK)
+    try:
+        buf = bytearray(struct.calcsize(_CAPABILITY_FMT))
+        fcntl.ioctl(fd, VIDIOC_QUERYCAP, buf)
+        _, card, _, _, caps, device_caps, *_ = struct.unpack(_CAPABILITY_FMT, buf)
+        if caps & V4L2_CAP_DEVICE_CAPS:
+            caps = device_caps
+        # Kamera UVC biasanya punya node kedua khusus metadata; lewati yang bukan capture.
+        if not caps & V4L2_CAP_VIDEO_CAPTURE:
+            return None
+        name = card.split(b'\0', 1)[0].decode(errors='ignore').strip()
+
+        formats = {}
+        fmt_index = 0
+        while True:
+            desc = bytearray(struct.pack(_FMTDESC_FMT, fmt_index, V4L2_BUF_TYPE_VIDEO_CAPTURE, 0, b'', 0, 0, 0, 0, 0))
+            try:
+                fcntl.ioctl(fd, VIDIOC_ENUM_FMT, desc)
+            except OSError:
+                break
+            pixelformat = struct.unpack(_FMTDESC_FMT, desc)[4]
+            fourcc = struct.pack('<I', pixelformat).decode(errors='ignore')
+            sizes = []
+            size_index = 0
+            while True:
+                frmsize = bytearray(struct.pack(_FRMSIZE_FMT, size_index, pixelformat, 0, *([0] * 8)))
+                try:
+                    fcntl.ioctl(fd, VIDIOC_ENUM_FRAMESIZES, frmsize)
+                except OSError:
+                    break
+                _, _, size_type, *union = struct.unpack(_FRMSIZE_FMT, frmsize)
+                if size_type == V4L2_FRMSIZE_TYPE_DISCRETE:
+                    sizes.append((union[0], union[1]))
+                else:
+                    # Stepwise/continuous: laporkan batas maksimum saja.
+                    sizes.append((union[1], union[4]))
+                    break
+                size_index += 1
+            formats[fourcc] = sizes
+            fmt_index += 1
+        return name, formats
+    finally:
+        os.close(fd)
+
+
+class CameraEnumerator:
+    """
+    Mendaftar kamera yang tersedia dengan cepat dan menyimpan hasilnya di cache.
+
+    Di Linux, informasi dibaca dari /dev/video*, sysfs, dan ioctl V4L2 tanpa membuka
+    stream. Di sistem lain (atau jika V4L2 tidak tersedia), indeks kamera diprobe
+    secara paralel dengan cv2.VideoCapture.
+    """
+    def __init__(self, ttl=30.0, max_index=10):
+        """
+        Args:
+            ttl (float): Umur cache (detik) sebelum pemindaian ulang.
+            max_index (int): Jumlah indeks yang diprobe pada mode fallback.
+        """
+        self.ttl = ttl
+        self.max_index = max_index
+        self._cache = None
+        self._cache_time = 0.0
+
+    def enumerate(self, force=False):
+        """
+        Mengembalikan daftar CameraInfo, dari cache jika masih berlaku.
+
+        Args:
+            force (bool): Abaikan cache dan pindai ulang.
+        """
+        if not force and self._cache is not None and time.monotonic() - self._cache_time < self.ttl:
+            return self._cache
+        cameras = self._enumerate_v4l2() if sys.platform.startswith('linux') else None
+        if cameras is None:
+            cameras = self._probe_parallel(range(self.max_index))
+        self._cache = cameras
+        self._cache_time = time.monotonic()
+        return cameras
+
+    def _enumerate_v4l2(self):
+        """Pemindaian lewat node /dev/video*; None jika tidak bisa dipakai."""
+        devices = glob.glob('/dev/video*')
+        if not devices and not os.path.isdir('/sys/class/video4linux'):
+            return None
+        cameras = []
+        for device in sorted(devices, key=lambda d: int(re.sub(r'\D', '', d) or 0)):
+            index = int(re.sub(r'\D', '', device) or 0)
+            name = None
+            try:
+                with open(f'/sys/class/video4linux/video{index}/name') as f:
+                    name = f.read().strip()
+            except OSError:
+                pass
+            try:
+                result = _query_v4l2(device)
+            except OSError:
+                # Tidak ada izin ioctl (mis. sandbox); anggap node capture dan pakai nama sysfs.
+                cameras.append(CameraInfo(index, device, name))
+                continue
+            if result is None:
+                continue
+            card_name, formats = result
+            cameras.append(CameraInfo(index, device, name or card_name, formats))
+        return cameras
+
+    def _probe_parallel(self, indices):
+        """Fallback: membuka semua indeks sekaligus di thread pool, bukan satu per satu."""
+        def probe(index):
+            cap = cv2.VideoCapture(index)
+            try:
+                if not cap.isOpened():
+                    return None
+                size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+                return CameraInfo(index, formats={'': [size]} if all(size) else {})
+            finally:
+                cap.release()
+
+        with ThreadPoolExecutor(max_workers=len(indices) or 1) as pool:
+            return [info for info in pool.map(probe, indices) if info is not None]
+
+
+class CameraScanThread(QThread):
+    """Menjalankan CameraEnumerator di thread latar agar tombol Refresh tidak membekukan GUI."""
+    # Dipancarkan dengan daftar CameraInfo saat pemindaian selesai.
+    cameras_found = pyqtSignal(list)
+
+    def __init__(self, enumerator, force=False):
+        super().__init__()
+        self.enumerator = enumerator
+        self.force = force
+
+    def run(self):
+        try:
+            cameras = self.enumerator.enumerate(force=self.force)
+        except Exception as e:
+            print(f"Error saat memindai kamera: {e}")
+            cameras = []
+        self.cameras_found.emit(cameras)
@@ -0,0 +1,147 @@
+# core/capture_profile.py
+
+import time
+
+import cv2
+
+
+class CaptureProfile:
+    """
+    Pengaturan kamera yang diterapkan saat kamera dibuka: FOURCC, resolusi, FPS,
+    ukuran buffer driver, dan apakah read() selalu mengambil frame paling baru.
+    Nilai None berarti pengaturan bawaan kamera tidak diubah.
+    """
+    __slots__ = ('name', 'fourcc', 'width', 'height', 'fps', 'buffer_size', 'grab_newest')
+
+    def __init__(self, name, fourcc=None, width=None, height=None, fps=None, buffer_size=None, grab_newest=False):
+        self.name = name
+        self.fourcc = fourcc # Mis. 'MJPG' (dikompresi di kamera, bandwidth USB kecil) atau 'YUYV'
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.buffer_size = buffer_size # CAP_PROP_BUFFERSIZE; 1 = tidak ada antrian frame basi
+        self.grab_newest = grab_newest # Buang frame yang sudah menumpuk di buffer sebelum retrieve
+
+    def describe(self):
+        parts = [self.fourcc or 'default format']
+        if self.width and self.height:
+            parts.append(f"{self.width}x{self.height}")
+        if self.fps:
+            parts.append(f"@{self.fps:g} fps")
+        if self.buffer_size:
+            parts.append(f"buffer {self.buffer_size}")
+        if self.grab_newest:
+            parts.append("newest frame")
+        return " ".join(parts)
+
+
+# Profil yang bisa dipilih di tab video dan tools/capture_latency.py.
+CAPTURE_PROFILES = {
+    'default': CaptureProfile("Camera default"),
+    'low_latency': CaptureProfile("Low latency 640x480 MJPG", 'MJPG', 640, 480, 30, buffer_size=1, grab_newest=True),
+    'low_latency_720p': CaptureProfile("Low latency 1280x720 MJPG", 'MJPG', 1280, 720, 30, buffer_size=1,
+                                       grab_newest=True),
+    'yuyv_480p': CaptureProfile("YUYV 640x480", 'YUYV', 640, 480, 30, buffer_size=1, grab_newest=True),
+}
+
+
+def decode_fourcc(value):
+    """Mengubah nilai CAP_PROP_FOURCC (float) menjadi teks 4 karakter."""
+    code = int(value)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip('\0')
+
+
+def apply_profile(cap, profile):
+    """
+    Menerapkan profil ke cv2.VideoCapture yang sudah terbuka. FOURCC diatur lebih
+    dulu karena resolusi dan FPS yang tersedia bergantung pada format.
+
+    Returns:
+        dict: Nilai yang benar-benar dinegosiasikan kamera (fourcc, width, height, fps, buffer_size).
+    """
+    if profile.fourcc:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*profile.fourcc))
+    if profile.width and profile.height:
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, profile.width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, profile.height)
+    if profile.fps:
+        cap.set(cv2.CAP_PROP_FPS, profile.fps)
+    if profile.buffer_size:
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, profile.buffer_size)
+    return {'fourcc': decode_fourcc(cap.get(cv2.CAP_PROP_FOURCC)),
+            'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), 'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': cap.get(cv2.CAP_PROP_FPS), 'buffer_size': int(cap.get(cv2.CAP_PROP_BUFFERSIZE))}
+
+
+class ProfiledCapture:
+    """
+    Pembungkus cv2.VideoCapture dengan profil kamera, antarmukanya sama (isOpened,
+    read, get, set, release) sehingga bisa dipakai CaptureThread.
+
+    Dengan grab_newest, read() memakai pola grab/retrieve: frame yang di-grab
+    dibuang (tanpa didekode) selama masih basi, lalu hanya frame terbaru yang
+    di-retrieve. Frame dianggap basi jika timestamp buffer V4L2 (CAP_PROP_POS_MSEC,
+    jam monotonic) lebih tua dari satu interval frame; tanpa timestamp, grab yang
+    kembali seketika dianggap berasal dari buffer driver.
+    """
+    is_live = True
+
+    def __init__(self, index, profile, max_drain=4):
+        """
+        Args:
+            index (int): Indeks kamera untuk cv2.VideoCapture.
+            profile (CaptureProfile): Profil yang diterapkan.
+            max_drain (int): Maksimum frame basi yang dibuang per read().
+        """
+        self.profile = profile
+        self.max_drain = max_drain
+        self.cap = cv2.VideoCapture(index)
+        self.negotiated = apply_profile(self.cap, profile) if self.cap.isOpened() else {}
+        fps = self.negotiated.get('fps') or profile.fps or 30.0
+        self.frame_interval = 1.0 / fps
+        self.drained = 0 # Frame basi yang dibuang karena grab_newest
+        self.last_age = None # Umur frame terakhir (detik) menurut timestamp driver, jika ada
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        if not self.profile.grab_newest:
+            ret, frame = self.cap.read()
+        else:
+            for attempt in range(self.max_drain + 1):
+                start = time.monotonic()
+                if not self.cap.grab():
+                    return False, None
+                age = frame_age(self.cap)
+                if age is not None:
+                    stale = age > self.frame_interval
+                else:
+                    stale = time.monotonic() - start < self.frame_interval / 4
+                if not stale or attempt == self.max_drain:
+                    break
+                self.drained += 1
+            ret, frame = self.cap.retrieve()
+        self.last_age = frame_age(self.cap) if ret else None
+        return ret, frame
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value)
+
+    def release(self):
+        self.cap.release()
+
+
+def frame_age(cap):
+    """
+    Umur frame terakhir (detik) dari timestamp buffer driver, atau None jika backend
+    tidak menyediakan timestamp monotonic (mis. bukan V4L2).
+    """
+    timestamp_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+    if timestamp_ms <= 0:
+        return None
+    age = time.monotonic() - timestamp_ms / 1000.0
+    return age if 0.0 <= age < 5.0 else None
@@ -0,0 +1,129 @@
+# core/color_detector.py
+
+import time
+
+import cv2
+import numpy as np
+
+# Rentang HSV OpenCV (H 0-179, S/V 0-255) per kelas. Merah melintasi H=0, jadi dua rentang.
+HSV_RANGES = {
+    'Red_Ball': (((0, 120, 70), (10, 255, 255)), ((170, 120, 70), (179, 255, 255))),
+    'Green_Ball': (((40, 80, 50), (85, 255, 255)),),
+}
+
+
+class HsvBallDetector:
+    """
+    Detektor bola merah/hijau klasik tanpa model: threshold HSV, morfologi, lalu
+    penyaringan blob (luas, rasio aspek, kepadatan) yang tervektorisasi.
+
+    Antarmukanya sama dengan YoloDetector (names, img_size, detect, detect_batch,
+    set_img_size) dan hasilnya array (N, 6) = [x1, y1, x2, y2, conf, cls] dalam
+    koordinat frame penuh, sehingga find_gate, HUD, DetectThenTrack, MotionGate,
+    dan governor bisa memakainya tanpa perubahan. Berjalan di CPU pada laju kamera penuh.
+    """
+    backend = 'hsv'
+    weights = 'HSV thresholds'
+    supports_batch = False
+    supports_dynamic_size = True
+
+    def __init__(self, img_size=320, ranges=None, min_area=0.0002, max_aspect=2.0, min_fill=0.45,
+                 kernel_size=5, max_detections=20):
+        """
+        Args:
+            img_size (int): Sisi terpanjang frame kerja; frame diperkecil dulu agar cepat.
+            ranges (dict | None): {nama kelas: ((hsv_bawah, hsv_atas), ...)}; default HSV_RANGES.
+            min_area (float): Luas blob minimum sebagai fraksi luas frame kerja.
+            max_aspect (float): Rasio sisi panjang/pendek kotak maksimum (bola ~1).
+            min_fill (float): Rasio piksel blob terhadap luas kotak minimum (lingkaran ~0.785).
+            kernel_size (int): Ukuran kernel elips untuk opening/closing.
+            max_detections (int): Jumlah deteksi maksimum per kelas.
+        """
+        self.ranges = ranges or HSV_RANGES
+        self.names = {i: name for i, name in enumerate(self.ranges)}
+        self.img_size = img_size
+        self.default_img_size = img_size
+        self.min_area = min_area
+        self.max_aspect = max_aspect
+        self.min_fill = min_fill
+        self.max_detections = max_detections
+        self.kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (kernel_size, kernel_size))
+        self._bounds = [[(np.array(lo, dtype=np.uint8), np.array(hi, dtype=np.uint8)) for lo, hi in bounds]
+                        for bounds in self.ranges.values()]
+
+    def set_img_size(self, img_size):
+        """Mengganti sisi terpanjang frame kerja (dipakai governor)."""
+        self.img_size = img_size
+        return True
+
+    def mask(self, hsv, cls):
+        """Mask biner (uint8 0/255) untuk satu kelas setelah opening dan closing."""
+        bounds = self._bounds[cls]
+        mask = cv2.inRange(hsv, *bounds[0])
+        for lo, hi in bounds[1:]:
+            mask |= cv2.inRange(hsv, lo, hi)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self.kernel)
+        return cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self.kernel)
+
+    def _blobs(self, mask, cls):
+        """Menyaring komponen terhubung sekaligus dengan numpy; mengembalikan (N, 6) di frame kerja."""
+        count, _, comp, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        comp = comp[1:] # Komponen 0 adalah latar belakang
+        if not len(comp):
+            return np.zeros((0, 6), dtype=np.float32)
+        x, y, w, h, area = (comp[:, i].astype(np.float32) for i in range(5))
+        aspect = np.maximum(w, h) / np.maximum(np.minimum(w, h), 1.0)
+        fill = area / np.maximum(w * h, 1.0)
+        keep = (area >= self.min_area * mask.size) & (aspect <= self.max_aspect) & (fill >= self.min_fill)
+        if not keep.any():
+            return np.zeros((0, 6), dtype=np.float32)
+        # Confidence: seberapa mirip blob dengan lingkaran di dalam kotak persegi.
+        conf = np.clip(fill / (np.pi / 4), 0.0, 1.0) / aspect
+        det = np.stack([x, y, x + w, y + h, conf, np.full_like(x, cls)], axis=1)[keep]
+        return det[np.argsort(-det[:, 4])[:self.max_detections]]
+
+    def detect(self, frame, stats=None, roi=None):
+        """
+        Menjalankan deteksi warna pada satu frame BGR.
+
+        Args:
+            frame (np.ndarray): Frame BGR (HWC, uint8).
+            stats (StageStats | None): Jika diberikan, durasi setiap tahap dicatat di sini.
+            roi (tuple | None): (x0, y0, x1, y1) dalam piksel; hanya area ini yang diproses.
+
+        Returns:
+            np.ndarray: (N, 6) float32 = [x1, y1, x2, y2, conf, cls] dalam koordinat frame penuh.
+        """
+        t0 = time.perf_counter()
+        x0, y0 = 0, 0
+        source = frame
+        if roi is not None:
+            x0, y0, x1, y1 = roi
+            source = frame[y0:y1, x0:x1]
+        height, width = source.shape[:2]
+        scale = min(1.0, self.img_size / max(height, width))
+        if scale < 1.0:
+            source = cv2.resize(source, (max(1, int(width * scale)), max(1, int(height * scale))),
+                                interpolation=cv2.INTER_AREA)
+        hsv = cv2.cvtColor(source, cv2.COLOR_BGR2HSV)
+        t1 = time.perf_counter()
+        masks = [self.mask(hsv, cls) for cls in range(len(self._bounds))]
+        t2 = time.perf_counter()
+        det = np.concatenate([self._blobs(mask, cls) for cls, mask in enumerate(masks)])
+        if len(det):
+            # Kembalikan kotak dari frame kerja (dan crop ROI) ke koordinat frame penuh.
+            det[:, :4] /= scale
+            det[:, [0, 2]] += x0
+            det[:, [1, 3]] += y0
+            det[:, :4] = det[:, :4].round()
+        t3 = time.perf_counter()
+        if stats is not None:
+            stats.add('preprocess', t1 - t0)
+            stats.add('hsv_mask', t2 - t1)
+            stats.add('hsv_blobs', t3 - t2)
+        return det
+
+    def detect_batch(self, frames, stats=None, rois=None, slots=None):
+        """Sama seperti YoloDetector.detect_batch; setiap frame diproses satu per satu."""
+        rois = list(rois) if rois is not None else [None] * len(frames)
+        return [self.detect(frame, stats, roi) for frame, roi in zip(frames, rois)]
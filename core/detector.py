@@ -0,0 +1,207 @@
+# core/detector.py
+
+import sys
+import os
+import time
+from pathlib import Path
+
+from core.preprocess import LetterboxPreprocessor, BatchLetterboxPreprocessor
+from core.backends import resolve_backend, DYNAMIC_SHAPE_BACKENDS, BATCH_BACKENDS
+
+if os.name == 'nt':
+    import pathlib
+    pathlib.PosixPath = pathlib.WindowsPath
+
+# PENTING: Penambahan Path YOLOv5 yang Sangat Robust
+PROJECT_ROOT = Path(os.path.abspath(__file__)).resolve().parents[1]
+
+YOLOV5_ROOT_PATH = PROJECT_ROOT / 'yolov5'
+if str(YOLOV5_ROOT_PATH) not in sys.path:
+    sys.path.insert(0, str(YOLOV5_ROOT_PATH))
+
+DEFAULT_WEIGHTS = YOLOV5_ROOT_PATH / "best.pt"
+
+# PENTING: Definisi TryExcept di sini (jika diperlukan oleh YOLOv5 Anda)
+def TryExcept(*args, **kwargs):
+    def try_except(func):
+        def wrap_function(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                return None
+        return wrap_function
+    return try_except if len(args) == 0 else try_except(args[0])
+
+# Impor dari YOLOv5
+from models.common import DetectMultiBackend
+from utils.general import non_max_suppression, scale_boxes # <<< NON_MAX_SUPPRESSION & SCALE_BOXES dari general
+# <<< PENTING: select_device & smart_inference_mode dari torch_utils >>>
+from utils.torch_utils import select_device, smart_inference_mode
+
+
+class YoloDetector:
+    """
+    Detektor bola gate berbasis YOLOv5 tanpa ketergantungan pada Qt.
+    Dipakai bersama oleh VideoView dan alat-alat headless (CLI/benchmark).
+    """
+    def __init__(self, weights=DEFAULT_WEIGHTS, device='', img_size=640, conf_thres=0.4, iou_thres=0.45,
+                 roi_img_size=None, backend='pytorch', int8=False, calibration=None):
+        """
+        Args:
+            weights (str | Path): Path ke file bobot model (best.pt).
+            device (str): Device untuk select_device ('' = otomatis, 'cpu', '0', ...).
+            img_size (int): Ukuran input model (persegi).
+            conf_thres (float): Ambang confidence NMS.
+            iou_thres (float): Ambang IoU NMS.
+            roi_img_size (int | None): Sisi terpanjang input saat inferensi dibatasi ROI.
+                                       None berarti sama dengan img_size.
+            backend (str): 'pytorch', 'torchscript', 'onnx', 'openvino', atau 'auto'
+                           (backend tercepat yang sudah diekspor). Lihat core/backends.py.
+            int8 (bool): Pakai varian INT8 (ONNX / OpenVINO).
+            calibration (str | Path | None): Rekaman untuk kalibrasi INT8 jika perlu diekspor.
+        """
+        self.conf_thres = conf_thres
+        self.iou_thres = iou_thres
+        self.device = select_device(device)
+        self.backend, artefact = resolve_backend(weights, backend, int8, img_size, calibration)
+        self.weights = str(artefact)
+        self.model = DetectMultiBackend(self.weights, device=self.device, dnn=False)
+        self.model.warmup(imgsz=(1, 3, img_size, img_size))
+        self.names = self.model.names
+        self.roi_img_size = roi_img_size
+        self._preprocessors = {} # Ukuran input -> (preprocessor, roi_preprocessor), dipakai ulang
+        self.img_size = None
+        self.default_img_size = img_size # Ukuran awal; dipakai kembali saat governor dimatikan
+        self.set_img_size(img_size)
+
+    @property
+    def supports_dynamic_size(self):
+        """True jika ukuran input bisa diganti saat runtime (backend dengan input dinamis)."""
+        return self.backend in DYNAMIC_SHAPE_BACKENDS
+
+    def set_img_size(self, img_size):
+        """
+        Mengganti ukuran input model (mis. 640 -> 480 -> 320) tanpa memuat ulang model.
+        Buffer preprocessing per ukuran di-cache sehingga berganti bolak-balik tidak
+        mengalokasikan ulang.
+
+        Returns:
+            bool: False jika backend memakai input statis (ukuran ekspor) dan ukuran tidak diganti.
+        """
+        if self.img_size is not None and img_size != self.img_size and not self.supports_dynamic_size:
+            return False
+        if img_size not in self._preprocessors:
+            preprocessor = LetterboxPreprocessor(img_size, stride=self.model.stride, device=self.device)
+            # Crop ROI berbentuk pita lebar; auto=True membuat input persegi panjang
+            # (kelipatan stride) sehingga piksel padding tidak ikut diinferensi.
+            # Backend dengan input statis tetap memakai input persegi ukuran ekspor.
+            dynamic = self.supports_dynamic_size
+            roi_size = min(self.roi_img_size, img_size) if dynamic and self.roi_img_size else img_size
+            roi_preprocessor = LetterboxPreprocessor(roi_size, stride=self.model.stride, device=self.device,
+                                                     auto=dynamic)
+            self._preprocessors[img_size] = (preprocessor, roi_preprocessor)
+        self.preprocessor, self.roi_preprocessor = self._preprocessors[img_size]
+        if img_size != self.img_size:
+            self.img_size = img_size
+            self.batch_preprocessor = None # Dibuat ulang oleh detect_batch dengan ukuran baru
+        return True
+
+    @smart_inference_mode()
+    def detect(self, frame, stats=None, roi=None):
+        """
+        Menjalankan deteksi pada satu frame BGR.
+
+        Args:
+            frame (np.ndarray): Frame BGR (HWC, uint8).
+            stats (StageStats | None): Jika diberikan, durasi setiap tahap dicatat di sini.
+            roi (tuple | None): (x0, y0, x1, y1) dalam piksel; hanya area ini yang diinferensi.
+
+        Returns:
+            torch.Tensor: Hasil NMS (N, 6) = [x1, y1, x2, y2, conf, cls] dalam koordinat frame penuh.
+        """
+        t0 = time.perf_counter()
+        if roi is not None:
+            x0, y0, x1, y1 = roi
+            source = frame[y0:y1, x0:x1]
+            preprocessor = self.roi_preprocessor
+        else:
+            source = frame
+            preprocessor = self.preprocessor
+        img_tensor = preprocessor(source)
+        t1 = time.perf_counter()
+        pred = self.model(img_tensor, augment=False, visualize=False)
+        t2 = time.perf_counter()
+        det = non_max_suppression(pred, conf_thres=self.conf_thres, iou_thres=self.iou_thres)[0]
+        if len(det):
+            det[:, :4] = scale_boxes(img_tensor.shape[2:], det[:, :4], source.shape,
+                                     ratio_pad=preprocessor.ratio_pad).round()
+            if roi is not None:
+                # Kembalikan kotak dari koordinat crop ke koordinat frame penuh.
+                det[:, [0, 2]] += x0
+                det[:, [1, 3]] += y0
+        t3 = time.perf_counter()
+        if stats is not None:
+            stats.add('preprocess', t1 - t0)
+            stats.add('inference', t2 - t1)
+            stats.add('nms', t3 - t2)
+        return det
+
+    @property
+    def supports_batch(self):
+        """True jika backend aktif bisa menginferensi beberapa frame dalam satu panggilan."""
+        return self.backend in BATCH_BACKENDS
+
+    @smart_inference_mode()
+    def detect_batch(self, frames, stats=None, rois=None, slots=None):
+        """
+        Menjalankan deteksi pada beberapa frame (mis. satu per kamera) dalam satu panggilan model.
+
+        Semua frame di-letterbox ke input persegi img_size sehingga bisa digabung menjadi
+        satu batch. Jika backend tidak mendukung batch, frame dideteksi satu per satu.
+
+        Args:
+            frames (list): Frame BGR (HWC, uint8), boleh berbeda resolusi.
+            stats (StageStats | None): Jika diberikan, durasi setiap tahap (per batch) dicatat.
+            rois (list | None): ROI (x0, y0, x1, y1) atau None untuk setiap frame.
+            slots (list | None): Slot buffer (indeks kamera) untuk setiap frame; default 0..N-1.
+                                 Slot tetap per kamera membuat geometri letterbox tidak dihitung ulang.
+
+        Returns:
+            list: Satu tensor hasil NMS (N, 6) per frame, dalam koordinat frame penuh.
+        """
+        rois = list(rois) if rois is not None else [None] * len(frames)
+        if len(frames) == 1 or not self.supports_batch:
+            return [self.detect(frame, stats, roi) for frame, roi in zip(frames, rois)]
+        slots = list(range(len(frames))) if slots is None else list(slots)
+
+        t0 = time.perf_counter()
+        sources, offsets = [], []
+        for frame, roi in zip(frames, rois):
+            if roi is not None:
+                x0, y0, x1, y1 = roi
+                sources.append(frame[y0:y1, x0:x1])
+                offsets.append((x0, y0))
+            else:
+                sources.append(frame)
+                offsets.append(None)
+        if self.batch_preprocessor is None or self.batch_preprocessor.batch_size <= max(slots):
+            self.batch_preprocessor = BatchLetterboxPreprocessor(max(max(slots) + 1, len(frames)), self.img_size,
+                                                                 stride=self.model.stride, device=self.device)
+        img_tensor = self.batch_preprocessor(sources, slots)
+        t1 = time.perf_counter()
+        pred = self.model(img_tensor, augment=False, visualize=False)
+        t2 = time.perf_counter()
+        dets = non_max_suppression(pred, conf_thres=self.conf_thres, iou_thres=self.iou_thres)
+        for det, source, offset, slot in zip(dets, sources, offsets, slots):
+            if len(det):
+                det[:, :4] = scale_boxes(img_tensor.shape[2:], det[:, :4], source.shape,
+                                         ratio_pad=self.batch_preprocessor.ratio_pad(slot)).round()
+                if offset is not None:
+                    det[:, [0, 2]] += offset[0]
+                    det[:, [1, 3]] += offset[1]
+        t3 = time.perf_counter()
+        if stats is not None:
+            stats.add('preprocess', t1 - t0)
+            stats.add('inference', t2 - t1)
+            stats.add('nms', t3 - t2)
+        return dets
@@ -0,0 +1,312 @@
+# core/frame_pipeline.py
+
+import threading
+import time
+from collections import deque
+# Impor QThread dan pyqtSignal agar setiap tahap pipeline bisa berjalan di thread sendiri
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class LatestFrameQueue:
+    """
+    Antrian berkapasitas tetap dengan kebijakan "latest-frame-wins".
+    Jika antrian penuh, frame paling lama dibuang (dan dihitung) sehingga
+    konsumen selalu mendapatkan frame terbaru, bukan tumpukan frame basi.
+    """
+    def __init__(self, maxsize=1, condition=None):
+        """
+        Args:
+            maxsize (int): Kapasitas antrian.
+            condition (threading.Condition | None): Condition bersama, agar satu konsumen
+                bisa menunggu beberapa antrian sekaligus (lihat BatchInferenceWorker).
+        """
+        self.maxsize = max(1, int(maxsize))
+        self.dropped = 0 # Jumlah frame yang dibuang karena konsumen terlambat
+        self._items = deque()
+        self._cond = condition if condition is not None else threading.Condition()
+        self._closed = False
+
+    def put(self, item, block=False):
+        """
+        Memasukkan item. Secara default tidak pernah memblokir; item tertua dibuang bila penuh.
+
+        Args:
+            block (bool): True untuk menunggu hingga ada ruang (backpressure) alih-alih
+                membuang frame, dipakai saat replay rekaman secepat mungkin.
+        """
+        with self._cond:
+            if block:
+                self._cond.wait_for(lambda: len(self._items) < self.maxsize or self._closed)
+            if self._closed:
+                return
+            while len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify_all() # Condition bisa dipakai bersama beberapa antrian
+
+    def get(self, timeout=None):
+        """
+        Mengambil item tertua yang masih ada di antrian.
+
+        Args:
+            timeout (float | None): Waktu tunggu maksimum (detik). 0 berarti tidak menunggu.
+
+        Returns:
+            Item, atau None jika antrian kosong setelah timeout atau sudah ditutup.
+        """
+        with self._cond:
+            if not self._items and not self._closed and timeout != 0:
+                self._cond.wait_for(lambda: self._items or self._closed, timeout)
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._cond.notify_all() # Bangunkan produsen yang menunggu ruang (put block=True)
+            return item
+
+    def close(self):
+        """Menutup antrian dan membangunkan semua konsumen yang sedang menunggu."""
+        with self._cond:
+            self._closed = True
+            self._items.clear()
+            self._cond.notify_all()
+
+    def __len__(self):
+        with self._cond:
+            return len(self._items)
+
+
+class FramePacket:
+    """Satu frame beserta semua hasil yang ditempelkan oleh tahap-tahap pipeline."""
+    __slots__ = ('frame_id', 'timestamp', 'frame', 'display_frame', 'detections', 'degree', 'camera')
+
+    def __init__(self, frame_id, timestamp, frame, camera=0):
+        self.frame_id = frame_id
+        self.camera = camera # Indeks kamera asal (0 = kamera utama)
+        self.timestamp = timestamp # Waktu pengambilan frame (time.monotonic)
+        self.frame = frame
+        self.display_frame = None # Frame teranotasi seukuran tampilan, atau None jika tidak ditampilkan
+        self.detections = [] # Daftar (class_name, conf, (x1, y1, x2, y2))
+        self.degree = None # Derajat gate 0-180, atau None jika gate tidak terlihat
+
+
+# === TAHAP 1: PENGAMBILAN FRAME DARI KAMERA ===
+class CaptureThread(QThread):
+    """
+    Thread yang terus-menerus membaca frame dari kamera dan memasukkannya ke
+    antrian "latest-frame-wins". Kamera tidak pernah menunggu tahap inferensi.
+    """
+    # Sinyal saat kamera gagal dibaca (misal: kamera dicabut).
+    capture_failed = pyqtSignal(str)
+    # Sinyal saat sumber rekaman (file/folder) habis, dengan jumlah frame yang dibaca.
+    source_finished = pyqtSignal(int)
+
+    def __init__(self, capture, output_queue, block=False, stats=None, camera=0):
+        """
+        Konstruktor, menerima objek cv2.VideoCapture (atau FileFrameSource) yang sudah terbuka.
+
+        Args:
+            block (bool): Tunggu inferensi alih-alih membuang frame (replay secepat mungkin).
+            stats (StageStats | None): Jika diberikan, durasi read(), umur frame, dan FPS kamera dicatat.
+            camera (int): Indeks kamera yang ditempelkan ke setiap FramePacket.
+        """
+        super().__init__()
+        self.cap = capture
+        self.camera = camera
+        self.output_queue = output_queue
+        self.block = block
+        self.stats = stats
+        self.running = True
+        self.frames_read = 0
+
+    def run(self):
+        frame_id = 0
+        stats = self.stats
+        while self.running:
+            start = time.perf_counter()
+            ret, frame = self.cap.read()
+            if not self.running:
+                break
+            # Durasi baca dan FPS dicatat untuk kamera utama saja (kamera 0).
+            if stats is not None and ret and self.camera == 0:
+                stats.add('capture', time.perf_counter() - start)
+                stats.tick('capture')
+                # Umur frame menurut timestamp driver (ProfiledCapture), termasuk waktu di buffer kamera.
+                age = getattr(self.cap, 'last_age', None)
+                if age is not None:
+                    stats.add('frame_age', age)
+            if not ret:
+                if getattr(self.cap, 'is_live', True):
+                    self.capture_failed.emit("Failed to read frame from camera.")
+                else:
+                    self.source_finished.emit(frame_id)
+                break
+            self.output_queue.put(FramePacket(frame_id, time.monotonic(), frame, self.camera), block=self.block)
+            frame_id += 1
+            self.frames_read = frame_id
+
+    def stop(self):
+        self.running = False
+
+
+# === TAHAP 2: INFERENSI (DETEKSI + ANOTASI) ===
+class InferenceWorker(QThread):
+    """
+    Thread yang mengambil frame terbaru dari antrian kamera, menjalankan fungsi
+    pemrosesan (inferensi YOLO, NMS, logika gate, anotasi), lalu meneruskan
+    hasilnya ke antrian tampilan.
+    """
+    # Dipancarkan setiap ada frame baru di antrian tampilan (tanpa membawa frame).
+    frame_ready = pyqtSignal()
+    # Hasil deteksi: (detections, degree atau None, timestamp frame)
+    result_ready = pyqtSignal(object, object, float)
+
+    def __init__(self, input_queue, output_queue, process_fn, stats=None):
+        """
+        Args:
+            input_queue (LatestFrameQueue): Antrian frame dari CaptureThread.
+            output_queue (LatestFrameQueue): Antrian frame siap tampil.
+            process_fn (callable): Fungsi yang mengisi FramePacket dengan hasil deteksi.
+            stats (StageStats | None): Jika diberikan, waktu tunggu antrian, durasi proses,
+                latensi kamera-ke-hasil, dan FPS inferensi dicatat.
+        """
+        super().__init__()
+        self.input_queue = input_queue
+        self.output_queue = output_queue
+        self.process_fn = process_fn
+        self.stats = stats
+        self.running = True
+        self.processed = 0 # Jumlah frame yang selesai diproses
+        self.errors = 0 # Jumlah frame yang gagal diproses
+
+    def run(self):
+        stats = self.stats
+        while self.running:
+            packet = self.input_queue.get(timeout=0.1)
+            if packet is None:
+                continue
+            start = time.perf_counter()
+            age = time.monotonic() - packet.timestamp
+            try:
+                self.process_fn(packet)
+            except Exception as e:
+                print(f"Error saat memproses frame {packet.frame_id}: {e}")
+                self.errors += 1
+                continue
+            self.processed += 1
+            if stats is not None:
+                # 'queue' = umur frame saat mulai diproses; 'latency' = kamera sampai hasil siap.
+                stats.add('queue', age)
+                stats.add('process', time.perf_counter() - start)
+                stats.add('latency', time.monotonic() - packet.timestamp)
+                stats.tick('inference')
+            # display_frame None berarti tampilan tidak terlihat; hasil deteksi tetap dikirim.
+            if packet.display_frame is not None:
+                self.output_queue.put(packet)
+                self.frame_ready.emit()
+            self.result_ready.emit(packet.detections, packet.degree, packet.timestamp)
+
+    def stop(self):
+        self.running = False
+
+
+# === TAHAP 2 (MULTI-KAMERA): INFERENSI BATCH ===
+class BatchInferenceWorker(QThread):
+    """
+    Versi multi-kamera dari InferenceWorker. Setiap kamera punya antrian
+    "latest-frame-wins" sendiri; worker mengambil frame terbaru dari semua kamera
+    yang sudah siap dan memprosesnya bersama (satu panggilan model untuk semua kamera).
+    """
+    frame_ready = pyqtSignal()
+    # Hasil deteksi per kamera: (indeks kamera, detections, degree atau None, timestamp frame)
+    result_ready = pyqtSignal(int, object, object, float)
+
+    def __init__(self, input_queues, output_queue, process_fn, stats=None, batch_window=0.005):
+        """
+        Args:
+            input_queues (list): LatestFrameQueue per kamera, semuanya memakai Condition yang sama.
+            output_queue (LatestFrameQueue): Antrian frame siap tampil (kamera yang ditampilkan).
+            process_fn (callable): Fungsi yang menerima daftar FramePacket dan mengisi hasilnya.
+            stats (StageStats | None): Sama seperti InferenceWorker; 'process' dicatat per batch.
+            batch_window (float): Waktu tunggu maksimum (detik) setelah frame pertama tiba
+                agar kamera lain ikut masuk batch yang sama.
+        """
+        super().__init__()
+        self.input_queues = list(input_queues)
+        self.output_queue = output_queue
+        self.process_fn = process_fn
+        self.stats = stats
+        self.batch_window = batch_window
+        self.condition = self.input_queues[0]._cond
+        self.running = True
+        self.processed = 0 # Jumlah frame (semua kamera) yang selesai diproses
+        self.errors = 0
+        self.batches = 0
+
+    def _collect(self):
+        """Menunggu frame dari kamera mana pun, lalu mengambil frame terbaru dari setiap kamera."""
+        queues = self.input_queues
+        with self.condition:
+            if not self.condition.wait_for(lambda: not self.running or any(len(q) for q in queues), 0.1):
+                return []
+            if self.batch_window > 0:
+                self.condition.wait_for(lambda: not self.running or all(len(q) for q in queues), self.batch_window)
+        packets = (q.get(timeout=0) for q in queues)
+        return [packet for packet in packets if packet is not None]
+
+    def run(self):
+        stats = self.stats
+        while self.running:
+            packets = self._collect()
+            if not packets:
+                continue
+            start = time.perf_counter()
+            ages = [time.monotonic() - packet.timestamp for packet in packets]
+            try:
+                self.process_fn(packets)
+            except Exception as e:
+                print(f"Error saat memproses batch {[p.frame_id for p in packets]}: {e}")
+                self.errors += len(packets)
+                continue
+            self.processed += len(packets)
+            self.batches += 1
+            if stats is not None:
+                stats.add('process', time.perf_counter() - start)
+                for packet, age in zip(packets, ages):
+                    stats.add('queue', age)
+                    stats.add('latency', time.monotonic() - packet.timestamp)
+                    stats.tick('inference')
+            for packet in packets:
+                if packet.display_frame is not None:
+                    self.output_queue.put(packet)
+                    self.frame_ready.emit()
+                self.result_ready.emit(packet.camera, packet.detections, packet.degree, packet.timestamp)
+
+    def stop(self):
+        self.running = False
+
+
+# === PEMUAT MODEL DI LATAR BELAKANG ===
+class ModelLoader(QThread):
+    """
+    Thread untuk memuat (dan warmup) model deteksi tanpa membekukan GUI.
+    Impor pustaka berat (torch, YOLOv5) juga terjadi di sini, bukan saat aplikasi dibuka.
+    """
+    # Dipancarkan dengan objek hasil factory dan durasi pemuatan (detik).
+    loaded = pyqtSignal(object, float)
+    # Dipancarkan dengan pesan error jika pemuatan gagal.
+    failed = pyqtSignal(str)
+
+    def __init__(self, factory):
+        """Konstruktor, menerima fungsi tanpa argumen yang membuat dan mengembalikan detektor."""
+        super().__init__()
+        self.factory = factory
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            model = self.factory()
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.loaded.emit(model, time.perf_counter() - start)
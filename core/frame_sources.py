@@ -0,0 +1,138 @@
+# core/frame_sources.py
+
+import time
+from pathlib import Path
+
+import cv2
+
+from core.capture_profile import ProfiledCapture
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp'}
+# Jam replay: 'realtime' menahan frame sesuai FPS sumber (seperti kamera sungguhan),
+# 'fast' membaca secepat pipeline sanggup memproses (tanpa frame yang dibuang).
+REPLAY_CLOCKS = ('realtime', 'fast')
+
+
+class FileFrameSource:
+    """
+    Sumber frame dari file video atau folder gambar dengan antarmuka seperti
+    cv2.VideoCapture (isOpened, read, get, release), sehingga bisa langsung
+    dipakai oleh CaptureThread menggantikan kamera.
+    """
+    is_live = False
+
+    def __init__(self, path, clock='realtime', fps=None):
+        """
+        Args:
+            path (str | Path): File video atau folder berisi gambar (diurutkan menurut nama).
+            clock (str): Salah satu dari REPLAY_CLOCKS.
+            fps (float | None): FPS replay; default FPS file video, atau 10 untuk folder gambar.
+        """
+        if clock not in REPLAY_CLOCKS:
+            raise ValueError(f"Unknown replay clock '{clock}', expected one of {REPLAY_CLOCKS}")
+        self.path = Path(path)
+        self.clock = clock
+        self.frames_read = 0
+        self._cap = None
+        self._images = None
+        self._size = (0, 0)
+        if self.path.is_dir():
+            self._images = sorted(p for p in self.path.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+            if self._images:
+                first = cv2.imread(str(self._images[0]))
+                if first is not None:
+                    self._size = (first.shape[1], first.shape[0])
+            self.fps = fps or 10.0
+        else:
+            self._cap = cv2.VideoCapture(str(self.path))
+            self._size = (int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+            self.fps = fps or self._cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self._start = None
+
+    @property
+    def frame_count(self):
+        """Jumlah frame di sumber (perkiraan untuk video), 0 jika tidak diketahui."""
+        if self._images is not None:
+            return len(self._images)
+        return int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT)) if self._cap else 0
+
+    def isOpened(self):
+        if self._images is not None:
+            return bool(self._images)
+        return self._cap is not None and self._cap.isOpened()
+
+    def read(self):
+        """Membaca frame berikutnya; (False, None) di akhir sumber."""
+        if self.clock == 'realtime':
+            self._wait_for_frame_time()
+        if self._images is not None:
+            frame = None
+            # Lewati file gambar yang rusak/tidak terbaca.
+            while frame is None and self.frames_read < len(self._images):
+                frame = cv2.imread(str(self._images[self.frames_read]))
+                if frame is None:
+                    self._images.pop(self.frames_read)
+            ret = frame is not None
+        else:
+            ret, frame = self._cap.read() if self._cap else (False, None)
+        if ret:
+            self.frames_read += 1
+        return ret, frame
+
+    def _wait_for_frame_time(self):
+        """Menunggu hingga waktu tampil frame berikutnya menurut FPS sumber."""
+        now = time.monotonic()
+        if self._start is None:
+            self._start = now
+            return
+        delay = self._start + self.frames_read / self.fps - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return self._size[0]
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self._size[1]
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return self.frame_count
+        return self._cap.get(prop) if self._cap else 0
+
+    def release(self):
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+        self._images = [] if self._images is not None else None
+
+
+def open_source(source, clock='realtime', fps=None, profile=None):
+    """
+    Membuka sumber frame: indeks kamera (int) atau path file video / folder gambar.
+
+    Args:
+        profile (CaptureProfile | None): Profil kamera (FOURCC, resolusi, FPS, buffer);
+            hanya berlaku untuk kamera, diabaikan untuk rekaman.
+
+    Returns:
+        cv2.VideoCapture | ProfiledCapture | FileFrameSource: Objek dengan antarmuka VideoCapture.
+    """
+    if isinstance(source, int):
+        return ProfiledCapture(source, profile) if profile is not None else cv2.VideoCapture(source)
+    return FileFrameSource(source, clock=clock, fps=fps)
+
+
+def iter_frames(source):
+    """Menghasilkan frame BGR dari file video atau folder berisi gambar, secepat mungkin."""
+    frame_source = FileFrameSource(source, clock='fast')
+    if not frame_source.isOpened():
+        raise SystemExit(f"Error: Could not open video source {source}")
+    try:
+        while True:
+            ret, frame = frame_source.read()
+            if not ret:
+                break
+            yield frame
+    finally:
+        frame_source.release()
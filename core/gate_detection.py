@@ -0,0 +1,112 @@
+# core/gate_detection.py
+
+import numpy as np
+
+# Margin (piksel) kiri/kanan bar kemudi; posisi midpoint di antara margin ini
+# dipetakan ke rentang 0-180 derajat.
+BAR_MARGIN = 50
+
+
+class GateResult:
+    """Hasil logika gate untuk satu frame."""
+    __slots__ = ('red', 'green', 'midpoint', 'degree')
+
+    def __init__(self, red=None, green=None, midpoint=None, degree=None):
+        self.red = red # Titik tengah bola merah terdekat (x, y)
+        self.green = green # Titik tengah bola hijau terdekat (x, y)
+        self.midpoint = midpoint # Titik tengah gate (x, y)
+        self.degree = degree # 0-180, atau None jika gate tidak lengkap
+
+
+def degree_from_x(x, frame_width, margin=BAR_MARGIN):
+    """
+    Memetakan posisi horizontal midpoint ke derajat kemudi 0-180.
+
+    Args:
+        x (float): Koordinat x midpoint dalam piksel.
+        frame_width (int): Lebar frame dalam piksel.
+        margin (int): Margin kiri/kanan bar kemudi.
+
+    Returns:
+        int: Derajat 0 (paling kiri) hingga 180 (paling kanan).
+    """
+    bar_width = frame_width - 2 * margin
+    relative = min(max((x - margin) / bar_width, 0.0), 1.0)
+    return int(relative * 180)
+
+
+# Tabel jenis bola per indeks kelas, di-cache per objek names milik model.
+NOT_GATE, RED, GREEN = 0, 1, 2
+_class_tables = {}
+
+
+def _gate_class_table(names):
+    """
+    Mengembalikan array jenis bola (NOT_GATE/RED/GREEN) per indeks kelas, sehingga
+    klasifikasi semua deteksi cukup satu operasi indexing.
+    """
+    cached = _class_tables.get(id(names))
+    if cached is not None and cached[0] is names:
+        return cached[1]
+    items = names.items() if isinstance(names, dict) else enumerate(names)
+    items = list(items)
+    table = np.zeros(max((int(i) for i, _ in items), default=-1) + 1, dtype=np.int8)
+    for i, name in items:
+        if "Red_Ball" in name:
+            table[int(i)] = RED
+        elif "Green_Ball" in name:
+            table[int(i)] = GREEN
+    if len(_class_tables) > 8:
+        _class_tables.clear()
+    _class_tables[id(names)] = (names, table)
+    return table
+
+
+def _as_numpy(det):
+    """Mengubah hasil NMS (tensor torch atau array) menjadi array NumPy (N, 6)."""
+    if hasattr(det, 'detach'):
+        det = det.detach().cpu().numpy()
+    return np.asarray(det).reshape(-1, 6)
+
+
+def _lowest_center(centers, mask):
+    """Titik tengah dengan y terbesar (terdekat ke kapal) di antara baris mask, atau None."""
+    if not mask.any():
+        return None
+    candidates = centers[mask]
+    x, y = candidates[np.argmax(candidates[:, 1])]
+    return int(x), int(y)
+
+
+def find_gate(det, names, frame_width, margin=BAR_MARGIN):
+    """
+    Mencari pasangan bola merah/hijau terdekat (paling bawah di frame) dari hasil NMS.
+    Seluruh perhitungan memakai operasi array (mask kelas, argmax pada y), tanpa loop
+    per deteksi dan tanpa menggambar apa pun.
+
+    Args:
+        det: Hasil NMS (N, 6) = [x1, y1, x2, y2, conf, cls] dalam koordinat frame,
+            berupa tensor torch atau array NumPy.
+        names (dict | list): Pemetaan indeks kelas ke nama kelas model.
+        frame_width (int): Lebar frame dalam piksel.
+        margin (int): Margin kiri/kanan bar kemudi.
+
+    Returns:
+        GateResult: Titik bola terdekat, midpoint, dan derajat (None jika gate tidak lengkap).
+    """
+    result = GateResult()
+    det = _as_numpy(det)
+    if not len(det):
+        return result
+
+    kind = _gate_class_table(names)[det[:, 5].astype(np.intp)]
+    # Sama seperti anotasi: koordinat dibulatkan ke bawah dulu, lalu titik tengah integer.
+    boxes = det[:, :4].astype(np.int64)
+    centers = (boxes[:, :2] + boxes[:, 2:]) // 2
+
+    result.red = _lowest_center(centers, kind == RED)
+    result.green = _lowest_center(centers, kind == GREEN)
+    if result.red and result.green:
+        result.midpoint = ((result.red[0] + result.green[0]) // 2, (result.red[1] + result.green[1]) // 2)
+        result.degree = degree_from_x(result.midpoint[0], frame_width, margin)
+    return result
@@ -0,0 +1,125 @@
+# core/governor.py
+
+import time
+from collections import deque
+
+import numpy as np
+
+# Ukuran input yang dicoba governor, dari kualitas terbaik ke tercepat.
+GOVERNOR_IMG_SIZES = (640, 480, 320)
+# Batas FPS deteksi pada tingkat paling ringan, setelah ukuran input terkecil tidak cukup.
+GOVERNOR_RATE_LIMITS = (10.0, 5.0)
+
+
+class GovernorLevel:
+    """Satu tingkat keputusan governor: ukuran input, ROI paksa, dan batas FPS deteksi."""
+    __slots__ = ('img_size', 'roi', 'max_fps')
+
+    def __init__(self, img_size, roi=None, max_fps=None):
+        self.img_size = img_size
+        self.roi = roi # None = ikuti pilihan ROI pengguna, 'band' = paksa pita air
+        self.max_fps = max_fps # None = deteksi setiap frame
+
+    def describe(self):
+        rate = f"{self.max_fps:.0f} fps" if self.max_fps else "every frame"
+        return f"{self.img_size}px, ROI {self.roi or 'user'}, {rate}"
+
+
+def build_levels(img_sizes=GOVERNOR_IMG_SIZES, rate_limits=GOVERNOR_RATE_LIMITS):
+    """
+    Menyusun tangga tingkat governor, dari yang paling berat ke paling ringan:
+    ukuran penuh -> ROI pita air -> ukuran input lebih kecil -> batas FPS deteksi.
+    """
+    levels = [GovernorLevel(img_sizes[0])]
+    levels += [GovernorLevel(size, 'band') for size in img_sizes]
+    levels += [GovernorLevel(img_sizes[-1], 'band', fps) for fps in rate_limits]
+    return levels
+
+
+class LatencyGovernor:
+    """
+    Mengatur beban detektor agar latensi kamera-ke-hasil tetap di bawah anggaran.
+
+    Setiap frame yang dideteksi melaporkan latensinya lewat observe(). Jika p90 latensi
+    di jendela terakhir melebihi anggaran, governor turun satu tingkat (lebih ringan);
+    jika p90 jauh di bawah anggaran (headroom), governor naik satu tingkat. Setelah setiap
+    perubahan ada masa tenang (cooldown) dan jendela dikosongkan, sehingga keputusan
+    tidak berosilasi saat model baru pertama kali berjalan di ukuran input yang baru.
+    """
+    def __init__(self, budget=0.15, levels=None, window=30, cooldown=2.0, headroom=0.6):
+        """
+        Args:
+            budget (float): Anggaran latensi kamera-ke-hasil (detik).
+            levels (list | None): Tangga GovernorLevel; default build_levels().
+            window (int): Jumlah sampel latensi untuk menghitung p90.
+            cooldown (float): Jeda minimum (detik) antar perubahan tingkat.
+            headroom (float): Naik tingkat hanya jika p90 < budget * headroom.
+        """
+        self.budget = budget
+        self.levels = levels or build_levels()
+        self.window = window
+        self.cooldown = cooldown
+        self.headroom = headroom
+        self.index = 0
+        self.samples = deque(maxlen=window)
+        self.last_change = time.monotonic()
+        self.last_run = None # Waktu deteksi terakhir (untuk batas FPS)
+        self.last_p90 = None
+        self.changes = 0
+
+    @property
+    def level(self):
+        return self.levels[self.index]
+
+    def should_run(self, now=None):
+        """True jika deteksi boleh dijalankan pada frame ini menurut batas FPS tingkat aktif."""
+        max_fps = self.level.max_fps
+        now = time.monotonic() if now is None else now
+        if max_fps and self.last_run is not None and now - self.last_run < 1.0 / max_fps:
+            return False
+        self.last_run = now
+        return True
+
+    def observe(self, latency, now=None):
+        """
+        Mencatat latensi satu frame yang dideteksi dan mengevaluasi tingkat.
+
+        Returns:
+            str | None: Alasan perubahan jika tingkat berubah, None jika tidak.
+        """
+        now = time.monotonic() if now is None else now
+        self.samples.append(latency)
+        if now - self.last_change < self.cooldown or len(self.samples) < self.window // 2:
+            return None
+        p90 = float(np.percentile(np.fromiter(self.samples, dtype=np.float64), 90))
+        self.last_p90 = p90
+        if p90 > self.budget and self.index < len(self.levels) - 1:
+            return self._change(self.index + 1, now, f"p90 {p90 * 1000:.0f} ms > budget {self.budget * 1000:.0f} ms")
+        if p90 < self.budget * self.headroom and self.index > 0:
+            return self._change(self.index - 1, now, f"p90 {p90 * 1000:.0f} ms < {self.headroom:.0%} of budget")
+        return None
+
+    def _change(self, index, now, reason):
+        self.index = index
+        self.samples.clear()
+        self.last_change = now
+        self.changes += 1
+        return reason
+
+    def set_budget(self, budget):
+        """Mengganti anggaran latensi; evaluasi berikutnya memakai jendela baru."""
+        self.budget = budget
+        self.samples.clear()
+
+    def reset(self):
+        """Kembali ke tingkat terberat (dipakai saat kamera dimulai ulang)."""
+        self.index = 0
+        self.samples.clear()
+        self.last_change = time.monotonic()
+        self.last_run = None
+        self.last_p90 = None
+
+    def describe(self):
+        """Ringkasan keputusan saat ini untuk UI dan log."""
+        p90 = f", p90 {self.last_p90 * 1000:.0f} ms" if self.last_p90 is not None else ""
+        return f"L{self.index} {self.level.describe()} (budget {self.budget * 1000:.0f} ms{p90})"
@@ -0,0 +1,154 @@
+# core/hud.py
+
+import cv2
+import numpy as np
+
+from core.gate_detection import BAR_MARGIN
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+# Palet warna kelas (sama dengan palet ultralytics), dalam urutan BGR.
+_PALETTE_HEX = ('FF3838', 'FF9D97', 'FF701F', 'FFB21D', 'CFD231', '48F90A', '92CC17', '3DDB86', '1A9334', '00D4BB',
+                '2C99A8', '00C2FF', '344593', '6473FF', '0018EC', '8438FF', '520085', 'CB38FF', 'FF95C8', 'FF37C7')
+PALETTE = [tuple(int(h[i:i + 2], 16) for i in (4, 2, 0)) for h in _PALETTE_HEX]
+
+
+def class_color(cls):
+    """Warna BGR untuk indeks kelas tertentu."""
+    return PALETTE[int(cls) % len(PALETTE)]
+
+
+class HudOverlay:
+    """
+    Menggambar HUD di atas frame video.
+
+    Bagian statis (bar kemudi oranye, garis tengah, label 0/90/180) digambar sekali
+    per resolusi ke overlay ber-mask alpha yang di-cache, lalu ditempel ke frame
+    dengan satu operasi vektor. Hanya bagian dinamis (kotak deteksi, midpoint,
+    indikator derajat) yang digambar ulang setiap frame.
+    """
+    def __init__(self, margin=BAR_MARGIN, opacity=1.0, line_width=2):
+        """
+        Args:
+            margin (int): Margin kiri/kanan bar kemudi (sama dengan logika gate).
+            opacity (float): Opasitas HUD statis, 1.0 = buram penuh.
+            line_width (int): Tebal garis kotak deteksi.
+        """
+        self.margin = margin
+        self.opacity = opacity
+        self.line_width = line_width
+        self._size = None # (h, w) resolusi overlay yang ter-cache
+        self._rows = None # slice baris yang memuat HUD statis
+        self._overlay = None # Overlay BGR premultiplied, hanya pita baris HUD
+        self._mask = None # Mask piksel beralpha penuh (untuk cv2.copyTo)
+        self._patches = [] # (slice kolom, overlay, 1 - alpha) untuk piksel beralpha parsial
+        self.rebuilds = 0
+
+    def _bar_geometry(self, h, w):
+        bar_y = h - 50
+        bar_left = self.margin
+        bar_right = w - self.margin
+        return bar_y, bar_left, bar_right, (bar_left + bar_right) // 2
+
+    def _build(self, h, w):
+        """Menggambar HUD statis ke overlay dan mask alpha untuk resolusi (h, w)."""
+        bar_y, bar_left, bar_right, center_x = self._bar_geometry(h, w)
+        overlay = np.zeros((h, w, 3), dtype=np.uint8)
+        mask = np.zeros((h, w), dtype=np.uint8)
+        for canvas, color in ((overlay, None), (mask, 255)):
+            orange = color or (0, 140, 255)
+            white = color or (255, 255, 255)
+            cv2.rectangle(canvas, (bar_left, bar_y), (bar_right, bar_y + 20), orange, 2)
+            cv2.line(canvas, (center_x, bar_y), (center_x, bar_y + 20), orange, 2)
+            cv2.putText(canvas, "0", (bar_left - 10, bar_y + 40), FONT, 0.5, white, 2)
+            cv2.putText(canvas, "90", (center_x - 15, bar_y + 40), FONT, 0.5, white, 2)
+            cv2.putText(canvas, "180", (bar_right - 20, bar_y + 40), FONT, 0.5, white, 2)
+
+        # Simpan hanya pita baris yang berisi HUD agar blending tidak menyentuh seluruh frame.
+        rows = np.flatnonzero(mask.any(axis=1))
+        self._rows = slice(int(rows[0]), int(rows[-1]) + 1) if len(rows) else slice(0, 0)
+        # Overlay digambar di atas hitam, jadi piksel anti-aliasing sudah premultiplied alpha.
+        alpha = np.rint(mask[self._rows] * self.opacity).astype(np.uint8)
+        overlay = overlay[self._rows]
+        if self.opacity >= 1.0:
+            # Buram penuh: tepi anti-aliasing dibulatkan ke mask biner sehingga seluruh HUD
+            # cukup satu cv2.copyTo (beberapa cv2.multiply/add kecil lebih mahal dari menggambar ulang).
+            opaque = alpha >= 128
+            # Kembalikan warna asli (un-premultiply) pada piksel tepi yang dijadikan buram.
+            overlay = np.where(opaque[..., None], overlay * (255.0 / np.maximum(alpha, 1))[..., None], 0)
+            overlay = np.clip(np.rint(overlay), 0, 255).astype(np.uint8)
+            alpha = np.where(opaque, 255, 0).astype(np.uint8)
+        else:
+            overlay = np.rint(overlay * self.opacity).astype(np.uint8)
+        inv_alpha = cv2.merge([255 - alpha] * 3)
+
+        # Piksel buram penuh cukup disalin dengan satu cv2.copyTo.
+        opaque = (alpha == 255).astype(np.uint8)
+        self._overlay = overlay
+        self._mask = opaque if opaque.any() else None
+        # Piksel alpha parsial (tepi teks, atau semua piksel jika opacity < 1) di-blend
+        # per potongan kolom yang berdekatan, bukan di seluruh pita.
+        partial_cols = np.flatnonzero(((alpha > 0) & (alpha < 255)).any(axis=0))
+        self._patches = []
+        for run in np.split(partial_cols, np.flatnonzero(np.diff(partial_cols) > 1) + 1):
+            if len(run):
+                cols = slice(int(run[0]), int(run[-1]) + 1)
+                self._patches.append((cols, np.ascontiguousarray(overlay[:, cols]),
+                                      np.ascontiguousarray(inv_alpha[:, cols])))
+        self._size = (h, w)
+        self.rebuilds += 1
+
+    def composite_static(self, frame):
+        """Menempel HUD statis ke frame (in-place). Overlay dibangun ulang hanya jika resolusi berubah."""
+        h, w = frame.shape[:2]
+        if self._size != (h, w):
+            self._build(h, w)
+        target = frame[self._rows]
+        if self._mask is not None:
+            cv2.copyTo(self._overlay, self._mask, target)
+        for cols, overlay, inv_alpha in self._patches:
+            # dst = overlay + dst * (1 - alpha)
+            target[:, cols] = cv2.add(cv2.multiply(target[:, cols], inv_alpha, scale=1 / 255), overlay)
+
+    def draw_roi(self, frame, roi):
+        """Garis tipis penanda batas atas area yang diinferensi (roi = (x1, y1, x2, y2))."""
+        cv2.line(frame, (0, roi[1]), (frame.shape[1], roi[1]), (255, 255, 0), 1)
+
+    def draw_detections(self, frame, det, names):
+        """Menggambar kotak, label, dan titik tengah setiap deteksi."""
+        lw = self.line_width
+        font_scale = lw / 3
+        text_thickness = max(lw - 1, 1)
+        for *xyxy, conf, cls in det:
+            x1, y1, x2, y2 = map(int, xyxy)
+            color = class_color(cls)
+            cv2.rectangle(frame, (x1, y1), (x2, y2), color, lw, cv2.LINE_AA)
+            label = f"{names[int(cls)]} {conf:.2f}"
+            text_w, text_h = cv2.getTextSize(label, FONT, font_scale, text_thickness)[0]
+            outside = y1 - text_h >= 3 # Label di atas kotak jika masih muat
+            label_y = y1 - text_h - 3 if outside else y1 + text_h + 3
+            cv2.rectangle(frame, (x1, y1), (x1 + text_w, label_y), color, -1, cv2.LINE_AA)
+            cv2.putText(frame, label, (x1, y1 - 2 if outside else y1 + text_h + 2), FONT, font_scale,
+                        (255, 255, 255), text_thickness, cv2.LINE_AA)
+            cv2.circle(frame, ((x1 + x2) // 2, (y1 + y2) // 2), 5, (255, 255, 255), -1)
+
+    def draw_gate(self, frame, gate):
+        """Menggambar garis gate, midpoint, HUD statis, dan indikator derajat jika gate terlihat."""
+        if not gate.midpoint:
+            return
+        midpoint = gate.midpoint
+        cv2.line(frame, gate.red, gate.green, (200, 200, 200), 2)
+        cv2.circle(frame, midpoint, 6, (255, 0, 255), -1)
+        cv2.putText(frame, "Midpoint", (midpoint[0] - 40, midpoint[1] - 10), FONT, 0.6, (255, 0, 255), 2)
+
+        self.composite_static(frame)
+
+        h, w = frame.shape[:2]
+        bar_y, bar_left, bar_right, _ = self._bar_geometry(h, w)
+        bar_width = bar_right - bar_left
+        relative_position_on_bar = np.clip((midpoint[0] - bar_left) / bar_width, 0, 1)
+        indicator_x = int(bar_left + relative_position_on_bar * bar_width - 15)
+        cv2.rectangle(frame, (indicator_x, bar_y), (indicator_x + 30, bar_y + 20), (0, 0, 255), -1)
+
+        text = f"{gate.degree}°"
+        text_size = cv2.getTextSize(text, FONT, 0.6, 2)[0]
+        cv2.putText(frame, text, (indicator_x + (30 - text_size[0]) // 2, bar_y - 10), FONT, 0.6, (0, 0, 255), 2)
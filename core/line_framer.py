@@ -0,0 +1,71 @@
+# core/line_framer.py
+
+# Panjang baris maksimum (byte). Baris yang lebih panjang dianggap sampah dan dibuang.
+MAX_LINE_LENGTH = 1024
+
+
+class LineFramer:
+    """
+    Memotong aliran byte serial menjadi baris teks. Potongan data dari read()
+    ditambahkan ke satu bytearray yang dipakai ulang; baris yang belum lengkap
+    tetap di buffer sampai potongan berikutnya tiba. Baris yang melebihi
+    max_line (mis. sampah saat baud rate salah) dibuang sampai newline berikutnya,
+    sehingga buffer tidak pernah tumbuh tanpa batas.
+    """
+    def __init__(self, max_line=MAX_LINE_LENGTH):
+        self.buffer = bytearray()
+        self.max_line = max_line
+        self.discarding = False # True saat membuang sisa baris yang terlalu panjang
+        self.dropped = 0 # Jumlah baris yang dibuang karena terlalu panjang
+        self.matched = False # True jika feed() terakhir berhenti di baris 'until'
+
+    def feed(self, data, until=None):
+        """
+        Menambahkan potongan byte dan mengembalikan semua baris yang sudah lengkap.
+
+        Args:
+            until (str | None): Jika baris ini ditemukan, pemotongan berhenti setelahnya
+                (matched = True) dan byte sisanya tetap di buffer, mis. untuk berpindah
+                ke protokol biner setelah baris konfirmasi.
+
+        Returns:
+            list[str]: Baris yang sudah di-decode dan di-strip (baris kosong dilewati).
+        """
+        buf = self.buffer
+        buf += data
+        lines = []
+        start = 0
+        self.matched = False
+        while not self.matched:
+            end = buf.find(b'\n', start)
+            if end < 0:
+                break
+            if self.discarding:
+                self.discarding = False # Akhir dari baris sampah
+            elif end - start > self.max_line:
+                self.dropped += 1
+            else:
+                text = buf[start:end].decode('utf-8', errors='ignore').strip()
+                if text:
+                    lines.append(text)
+                    self.matched = text == until
+            start = end + 1
+        del buf[:start]
+        if len(buf) > self.max_line and not self.matched:
+            # Baris yang belum selesai sudah terlalu panjang: buang sekarang, lanjutkan
+            # membuang sampai newline berikutnya.
+            if not self.discarding:
+                self.dropped += 1
+            self.discarding = True
+            buf.clear()
+        return lines
+
+    def take_buffer(self):
+        """Mengambil (dan mengosongkan) byte yang belum menjadi baris."""
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+    def reset(self):
+        self.buffer.clear()
+        self.discarding = False
@@ -0,0 +1,79 @@
+# core/motion_gate.py
+
+import time
+
+import cv2
+
+
+class MotionGate:
+    """
+    Mesin deteksi yang melewati inferensi jika pemandangan tidak berubah.
+
+    Setiap frame diperkecil menjadi thumbnail grayscale dan dibandingkan dengan
+    thumbnail frame terakhir yang benar-benar dideteksi (bukan frame sebelumnya,
+    sehingga perubahan pelan tetap terakumulasi). Jika rata-rata selisih absolutnya
+    di bawah ambang, hasil deteksi sebelumnya dipakai ulang. Antarmukanya sama
+    dengan detektor biasa: detect(frame, stats, roi) -> det (N, 6), sehingga bisa
+    membungkus YoloDetector maupun DetectThenTrack.
+    """
+    def __init__(self, engine, threshold=2.0, max_skip=10, thumb_size=(64, 36)):
+        """
+        Args:
+            engine: Mesin deteksi yang dibungkus (punya names dan detect(frame, stats, roi)).
+            threshold (float): Ambang rata-rata selisih absolut thumbnail (level abu-abu 0-255).
+            max_skip (int): Maksimum frame berturut-turut yang boleh memakai ulang hasil.
+            thumb_size (tuple): (lebar, tinggi) thumbnail pembanding.
+        """
+        self.engine = engine
+        self.names = engine.names
+        self.threshold = threshold
+        self.max_skip = max(0, int(max_skip))
+        self.thumb_size = thumb_size
+        self.last_difference = 0.0
+        self.hits = 0 # Frame yang memakai ulang hasil sebelumnya
+        self.misses = 0 # Frame yang menjalankan mesin deteksi
+        self._reference = None # Thumbnail frame terakhir yang dideteksi
+        self._shape = None
+        self._roi = None
+        self._det = None
+        self._skipped = 0
+
+    @property
+    def hit_rate(self):
+        """Fraksi frame yang tidak menjalankan mesin deteksi."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self):
+        return (f"{self.hits} of {self.hits + self.misses} frames reused "
+                f"({100 * self.hit_rate:.1f}% hit rate, threshold {self.threshold}, max skip {self.max_skip})")
+
+    def reset(self):
+        """Melupakan frame acuan sehingga frame berikutnya pasti dideteksi."""
+        self._reference = None
+        self._det = None
+        self._skipped = 0
+
+    def detect(self, frame, stats=None, roi=None):
+        t0 = time.perf_counter()
+        thumb = cv2.cvtColor(cv2.resize(frame, self.thumb_size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        reusable = (self._reference is not None and self._skipped < self.max_skip
+                    and frame.shape == self._shape and roi == self._roi)
+        if reusable:
+            self.last_difference = cv2.mean(cv2.absdiff(thumb, self._reference))[0]
+            reusable = self.last_difference < self.threshold
+        if stats is not None:
+            stats.add('motion', time.perf_counter() - t0)
+        if reusable:
+            self._skipped += 1
+            self.hits += 1
+            return self._det
+
+        det = self.engine.detect(frame, stats, roi)
+        self._reference = thumb
+        self._shape = frame.shape
+        self._roi = roi
+        self._det = det
+        self._skipped = 0
+        self.misses += 1
+        return det
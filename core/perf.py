@@ -0,0 +1,166 @@
+# core/perf.py
+
+import csv
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+def _snapshot(values):
+    """Salinan isi deque/list yang aman meski thread lain sedang menambahkan sampel."""
+    while True:
+        try:
+            return np.fromiter(values, dtype=np.float64)
+        except RuntimeError: # deque berubah saat dibaca; ulangi
+            continue
+
+
+def _noop(*args):
+    """Pengganti add/tick saat StageStats dinonaktifkan."""
+
+
+class StageStats:
+    """
+    Pencatat durasi per tahap pipeline (capture, preprocess, inference, nms, ...).
+
+    Secara default menyimpan semua sampel sehingga persentil bisa dihitung di akhir sesi.
+    Dengan window, setiap tahap memakai ring buffer (deque maxlen) sehingga p50/p95/p99
+    selalu mencerminkan N sampel terakhir. Selain durasi, dicatat juga kejadian (tick)
+    untuk FPS dan penghitung seperti jumlah frame yang dibuang.
+
+    Mencatat sampel hanya berupa append ke deque (sub-mikrodetik). Jika dinonaktifkan,
+    add dan tick diganti fungsi kosong.
+    """
+    def __init__(self, window=None, enabled=True, rate_window=2.0):
+        """
+        Args:
+            window (int | None): Jika diisi, hanya N sampel terakhir per tahap yang disimpan
+                (untuk sesi panjang seperti GUI). None berarti simpan semua.
+            enabled (bool): False untuk mematikan pencatatan.
+            rate_window (float): Rentang waktu (detik) untuk menghitung FPS dari tick.
+        """
+        self.window = window
+        self.rate_window = rate_window
+        self.samples = defaultdict(list) if window is None else defaultdict(lambda: deque(maxlen=window))
+        self.ticks = defaultdict(lambda: deque(maxlen=1024)) # Waktu kejadian (time.monotonic)
+        self.counters = {} # Nama -> nilai, mis. frame yang dibuang per antrian
+        self.enabled = True
+        self.set_enabled(enabled)
+
+    def set_enabled(self, enabled):
+        """Menyalakan/mematikan pencatatan tanpa mengubah kode pemanggil."""
+        self.enabled = bool(enabled)
+        if self.enabled:
+            # Hapus pengganti di instance sehingga metode kelas dipakai lagi.
+            self.__dict__.pop('add', None)
+            self.__dict__.pop('tick', None)
+        else:
+            self.add = _noop
+            self.tick = _noop
+
+    def add(self, stage, seconds):
+        """Mencatat satu sampel durasi (detik) untuk tahap tertentu."""
+        self.samples[stage].append(seconds)
+
+    def tick(self, event):
+        """Mencatat satu kejadian (mis. frame selesai diproses) untuk perhitungan FPS."""
+        self.ticks[event].append(time.monotonic())
+
+    def set_counter(self, name, value):
+        """Menyimpan nilai penghitung (mis. jumlah frame yang dibuang)."""
+        self.counters[name] = value
+
+    @contextmanager
+    def measure(self, stage):
+        """Context manager untuk mengukur blok kode sebagai satu tahap."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def rate(self, event):
+        """Frekuensi kejadian (per detik) dalam rate_window detik terakhir."""
+        times = self.ticks.get(event)
+        if not times:
+            return 0.0
+        times = _snapshot(times)
+        recent = times[times >= time.monotonic() - self.rate_window]
+        if len(recent) < 2:
+            return 0.0
+        return (len(recent) - 1) / max(recent[-1] - recent[0], 1e-9)
+
+    def percentiles(self, stage, q=(50, 95, 99)):
+        """Mengembalikan persentil durasi tahap dalam milidetik."""
+        values = self.samples.get(stage)
+        if not values:
+            return [float('nan')] * len(q)
+        return list(np.percentile(_snapshot(values) * 1000, q))
+
+    def rows(self, q=(50, 95, 99)):
+        """
+        Ringkasan per tahap untuk ditampilkan atau diekspor.
+
+        Returns:
+            list: Daftar (stage, n, [persentil ms...], mean ms, max ms).
+        """
+        rows = []
+        for stage, values in list(self.samples.items()):
+            data = _snapshot(values) * 1000
+            if len(data):
+                rows.append((stage, len(data), list(np.percentile(data, q)), float(data.mean()), float(data.max())))
+        return rows
+
+    def report(self, q=(50, 95, 99)):
+        """Membuat tabel teks persentil latensi, FPS, dan penghitung."""
+        header = f"{'stage':<12}{'n':>7}" + "".join(f"{f'p{p}':>10}" for p in q) + f"{'mean':>10}"
+        lines = [header + "   (ms)"]
+        for stage, n, pct, mean, _ in self.rows(q):
+            lines.append(f"{stage:<12}{n:>7}" + "".join(f"{v:>10.2f}" for v in pct) + f"{mean:>10.2f}")
+        for event in list(self.ticks):
+            lines.append(f"{event + ' fps':<19}{self.rate(event):>10.1f}")
+        for name, value in list(self.counters.items()):
+            lines.append(f"{name:<19}{value:>10}")
+        return "\n".join(lines)
+
+    def compact_lines(self, rate_events=(), counter_names=None):
+        """
+        Baris ringkas untuk overlay video dan panel status:
+        FPS, penghitung, lalu p50/p95/p99 (ms) per tahap.
+        """
+        lines = []
+        if rate_events:
+            lines.append("fps  " + " | ".join(f"{event} {self.rate(event):.1f}" for event in rate_events))
+        counters = [(name, self.counters[name]) for name in (counter_names or self.counters) if name in self.counters]
+        if counters:
+            lines.append("drop " + " | ".join(f"{name} {value}" for name, value in counters))
+        rows = self.rows((50, 95, 99))
+        if rows:
+            lines.append(f"{'stage (ms)':<13}{'p50':>6}{'p95':>7}{'p99':>7}")
+        for stage, _, (p50, p95, p99), _, _ in rows:
+            lines.append(f"{stage:<13}{p50:6.1f}{p95:7.1f}{p99:7.1f}")
+        return lines
+
+    def to_csv(self, path, q=(50, 95, 99)):
+        """Mengekspor ringkasan (persentil per tahap, FPS, penghitung) ke file CSV."""
+        blank = [''] * (len(q) + 2)
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['kind', 'name', 'n'] + [f'p{p}_ms' for p in q] + ['mean_ms', 'max_ms', 'value'])
+            for stage, n, pct, mean, peak in self.rows(q):
+                writer.writerow(['stage', stage, n] + [f"{v:.4f}" for v in pct] + [f"{mean:.4f}", f"{peak:.4f}", ''])
+            for event in list(self.ticks):
+                writer.writerow(['fps', event, len(self.ticks[event])] + blank + [f"{self.rate(event):.2f}"])
+            for name, value in list(self.counters.items()):
+                writer.writerow(['counter', name, ''] + blank + [value])
+
+    def reset(self):
+        """Menghapus semua sampel, tick, dan penghitung."""
+        self.samples.clear()
+        self.ticks.clear()
+        self.counters.clear()
@@ -0,0 +1,165 @@
+# core/preprocess.py
+
+import cv2
+import numpy as np
+import torch
+
+
+class LetterboxPreprocessor:
+    """
+    Tahap preprocessing untuk detektor YOLO yang tidak mengalokasikan buffer baru
+    di setiap frame. Frame di-resize dengan mempertahankan rasio aspek (letterbox),
+    lalu konversi BGR->RGB, HWC->CHW dan normalisasi 0-1 dilakukan dalam satu
+    operasi langsung ke buffer float32 yang sudah dialokasikan sebelumnya.
+    """
+    def __init__(self, img_size=640, stride=32, device=None, pad_value=114, auto=False, out=None):
+        """
+        Args:
+            img_size (int | tuple): Ukuran input model, int (persegi) atau (tinggi, lebar).
+            stride (int): Stride maksimum model; dipakai saat auto=True.
+            device (torch.device | None): Device tujuan tensor. None berarti CPU.
+            pad_value (int): Nilai piksel (0-255) untuk area padding.
+            auto (bool): Jika True, padding dikurangi ke kelipatan stride terkecil
+                         (input persegi panjang) alih-alih ukuran penuh img_size.
+            out (np.ndarray | None): Slot (3, H, W) float32 milik buffer batch; jika diberikan,
+                         frame ditulis langsung ke slot ini dan __call__ mengembalikan None
+                         (tensor dibuat oleh BatchLetterboxPreprocessor). Hanya untuk auto=False.
+        """
+        self.img_size = (img_size, img_size) if isinstance(img_size, int) else tuple(img_size)
+        self.stride = int(stride)
+        self.device = device if device is not None else torch.device('cpu')
+        self.pad_value = pad_value
+        self.auto = auto
+        self._out = out
+
+        # Geometri dan buffer diisi ulang hanya jika ukuran frame sumber berubah.
+        self._source_shape = None
+        self._resized = None
+        self._chw = None
+        self._tensor = None
+        self.ratio_pad = None # ((gain, gain), (pad_kiri, pad_atas)) untuk scale_boxes
+        self.reallocations = 0 # Berapa kali buffer harus dialokasikan ulang
+
+    def _configure(self, height, width):
+        """Menghitung geometri letterbox dan mengalokasikan buffer untuk ukuran frame ini."""
+        target_h, target_w = self.img_size
+        gain = min(target_h / height, target_w / width)
+        new_w, new_h = int(round(width * gain)), int(round(height * gain))
+        if self.auto:
+            target_w = new_w + (-new_w) % self.stride
+            target_h = new_h + (-new_h) % self.stride
+        pad_w, pad_h = (target_w - new_w) / 2, (target_h - new_h) / 2
+        left, top = int(round(pad_w - 0.1)), int(round(pad_h - 0.1))
+
+        self._source_shape = (height, width)
+        self._new_size = (new_w, new_h)
+        self._region = (slice(None), slice(top, top + new_h), slice(left, left + new_w))
+        self._resized = np.empty((new_h, new_w, 3), dtype=np.uint8) if (new_w, new_h) != (width, height) else None
+        self.ratio_pad = ((gain, gain), (left, top))
+        self.reallocations += 1
+        if self._out is not None:
+            # Slot batch: isi ulang padding sekali, tensor dikelola pemilik buffer.
+            self._chw = self._out
+            self._chw[...] = self.pad_value / 255.0
+            self._tensor = self._host_tensor = None
+            return
+        # Area padding cukup diisi sekali; setiap frame hanya menimpa area gambar.
+        self._chw = np.full((3, target_h, target_w), self.pad_value / 255.0, dtype=np.float32)
+        cpu_tensor = torch.from_numpy(self._chw).unsqueeze(0) # Berbagi memori dengan self._chw
+        if self.device.type == 'cpu':
+            self._tensor = cpu_tensor
+            self._host_tensor = None
+        else:
+            self._host_tensor = cpu_tensor.pin_memory() if torch.cuda.is_available() else cpu_tensor
+            self._chw = self._host_tensor[0].numpy()
+            self._tensor = torch.empty_like(self._host_tensor, device=self.device)
+
+    @property
+    def input_shape(self):
+        """Bentuk (tinggi, lebar) tensor input untuk konfigurasi saat ini."""
+        return tuple(self._chw.shape[1:]) if self._chw is not None else self.img_size
+
+    def __call__(self, frame):
+        """
+        Mengubah frame BGR uint8 (HWC) menjadi tensor (1, 3, H, W) float32 0-1.
+
+        Tensor yang dikembalikan adalah buffer yang sama di setiap panggilan, jadi
+        isinya hanya valid sampai frame berikutnya diproses.
+        """
+        height, width = frame.shape[:2]
+        if self._source_shape != (height, width):
+            self._configure(height, width)
+
+        source = frame
+        if self._resized is not None:
+            source = cv2.resize(frame, self._new_size, dst=self._resized, interpolation=cv2.INTER_LINEAR)
+        # Langkah gabungan: BGR->RGB (flip sumbu kanal), HWC->CHW (transpose view)
+        # dan normalisasi, ditulis langsung ke area gambar di buffer input.
+        np.multiply(source[..., ::-1].transpose(2, 0, 1), np.float32(1 / 255.0),
+                    out=self._chw[self._region], dtype=np.float32, casting='unsafe')
+
+        if self._host_tensor is not None:
+            self._tensor.copy_(self._host_tensor, non_blocking=True)
+        return self._tensor
+
+
+class BatchLetterboxPreprocessor:
+    """
+    Preprocessing beberapa kamera sekaligus ke satu tensor (B, 3, H, W) untuk satu
+    panggilan model. Setiap slot (indeks kamera) punya LetterboxPreprocessor sendiri
+    yang menulis langsung ke bagian buffer batch miliknya, sehingga geometri letterbox
+    dan padding tiap kamera hanya dihitung ulang jika resolusinya berubah.
+    """
+    def __init__(self, batch_size, img_size=640, stride=32, device=None, pad_value=114):
+        """
+        Args:
+            batch_size (int): Jumlah slot (kamera) maksimum.
+            img_size (int | tuple): Ukuran input model, int (persegi) atau (tinggi, lebar).
+            stride (int): Stride maksimum model.
+            device (torch.device | None): Device tujuan tensor. None berarti CPU.
+            pad_value (int): Nilai piksel (0-255) untuk area padding.
+        """
+        height, width = (img_size, img_size) if isinstance(img_size, int) else tuple(img_size)
+        self.batch_size = int(batch_size)
+        self.device = device if device is not None else torch.device('cpu')
+        host = torch.full((self.batch_size, 3, height, width), pad_value / 255.0, dtype=torch.float32)
+        if self.device.type == 'cpu':
+            self._host_tensor = host
+            self._tensor = None
+        else:
+            self._host_tensor = host.pin_memory() if torch.cuda.is_available() else host
+            self._tensor = torch.empty_like(self._host_tensor, device=self.device)
+        batch = self._host_tensor.numpy() # Berbagi memori dengan tensor host
+        self.slots = [LetterboxPreprocessor((height, width), stride=stride, device=self.device,
+                                            pad_value=pad_value, out=batch[i]) for i in range(self.batch_size)]
+
+    def ratio_pad(self, slot):
+        """ratio_pad slot tertentu untuk scale_boxes."""
+        return self.slots[slot].ratio_pad
+
+    def __call__(self, frames, slots=None):
+        """
+        Mengubah daftar frame BGR menjadi satu tensor (len(frames), 3, H, W).
+
+        Args:
+            frames (list): Frame BGR uint8 (HWC), boleh berbeda resolusi.
+            slots (list | None): Slot (indeks kamera) untuk setiap frame; default 0..N-1.
+
+        Returns:
+            torch.Tensor: Tensor batch. Jika slot berurutan dari 0, ini view dari buffer
+            yang sama di setiap panggilan (hanya valid sampai batch berikutnya).
+        """
+        slots = list(range(len(frames))) if slots is None else list(slots)
+        for frame, slot in zip(frames, slots):
+            self.slots[slot](frame)
+        count = len(slots)
+        if slots == list(range(count)):
+            host = self._host_tensor[:count]
+        else:
+            # Sebagian kamera tidak punya frame baru: rapatkan slot yang dipakai.
+            host = self._host_tensor.index_select(0, torch.tensor(slots))
+        if self._tensor is None:
+            return host
+        device_tensor = self._tensor[:count]
+        device_tensor.copy_(host, non_blocking=True)
+        return device_tensor
@@ -0,0 +1,192 @@
+# core/recorder.py
+
+import json
+import queue
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+# Impor QThread dan pyqtSignal agar encoding video berjalan di thread sendiri
+from PyQt5.QtCore import QThread, pyqtSignal
+
+RECORD_STREAMS = ('raw', 'annotated')
+# Folder default rekaman misi, di root proyek.
+DEFAULT_RECORDINGS_DIR = Path(__file__).resolve().parents[1] / 'recordings'
+
+
+class RecordItem:
+    """Satu frame yang menunggu di-encode, beserta metadata deteksinya."""
+    __slots__ = ('frame_id', 'timestamp', 'frames', 'detections', 'degree')
+
+    def __init__(self, frame_id, timestamp, frames, detections, degree):
+        self.frame_id = frame_id
+        self.timestamp = timestamp # Waktu pengambilan frame (time.monotonic)
+        self.frames = frames # {'raw': array BGR, 'annotated': array BGR}
+        self.detections = detections # Daftar (class_name, conf, (x1, y1, x2, y2))
+        self.degree = degree
+
+
+class FrameRecorder(QThread):
+    """
+    Perekam video yang tidak pernah memperlambat loop deteksi.
+
+    Thread deteksi hanya memanggil submit(), yang memasukkan frame ke antrian
+    berkapasitas tetap tanpa menunggu; jika antrian penuh, frame dibuang dan
+    dihitung. Encoding (cv2.VideoWriter) dan penulisan metadata terjadi di thread ini.
+
+    Rekaman dipecah per segmen (default 60 detik) agar misi panjang bisa dicari:
+        <folder>/raw_0000.mp4, annotated_0000.mp4, metadata_0000.jsonl, ...
+        <folder>/index.json  -> daftar segmen (waktu, frame_id awal/akhir, file)
+    Setiap baris metadata memuat 'segment_frame', yaitu posisi frame di file video segmen.
+    """
+    # Dipancarkan setiap segmen selesai ditulis: (path index.json, nomor segmen)
+    segment_closed = pyqtSignal(str, int)
+    # Dipancarkan jika VideoWriter gagal dibuka atau penulisan gagal.
+    record_failed = pyqtSignal(str)
+
+    def __init__(self, output_dir, streams=RECORD_STREAMS, fps=30.0, segment_seconds=60.0,
+                 queue_size=64, fourcc='mp4v'):
+        """
+        Args:
+            output_dir (str | Path): Folder sesi rekaman (dibuat jika belum ada).
+            streams (tuple): Stream yang direkam, subset dari RECORD_STREAMS.
+            fps (float): FPS yang ditulis di header video (durasi sebenarnya ada di metadata).
+            segment_seconds (float): Panjang maksimum satu segmen.
+            queue_size (int): Kapasitas antrian encoder; frame dibuang jika penuh.
+            fourcc (str): Codec cv2.VideoWriter.
+        """
+        super().__init__()
+        unknown = set(streams) - set(RECORD_STREAMS)
+        if unknown or not streams:
+            raise ValueError(f"Unknown record streams {sorted(unknown)}, expected a subset of {RECORD_STREAMS}")
+        self.output_dir = Path(output_dir)
+        self.streams = tuple(streams)
+        self.fps = fps
+        self.segment_seconds = segment_seconds
+        self.fourcc = fourcc
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.running = True
+        self.submitted = 0
+        self.dropped = 0 # Frame yang dibuang karena antrian encoder penuh
+        self.frames_written = 0
+        self.segments = [] # Entri index.json untuk segmen yang sudah ditutup
+        self.started_at = datetime.now()
+
+        # Status segmen aktif (hanya disentuh oleh thread encoder)
+        self._writers = {}
+        self._metadata_file = None
+        self._segment = None
+
+    @property
+    def index_path(self):
+        return self.output_dir / 'index.json'
+
+    def wants(self, stream):
+        """True jika stream tersebut ikut direkam."""
+        return stream in self.streams
+
+    def submit(self, packet, frames):
+        """
+        Memasukkan frame ke antrian encoder tanpa pernah memblokir.
+
+        Args:
+            packet (FramePacket): Paket frame (frame_id, timestamp, detections, degree).
+            frames (dict): {'raw': array, 'annotated': array} untuk stream yang direkam.
+
+        Returns:
+            bool: False jika frame dibuang karena antrian penuh.
+        """
+        self.submitted += 1
+        item = RecordItem(packet.frame_id, packet.timestamp, frames, list(packet.detections), packet.degree)
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def run(self):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            while self.running or not self.queue.empty():
+                try:
+                    item = self.queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                self._write(item)
+        except Exception as e:
+            self.record_failed.emit(f"Recording stopped: {e}")
+        finally:
+            self._close_segment()
+
+    def stop(self):
+        """Berhenti setelah semua frame yang sudah diantrekan selesai ditulis."""
+        self.running = False
+
+    def _write(self, item):
+        segment = self._segment
+        if segment is None or item.timestamp - segment['start_time'] >= self.segment_seconds:
+            self._close_segment()
+            self._open_segment(item)
+            segment = self._segment
+
+        for stream, frame in item.frames.items():
+            writer = self._writers.get(stream)
+            if writer is None:
+                # Ukuran video ditentukan oleh frame pertama segmen.
+                h, w = frame.shape[:2]
+                path = self.output_dir / segment['files'][stream]
+                writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (w, h))
+                if not writer.isOpened():
+                    raise IOError(f"Could not open video writer for {path}")
+                self._writers[stream] = writer
+            writer.write(frame)
+
+        record = {'frame_id': item.frame_id, 'timestamp': item.timestamp, 'segment_frame': segment['frames'],
+                  'degree': item.degree,
+                  'detections': [[name, round(conf, 4), list(box)] for name, conf, box in item.detections]}
+        self._metadata_file.write(json.dumps(record) + "\n")
+        segment['frames'] += 1
+        segment['last_frame_id'] = item.frame_id
+        segment['end_time'] = item.timestamp
+        self.frames_written += 1
+
+    def _open_segment(self, item):
+        number = len(self.segments)
+        files = {stream: f"{stream}_{number:04d}.mp4" for stream in self.streams}
+        files['metadata'] = f"metadata_{number:04d}.jsonl"
+        self._segment = {'segment': number, 'start_time': item.timestamp, 'end_time': item.timestamp,
+                         'first_frame_id': item.frame_id, 'last_frame_id': item.frame_id, 'frames': 0,
+                         'files': files}
+        self._metadata_file = open(self.output_dir / files['metadata'], 'w')
+
+    def _close_segment(self):
+        if self._segment is None:
+            return
+        for writer in self._writers.values():
+            writer.release()
+        self._writers = {}
+        self._metadata_file.close()
+        self._metadata_file = None
+        self.segments.append(self._segment)
+        self._segment = None
+        self._write_index()
+        self.segment_closed.emit(str(self.index_path), self.segments[-1]['segment'])
+
+    def _write_index(self):
+        """Menulis ulang index.json; dipanggil setiap segmen ditutup sehingga selalu terbaru."""
+        index = {'started_at': self.started_at.isoformat(timespec='seconds'), 'streams': list(self.streams),
+                 'fps': self.fps, 'segment_seconds': self.segment_seconds,
+                 'frames_written': self.frames_written, 'dropped': self.dropped, 'segments': self.segments}
+        self.index_path.write_text(json.dumps(index, indent=2))
+
+    def summary(self):
+        """Ringkasan statistik rekaman untuk log."""
+        drop_pct = 100 * self.dropped / self.submitted if self.submitted else 0.0
+        return (f"{self.frames_written} frame ditulis, {self.dropped} dibuang ({drop_pct:.1f}%), "
+                f"{len(self.segments)} segmen di {self.output_dir}")
+
+
+def new_session_dir(root):
+    """Folder sesi rekaman baru bernama tanggal-waktu, mis. recordings/20250101_120000."""
+    return Path(root) / datetime.now().strftime('%Y%m%d_%H%M%S')
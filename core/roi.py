@@ -0,0 +1,74 @@
+# core/roi.py
+
+import cv2
+import numpy as np
+
+ROI_MODES = ('full', 'band', 'horizon')
+
+
+class RoiSelector:
+    """
+    Menentukan region-of-interest (ROI) untuk inferensi. Bola gate selalu berada di
+    bawah cakrawala, jadi detektor cukup melihat pita air di bagian bawah frame.
+
+    Mode:
+        'full'    : seluruh frame (tanpa ROI).
+        'band'    : pita tetap, sebagai fraksi tinggi frame (mis. 0.35 - 1.0).
+        'horizon' : garis cakrawala diperkirakan otomatis, ROI dimulai sedikit di atasnya.
+    """
+    def __init__(self, mode='full', band=(0.35, 1.0), horizon_margin=0.08, smoothing=0.2, step=16):
+        """
+        Args:
+            mode (str): Salah satu dari ROI_MODES.
+            band (tuple): (atas, bawah) pita tetap sebagai fraksi tinggi frame.
+            horizon_margin (float): Jarak di atas cakrawala yang ikut dimasukkan (fraksi tinggi).
+            smoothing (float): Faktor EMA untuk perkiraan cakrawala (0-1, makin kecil makin halus).
+            step (int): Batas atas ROI dibulatkan ke 1/step tinggi frame agar ukuran crop
+                        (dan buffer preprocessing) tidak berubah di setiap frame.
+        """
+        if mode not in ROI_MODES:
+            raise ValueError(f"Unknown ROI mode '{mode}', expected one of {ROI_MODES}")
+        self.mode = mode
+        self.band = band
+        self.horizon_margin = horizon_margin
+        self.smoothing = smoothing
+        self.step = step
+        self.horizon = None # Perkiraan cakrawala (fraksi tinggi frame) setelah dihaluskan
+
+    def estimate_horizon(self, frame):
+        """
+        Memperkirakan posisi cakrawala sebagai baris dengan gradien vertikal terkuat
+        pada thumbnail grayscale. Mengembalikan fraksi tinggi frame (0 = atas).
+        """
+        thumb = cv2.resize(frame, (160, 90), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+        gy = np.abs(cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=3)).mean(axis=1)
+        gy = np.convolve(gy, np.ones(3, dtype=np.float32) / 3, mode='same')
+        # Cakrawala tidak mungkin menempel di tepi bawah; abaikan 15% baris terbawah dan baris tepi.
+        usable = gy[2:int(len(gy) * 0.85)]
+        row = int(np.argmax(usable)) + 2
+        return row / len(gy)
+
+    def select(self, frame):
+        """
+        Mengembalikan ROI (x0, y0, x1, y1) dalam piksel, atau None untuk mode 'full'.
+        """
+        if self.mode == 'full':
+            return None
+        height, width = frame.shape[:2]
+        if self.mode == 'band':
+            top, bottom = self.band
+        else:
+            estimate = self.estimate_horizon(frame)
+            if self.horizon is None:
+                self.horizon = estimate
+            else:
+                self.horizon += self.smoothing * (estimate - self.horizon)
+            top, bottom = max(self.horizon - self.horizon_margin, 0.0), 1.0
+        # Bulatkan ke bawah agar ROI sedikit lebih besar, bukan terpotong.
+        top = np.floor(top * self.step) / self.step
+        y0 = int(top * height)
+        y1 = int(round(bottom * height))
+        if y1 - y0 < 32:
+            return None
+        return (0, y0, width, y1)
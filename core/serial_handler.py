@@ -2,28 +2,86 @@
 
 import serial
 import serial.tools.list_ports
+import threading
 import time
+from collections import deque
 # Impor QObject, QThread, dan pyqtSignal dari PyQt5 untuk fungsionalitas threading dan sinyal
-from PyQt5.QtCore import QObject, QThread, pyqtSignal
+from PyQt5.QtCore import QObject, QThread, QTimer, Qt, pyqtSignal
+
+from core.telemetry import TelemetryParser
+from core.line_framer import LineFramer, MAX_LINE_LENGTH
+from core.binary_protocol import (FrameDecoder, FrameEncoder, HELLO_REQUEST, HELLO_ACK, TEXT_REQUEST, ESTOP_COMMAND,
+                                  MSG_TELEMETRY, MSG_TEXT)
+
+# Timeout read() port serial (detik). Thread pembaca memblokir di read() selama
+# paling lama ini saat ESP32 diam, sehingga stop() tetap responsif tanpa busy-loop.
+READ_TIMEOUT = 0.1
+# Status koneksi SerialHandler (dipancarkan lewat state_changed).
+CONNECTION_STATES = ('disconnected', 'connecting', 'connected', 'lost', 'retrying')
+# Waktu tunggu setelah port dibuka agar ESP32 selesai reset (detik).
+SETTLE_TIME = 2.0
+# Jeda sambung ulang (detik): mulai dari RECONNECT_DELAY, berlipat dua hingga MAX_RECONNECT_DELAY.
+RECONNECT_DELAY = 0.5
+MAX_RECONNECT_DELAY = 10.0
+# Protokol yang bisa diminta saat connect: teks (default, "T:..." / "S..;D..") atau biner
+# (frame COBS + CRC16, lihat core/binary_protocol.py), dinegosiasikan dengan firmware.
+PROTOCOLS = ('text', 'binary')
+# Interval minimum (detik) antar snapshot telemetri ke thread GUI (10 Hz).
+TELEMETRY_EMIT_INTERVAL = 0.1
+# Laju maksimum perintah setpoint (Hz). Laju juga dibatasi oleh kapasitas baud rate.
+MAX_COMMAND_RATE = 50.0
+# Timeout write() (detik): port yang macet tidak menahan thread penulis selamanya.
+WRITE_TIMEOUT = 0.5
+
 
 # === KELAS PEMBACA SERIAL (BERJALAN DI THREAD TERPISAH) ===
 class SerialReader(QThread):
     """
     Kelas ini berjalan di thread terpisah. Tujuannya adalah untuk terus-menerus
     mendengarkan data yang masuk dari port serial tanpa membuat antarmuka (GUI) utama menjadi beku.
+
+    Thread memblokir di read() (dengan timeout port) alih-alih memeriksa in_waiting
+    terus-menerus, lalu membaca semua byte yang tersedia sekaligus dan memotongnya
+    menjadi baris dengan LineFramer.
+
+    Baris telemetri ("T:...") diurai di thread ini oleh TelemetryParser dan hanya
+    snapshot status terbaru yang dipancarkan, paling sering sekali per emit_interval,
+    sehingga kerja thread GUI tidak bertambah seiring laju telemetri.
+
+    Dengan expect_binary, pembaca menunggu baris HELLO_ACK dari firmware; byte setelahnya
+    adalah aliran frame biner (FrameDecoder) dan protocol_changed dipancarkan.
     """
     # Definisikan sinyal yang akan dipancarkan saat ada data baru yang diterima.
-    # Sinyal ini membawa satu argumen string (data yang dibaca).
+    # Sinyal ini membawa satu argumen string: baris selain telemetri (pesan, log ESP32).
     data_received = pyqtSignal(str)
+    # Snapshot telemetri terbaru (TelemetryRecord), dengan laju terbatas.
+    telemetry_received = pyqtSignal(object)
+    # Protokol aktif berubah ('binary' setelah firmware mengonfirmasi negosiasi).
+    protocol_changed = pyqtSignal(str)
     
     # Sinyal baru untuk memberitahu bahwa koneksi hilang saat proses membaca.
     connection_lost = pyqtSignal()
 
-    def __init__(self, serial_instance):
-        """Konstruktor, menerima instance koneksi serial yang aktif."""
+    def __init__(self, serial_instance, max_line=MAX_LINE_LENGTH, emit_interval=TELEMETRY_EMIT_INTERVAL):
+        """
+        Konstruktor, menerima instance koneksi serial yang aktif.
+
+        Args:
+            serial_instance (serial.Serial): Port yang sudah terbuka, dengan timeout baca (READ_TIMEOUT).
+            max_line (int): Panjang baris maksimum sebelum dibuang sebagai sampah.
+            emit_interval (float): Jeda minimum (detik) antar sinyal telemetry_received.
+        """
         super().__init__()
         self.ser = serial_instance
         self.running = True # Flag untuk mengontrol apakah loop harus terus berjalan.
+        self.framer = LineFramer(max_line)
+        self.parser = TelemetryParser()
+        self.decoder = FrameDecoder()
+        self.emit_interval = emit_interval
+        self.protocol = 'text'
+        self.expect_binary = False # Diatur SerialHandler saat meminta protokol biner
+        self.bytes_read = 0
+        self.lines_read = 0
 
     def run(self):
         """
@@ -31,82 +89,456 @@ class SerialReader(QThread):
         Ini adalah inti dari proses 'mendengarkan'.
         """
         print("Serial reader thread dimulai...")
+        framer = self.framer
+        parser = self.parser
+        last_emit = 0.0
         # Loop akan terus berjalan selama flag 'running' adalah True dan koneksi serial terbuka.
         while self.running and self.ser and self.ser.is_open:
             try:
-                # Cek apakah ada byte yang menunggu untuk dibaca di buffer serial.
-                if self.ser.in_waiting > 0:
-                    # Baca satu baris data (diakhiri dengan karakter newline '\n').
-                    line = self.ser.readline()
-                    # Decode dari format bytes ke string, abaikan error jika ada karakter aneh.
-                    # .strip() menghapus spasi atau karakter tak terlihat di awal/akhir.
-                    text = line.decode('utf-8', errors='ignore').strip()
-                    if text:
-                        # Jika teks tidak kosong, pancarkan sinyal dengan data tersebut.
-                        self.data_received.emit(text)
+                # Tunggu minimal 1 byte (hingga timeout port), lalu ambil semua yang sudah ada di buffer.
+                data = self.ser.read(max(1, self.ser.in_waiting))
             except serial.SerialException:
                 # Jika terjadi error (misal: perangkat dicabut), hentikan loop.
                 print("Error port serial. Menghentikan thread pembaca.")
                 # Pancarkan sinyal bahwa koneksi telah hilang.
                 self.connection_lost.emit()
                 break # Keluar dari loop while
+            if data:
+                self.bytes_read += len(data)
+                now = time.monotonic()
+                if self.protocol == 'binary':
+                    self._handle_frames(data, now)
+                else:
+                    for text in framer.feed(data, HELLO_ACK if self.expect_binary else None):
+                        self.lines_read += 1
+                        if not parser.parse(text, now) and text != HELLO_ACK:
+                            self.data_received.emit(text)
+                    if framer.matched:
+                        self.protocol = 'binary'
+                        self.protocol_changed.emit(self.protocol)
+                        self._handle_frames(framer.take_buffer(), now)
+            # Juga dicek saat timeout, sehingga telemetri terakhir tetap terkirim walau ESP32 diam.
+            if parser.dirty:
+                now = time.monotonic()
+                if now - last_emit >= self.emit_interval:
+                    last_emit = now
+                    self.telemetry_received.emit(parser.snapshot())
+        if parser.errors:
+            print(f"Serial reader: {parser.errors} bagian telemetri gagal diurai.")
+        decoder = self.decoder
+        if decoder.crc_errors or decoder.malformed or decoder.lost:
+            print(f"Serial reader: {decoder.frames} frame biner, {decoder.crc_errors} CRC salah, "
+                  f"{decoder.malformed} rusak, {decoder.lost} hilang.")
+        if framer.dropped:
+            print(f"Serial reader: {framer.dropped} baris terlalu panjang dibuang.")
         print("Serial reader thread selesai.")
 
+    def _handle_frames(self, data, now):
+        """Mendekode frame biner dari potongan byte dan menyalurkannya seperti baris teks."""
+        for msg_type, _, payload in self.decoder.feed(data):
+            self.lines_read += 1
+            if msg_type == MSG_TELEMETRY:
+                self.parser.merge_binary(payload, now)
+            elif msg_type == MSG_TEXT:
+                self.data_received.emit(payload.decode('utf-8', errors='ignore'))
+
     def stop(self):
         """Metode untuk menghentikan loop pembacaan dari luar thread."""
         self.running = False
 
 
+# === KELAS PENULIS SERIAL (BERJALAN DI THREAD TERPISAH) ===
+class SerialWriter(QThread):
+    """
+    Thread yang menulis perintah ke port serial sehingga port yang lambat atau macet
+    tidak membekukan GUI.
+
+    Ada dua jalur:
+      - Setpoint (S...;D...): kotak surat satu slot. Setpoint baru menggantikan
+        setpoint yang belum terkirim (dihitung sebagai 'dropped'), dan penulisan
+        dibatasi oleh max_rate serta waktu kirim byte pada baud rate.
+      - Prioritas (emergency stop): antrian FIFO yang selalu dikirim lebih dulu,
+        tanpa batas laju. Setpoint yang masih menunggu dibuang agar tidak menyusul
+        perintah stop.
+
+    Perintah selalu diterima sebagai teks ("S1550;D90\n") dan baru dikodekan saat
+    ditulis, sesuai protokol yang aktif saat itu (teks atau frame biner).
+    """
+    # Sinyal saat port gagal ditulis (misal: perangkat dicabut).
+    connection_lost = pyqtSignal()
+
+    def __init__(self, serial_instance, baud_rate=115200, max_rate=MAX_COMMAND_RATE, stats=None):
+        """
+        Args:
+            serial_instance (serial.Serial): Port yang sudah terbuka.
+            baud_rate (int): Baud rate port, untuk menghitung waktu kirim per byte (8N1 = 10 bit).
+            max_rate (float): Laju maksimum setpoint (Hz); 0 = hanya dibatasi baud rate.
+            stats (StageStats | None): Jika diberikan, 'serial_write' (durasi write()),
+                'cmd_latency' (antri -> terkirim), dan penghitung 'serial' (dibuang) dicatat.
+        """
+        super().__init__()
+        self.ser = serial_instance
+        self.byte_time = 10.0 / baud_rate
+        self.min_interval = 1.0 / max_rate if max_rate else 0.0
+        self.stats = stats
+        self.running = True
+        self._cond = threading.Condition()
+        self._setpoint = None # (bytes, waktu antri) setpoint terbaru yang belum terkirim
+        self._priority = deque() # (bytes, waktu antri) perintah prioritas
+        self._next_write = 0.0 # Waktu (monotonic) paling awal setpoint berikutnya boleh ditulis
+        self.encoder = None # FrameEncoder saat protokol biner aktif, None = teks
+        self.written = 0
+        self.priority_written = 0
+        self.dropped = 0 # Setpoint yang digantikan sebelum sempat terkirim
+        self.timeouts = 0 # write() yang melewati WRITE_TIMEOUT
+
+    def submit(self, data):
+        """Menaruh setpoint di kotak surat, menggantikan setpoint yang belum terkirim."""
+        item = (data, time.monotonic())
+        with self._cond:
+            if self._setpoint is not None:
+                self._count_drop()
+            self._setpoint = item
+            self._cond.notify()
+
+    def submit_priority(self, data):
+        """Mengantrekan perintah prioritas (mis. emergency stop) di depan semua setpoint."""
+        item = (data, time.monotonic())
+        with self._cond:
+            if self._setpoint is not None:
+                self._setpoint = None
+                self._count_drop()
+            self._priority.append(item)
+            self._cond.notify()
+
+    def set_protocol(self, protocol):
+        """Beralih ke protokol 'text' atau 'binary' untuk perintah yang ditulis berikutnya."""
+        with self._cond:
+            self.encoder = FrameEncoder() if protocol == 'binary' else None
+
+    def encode(self, data, priority=False):
+        """Mengodekan perintah teks sesuai protokol aktif; ESTOP_COMMAND prioritas dikirim sebagai MSG_ESTOP."""
+        encoder = self.encoder
+        if encoder is None:
+            return data.encode('utf-8')
+        if priority and data.strip() == ESTOP_COMMAND:
+            return encoder.estop()
+        return encoder.command(data)
+
+    def _count_drop(self):
+        self.dropped += 1
+        if self.stats is not None:
+            self.stats.set_counter('serial', self.dropped)
+
+    def _next_item(self):
+        """Menunggu perintah berikutnya yang boleh dikirim; (None, False) saat thread dihentikan."""
+        with self._cond:
+            while self.running:
+                if self._priority:
+                    return self._priority.popleft(), True
+                if self._setpoint is not None:
+                    delay = self._next_write - time.monotonic()
+                    if delay <= 0:
+                        item, self._setpoint = self._setpoint, None
+                        return item, False
+                    self._cond.wait(delay)
+                else:
+                    self._cond.wait()
+        return None, False
+
+    def run(self):
+        print("Serial writer thread dimulai...")
+        stats = self.stats
+        while True:
+            item, priority = self._next_item()
+            if item is None:
+                break
+            data, queued = item
+            try:
+                payload = self.encode(data, priority)
+            except ValueError as e:
+                print(f"Perintah tidak bisa dikodekan: {e}")
+                continue
+            start = time.perf_counter()
+            try:
+                self.ser.write(payload)
+            except serial.SerialTimeoutException:
+                # Port macet sesaat: perintah ini hilang, setpoint berikutnya tetap dicoba.
+                self.timeouts += 1
+                print(f"Timeout saat menulis ke port serial ({self.timeouts}x).")
+                continue
+            except serial.SerialException as e:
+                print(f"Error saat menulis ke port serial: {e}")
+                self.connection_lost.emit()
+                break
+            now = time.monotonic()
+            self._next_write = now + max(self.min_interval, len(payload) * self.byte_time)
+            if priority:
+                self.priority_written += 1
+            else:
+                self.written += 1
+            if stats is not None:
+                stats.add('serial_write', time.perf_counter() - start)
+                stats.add('cmd_latency', now - queued)
+        print(f"Serial writer thread selesai: {self.written} setpoint, {self.priority_written} prioritas, "
+              f"{self.dropped} dibuang.")
+
+    def stop(self):
+        """Menghentikan thread; perintah yang belum terkirim dibuang."""
+        with self._cond:
+            self.running = False
+            self._cond.notify()
+
+
+# === IDENTITAS PERANGKAT & PEMBUKA PORT (LATAR BELAKANG) ===
+class PortIdentity:
+    """
+    Identitas perangkat serial yang tetap sama walau nama port berubah (mis.
+    /dev/ttyUSB0 menjadi /dev/ttyUSB1 setelah kabel dicabut-pasang): nomor seri USB,
+    VID/PID, dan lokasi port USB. Nama device dipakai jika identitas lain tidak ada.
+    """
+    __slots__ = ('device', 'serial_number', 'vid', 'pid', 'location')
+
+    def __init__(self, device, serial_number=None, vid=None, pid=None, location=None):
+        self.device = device
+        self.serial_number = serial_number
+        self.vid = vid
+        self.pid = pid
+        self.location = location
+
+    @classmethod
+    def from_device(cls, device):
+        """Membaca identitas USB dari daftar port sistem; hanya nama device jika tidak ditemukan."""
+        for port in serial.tools.list_ports.comports():
+            if port.device == device:
+                return cls(device, port.serial_number, port.vid, port.pid, port.location)
+        return cls(device)
+
+    def resolve(self):
+        """
+        Mencari nama device saat ini: cocokkan nomor seri USB lebih dulu, lalu lokasi
+        port USB, lalu nama device terakhir.
+        """
+        ports = serial.tools.list_ports.comports()
+        same_usb = [port for port in ports if self.vid is not None and (port.vid, port.pid) == (self.vid, self.pid)]
+        if self.serial_number:
+            for port in same_usb:
+                if port.serial_number == self.serial_number:
+                    return port.device
+        if self.location:
+            for port in same_usb:
+                if port.location == self.location:
+                    return port.device
+        return self.device
+
+    def describe(self):
+        return f"{self.device} (SN {self.serial_number})" if self.serial_number else self.device
+
+
+class SerialConnector(QThread):
+    """
+    Satu percobaan membuka port di thread latar: mencari device dari PortIdentity,
+    membuka port, lalu menunggu ESP32 stabil (reset karena DTR) tanpa membekukan GUI.
+    """
+    opened = pyqtSignal(object, str) # (serial.Serial, nama device)
+    failed = pyqtSignal(str)
+
+    def __init__(self, identity, baud_rate, settle_time=SETTLE_TIME):
+        super().__init__()
+        self.identity = identity
+        self.baud_rate = baud_rate
+        self.settle_time = settle_time
+        self._cancelled = threading.Event()
+
+    def run(self):
+        device = self.identity.resolve()
+        try:
+            # Timeout baca pendek agar thread pembaca responsif saat dihentikan.
+            ser = serial.Serial(device, self.baud_rate, timeout=READ_TIMEOUT, write_timeout=WRITE_TIMEOUT)
+        except (serial.SerialException, OSError) as e:
+            self.failed.emit(str(e))
+            return
+        # Beri waktu agar koneksi (terutama di sisi ESP32) stabil; bisa dibatalkan.
+        if self._cancelled.wait(self.settle_time):
+            ser.close()
+            return
+        self.opened.emit(ser, device)
+
+    def cancel(self):
+        self._cancelled.set()
+
+
 # === KELAS UTAMA UNTUK MENGELOLA KONEKSI SERIAL ===
 # Mewarisi dari QObject agar bisa menggunakan sistem sinyal & slot PyQt.
 class SerialHandler(QObject):
     """
     Kelas ini mengelola semua aspek komunikasi serial dengan perangkat keras (ESP32),
     termasuk mengirim, menerima, dan menangani error koneksi.
+
+    Koneksi dikelola sebagai state machine tanpa blokir di thread GUI:
+    disconnected -> connecting -> connected -> lost -> retrying -> connected ...
+    Port dibuka oleh SerialConnector di thread latar. Jika koneksi hilang, port yang
+    sama (dicari lewat PortIdentity) dibuka ulang dengan jeda eksponensial, dan
+    perintah terakhir dikirim ulang setelah tersambung kembali.
     """
     # Definisikan sinyal di sini untuk meneruskan sinyal dari SerialReader.
     connection_lost = pyqtSignal()
+    # Perubahan status koneksi: (salah satu CONNECTION_STATES, pesan untuk UI)
+    state_changed = pyqtSignal(str, str)
 
     def __init__(self):
         # Panggil konstruktor dari QObject. Ini wajib.
         super().__init__()
         self.ser = None # Menyimpan objek koneksi serial dari pyserial
         self.reader_thread = None # Menyimpan objek thread pembaca
+        self.writer_thread = None # Menyimpan objek thread penulis
+        self.connector = None # SerialConnector yang sedang berjalan
+        self.protocol = 'text' # Protokol aktif ('text' atau 'binary')
+        self.stats = None # StageStats opsional; durasi setiap penulisan serial dicatat di sini
+        self.state = 'disconnected'
+        self.target = None # PortIdentity yang ingin disambungkan; None = pengguna memutus koneksi
+        self.baud_rate = 115200
+        self.requested_protocol = 'text'
+        self.reconnecting = False # True setelah pernah tersambung: kegagalan berikutnya dicoba ulang
+        self.retry_delay = RECONNECT_DELAY
+        self.attempts = 0
+        self.last_command = None # (data, prioritas) terakhir, dikirim ulang setelah tersambung kembali
+        self.retry_timer = QTimer(self)
+        self.retry_timer.setSingleShot(True)
+        self.retry_timer.timeout.connect(self._attempt)
 
     def list_available_ports(self):
         """Mendeteksi semua COM port yang tersedia di sistem dan mengembalikannya sebagai daftar."""
         ports = serial.tools.list_ports.comports()
         return [port.device for port in ports]
 
-    def connect(self, port, baud_rate=115200):
-        """Mencoba membuka koneksi serial dan memulai thread pembaca."""
-        try:
-            if self.ser and self.ser.is_open:
-                self.disconnect() # Putuskan koneksi lama jika ada
-                
-            # Buat instance koneksi serial. Timeout 1 detik.
-            self.ser = serial.Serial(port, baud_rate, timeout=1)
-            time.sleep(2) # Beri waktu agar koneksi (terutama di sisi ESP32) stabil.
-            
-            if self.ser.is_open:
-                print(f"Berhasil terhubung ke {port}.")
-                # Buat instance thread pembaca dengan koneksi yang baru dibuat.
-                self.reader_thread = SerialReader(self.ser)
-                # Hubungkan sinyal dari thread ke sinyal di handler ini (meneruskan sinyal).
-                # Ini penting agar sinyal 'connection_lost' dari thread bisa ditangkap oleh DashboardWindow.
-                self.reader_thread.connection_lost.connect(self.connection_lost.emit)
-                # Jalankan thread di latar belakang.
-                self.reader_thread.start()
-                return True
-            return False
-        except serial.SerialException as e:
-            print(f"Error saat menghubungkan ke {port}: {e}")
-            self.ser = None
-            return False
+    def _set_state(self, state, message):
+        self.state = state
+        print(f"Serial: {state} - {message}")
+        self.state_changed.emit(state, message)
 
-    def disconnect(self):
-        """Menghentikan thread pembaca dengan aman dan menutup koneksi serial."""
-        # Hentikan thread pembaca terlebih dahulu sebelum menutup port.
+    def connect(self, port, baud_rate=115200, protocol='text'):
+        """
+        Memulai koneksi ke port tanpa menunggu; hasilnya dilaporkan lewat state_changed.
+
+        Args:
+            protocol (str): 'text' atau 'binary'. Protokol biner diminta lewat baris
+                HELLO_REQUEST; jika firmware tidak mengonfirmasi, koneksi tetap memakai teks.
+
+        Returns:
+            bool: True jika percobaan koneksi dimulai.
+        """
+        if self.state != 'disconnected':
+            self.disconnect() # Putuskan koneksi lama jika ada
+        self.target = PortIdentity.from_device(port)
+        self.baud_rate = baud_rate
+        self.requested_protocol = protocol
+        self.reconnecting = False
+        self.retry_delay = RECONNECT_DELAY
+        self.attempts = 0
+        self._attempt()
+        return True
+
+    def _attempt(self):
+        """Satu percobaan membuka port target di thread latar."""
+        if self.target is None:
+            return
+        self.attempts += 1
+        if self.reconnecting:
+            self._set_state('retrying', f"Reconnecting to {self.target.describe()} (attempt {self.attempts})...")
+        else:
+            self._set_state('connecting', f"Connecting to {self.target.device}...")
+        self.connector = SerialConnector(self.target, self.baud_rate)
+        self.connector.opened.connect(self._on_opened)
+        self.connector.failed.connect(self._on_failed)
+        self.connector.start()
+
+    def _on_failed(self, error):
+        if self.sender() is not self.connector or self.target is None:
+            return # Percobaan lama atau sudah dibatalkan pengguna
+        self._release_connector()
+        print(f"Error saat menghubungkan ke {self.target.device}: {error}")
+        if not self.reconnecting:
+            self.target = None
+            self._set_state('disconnected', "Failed to connect")
+            return
+        self._schedule_retry()
+
+    def _release_connector(self):
+        # Sinyal dipancarkan tepat sebelum run() selesai; tunggu agar QThread tidak dihapus saat masih berjalan.
+        self.connector.wait()
+        self.connector = None
+
+    def _schedule_retry(self):
+        delay = self.retry_delay
+        self.retry_delay = min(self.retry_delay * 2, MAX_RECONNECT_DELAY)
+        self._set_state('retrying', f"Reconnecting in {delay:.1f} s...")
+        self.retry_timer.start(int(delay * 1000))
+
+    def _on_opened(self, ser, device):
+        if self.sender() is not self.connector or self.target is None:
+            ser.close() # Dibatalkan saat port sedang dibuka
+            return
+        self._release_connector()
+        if device != self.target.device:
+            print(f"Perangkat {self.target.describe()} sekarang di {device}.")
+            self.target.device = device
+        self.ser = ser
+        self._start_threads()
+        replay = self.reconnecting and self.last_command is not None
+        if replay:
+            # Kirim ulang perintah terakhir agar ESP32 (yang mungkin ter-reset) kembali ke setpoint saat ini.
+            data, priority = self.last_command
+            if priority:
+                self.writer_thread.submit_priority(data)
+            else:
+                self.writer_thread.submit(data)
+        self.reconnecting = True
+        self.retry_delay = RECONNECT_DELAY
+        self.attempts = 0
+        print(f"Berhasil terhubung ke {device}.")
+        self._set_state('connected', "Reconnected" if replay else "Connected")
+
+    def _start_threads(self):
+        """Memulai thread pembaca dan penulis untuk port yang baru dibuka."""
+        # Buat instance thread pembaca dengan koneksi yang baru dibuat.
+        self.reader_thread = SerialReader(self.ser)
+        # Sinyal 'connection_lost' dari thread ditangani di sini (thread GUI) untuk menyambung ulang.
+        self.reader_thread.connection_lost.connect(self._on_link_lost)
+        # Jalankan thread di latar belakang.
+        self.reader_thread.start()
+        # Thread penulis: GUI hanya menaruh perintah, tidak pernah menunggu port.
+        self.writer_thread = SerialWriter(self.ser, self.baud_rate, stats=self.stats)
+        self.writer_thread.connection_lost.connect(self._on_link_lost)
+        self.writer_thread.start()
+        self.protocol = 'text'
+        # Newline di depan menutup sisa baris/frame setengah jadi di buffer firmware, karena
+        # board yang tidak ter-reset bisa masih berada di mode biner dari sesi sebelumnya.
+        if self.requested_protocol == 'binary':
+            # DirectConnection: penulis beralih di thread pembaca, tepat saat konfirmasi tiba.
+            self.reader_thread.protocol_changed.connect(self.writer_thread.set_protocol, Qt.DirectConnection)
+            self.reader_thread.protocol_changed.connect(self.on_protocol_changed)
+            self.reader_thread.expect_binary = True
+            self.writer_thread.submit_priority(f"\n{HELLO_REQUEST}\n")
+        else:
+            self.writer_thread.submit_priority(f"\n{TEXT_REQUEST}\n")
+
+    def _on_link_lost(self):
+        """Slot saat pembaca atau penulis gagal (mis. kabel dicabut): tutup, lalu coba sambung ulang."""
+        if self.state != 'connected':
+            return # Pembaca dan penulis bisa sama-sama melapor
+        self._close()
+        self.connection_lost.emit()
+        self._set_state('lost', "Connection lost")
+        self._schedule_retry()
+
+    def _close(self):
+        """Menghentikan thread pembaca/penulis dengan aman dan menutup port."""
+        # Hentikan thread penulis dan pembaca terlebih dahulu sebelum menutup port.
+        if self.writer_thread:
+            self.writer_thread.stop()
+            self.writer_thread.wait()
+            self.writer_thread = None
         if self.reader_thread:
             self.reader_thread.stop() # Set flag 'running' menjadi False
             self.reader_thread.wait() # Tunggu thread benar-benar berhenti
@@ -117,23 +549,46 @@ class SerialHandler(QObject):
             self.ser.close()
             print("Koneksi serial ditutup.")
         self.ser = None
+        self.protocol = 'text'
+
+    def disconnect(self):
+        """Memutus koneksi atas permintaan pengguna: batalkan percobaan/sambung ulang, lalu tutup port."""
+        self.target = None
+        self.retry_timer.stop()
+        if self.connector is not None:
+            self.connector.cancel()
+            self.connector.wait()
+            self.connector = None
+        self._close()
+        if self.state != 'disconnected':
+            self._set_state('disconnected', "Disconnected")
+
+    def on_protocol_changed(self, protocol):
+        self.protocol = protocol
+        print(f"Protokol serial: {protocol}")
 
     def send_data(self, data):
-        """Mengirim data string ke perangkat yang terhubung."""
-        if self.is_connected():
-            try:
-                # Kirim data sebagai bytes dengan encoding utf-8.
-                self.ser.write(data.encode('utf-8'))
-                return True
-            except serial.SerialException as e:
-                print(f"Error saat menulis ke port serial: {e}")
-                # Jika terjadi error saat menulis (misal: kabel dicabut),
-                # pancarkan sinyal koneksi hilang dan putuskan hubungan.
-                self.connection_lost.emit()
-                self.disconnect()
-                return False
+        """
+        Mengirim setpoint (string) ke perangkat tanpa menunggu port. Setpoint yang
+        belum terkirim digantikan oleh yang terbaru (lihat SerialWriter).
+
+        Returns:
+            bool: True jika perintah diterima untuk dikirim.
+        """
+        self.last_command = (data, False)
+        if self.is_connected() and self.writer_thread:
+            self.writer_thread.submit(data)
+            return True
+        return False
+
+    def send_priority(self, data):
+        """Mengirim perintah darurat (mis. emergency stop) di depan semua setpoint."""
+        self.last_command = (data, True)
+        if self.is_connected() and self.writer_thread:
+            self.writer_thread.submit_priority(data)
+            return True
         return False
 
     def is_connected(self):
         """Mengecek apakah koneksi serial sedang aktif."""
-        return self.ser is not None and self.ser.is_open
+        return self.state == 'connected' and self.ser is not None and self.ser.is_open
@@ -0,0 +1,142 @@
+# core/telemetry.py
+
+import struct
+import time
+
+from core.binary_protocol import TELEMETRY, FLAG_GPS, FLAG_BATTERY, FLAG_COMPASS, FLAG_SPEED
+
+# Awalan baris telemetri dari ESP32, mis. "T:GPS,-6.2088,106.8456,9;BAT,12.1;COMP,187;SPD,2.3"
+TELEMETRY_PREFIX = 'T:'
+
+
+class TelemetryRecord:
+    """
+    Status telemetri terbaru ASV. Setiap field punya waktu terima sendiri
+    (time.monotonic(), None jika belum pernah diterima) sehingga konsumen bisa
+    menilai kesegaran data, mis. GPS yang sudah basi.
+    """
+    __slots__ = ('lat', 'lon', 'sats', 'gps_time', 'battery', 'battery_time', 'heading', 'heading_time',
+                 'speed', 'speed_time', 'received', 'lines')
+
+    def __init__(self):
+        self.lat = self.lon = None
+        self.sats = 0
+        self.gps_time = None
+        self.battery = None # Volt
+        self.battery_time = None
+        self.heading = None # Derajat kompas
+        self.heading_time = None
+        self.speed = None # m/s
+        self.speed_time = None
+        self.received = None # Waktu baris telemetri terakhir
+        self.lines = 0 # Jumlah baris telemetri yang digabung sejak snapshot sebelumnya
+
+    def copy(self):
+        """Salinan untuk dikirim ke thread lain (objek asli terus diperbarui pembaca)."""
+        other = TelemetryRecord.__new__(TelemetryRecord)
+        for name in self.__slots__:
+            setattr(other, name, getattr(self, name))
+        return other
+
+
+# --- Dekoder per kunci: (record, nilai setelah kunci, waktu) -> None; ValueError/IndexError jika rusak ---
+def _decode_gps(record, values, now):
+    if len(values) != 3:
+        raise ValueError("GPS expects lat,lon,sats")
+    record.lat, record.lon, record.sats = float(values[0]), float(values[1]), int(values[2])
+    record.gps_time = now
+
+
+def _decode_battery(record, values, now):
+    record.battery = float(values[0])
+    record.battery_time = now
+
+
+def _decode_compass(record, values, now):
+    record.heading = float(values[0])
+    record.heading_time = now
+
+
+def _decode_speed(record, values, now):
+    record.speed = float(values[0])
+    record.speed_time = now
+
+
+# Tabel dispatch kunci -> dekoder; kunci yang tidak dikenal dilewati (kompatibel dengan firmware baru).
+DECODERS = {
+    'GPS': _decode_gps,
+    'BAT': _decode_battery,
+    'COMP': _decode_compass,
+    'SPD': _decode_speed,
+}
+
+
+class TelemetryParser:
+    """
+    Mengurai baris telemetri "T:KEY,v1,v2;KEY,v1;..." langsung ke satu TelemetryRecord
+    yang terus diperbarui. Dipakai di thread pembaca serial sehingga thread GUI hanya
+    menerima snapshot status terbaru, bukan setiap baris.
+    """
+    def __init__(self, decoders=None):
+        self.decoders = decoders or DECODERS
+        self.state = TelemetryRecord()
+        self.dirty = False # True jika ada data baru sejak snapshot terakhir
+        self.errors = 0 # Bagian telemetri yang gagal diurai
+
+    def parse(self, line, now=None):
+        """
+        Mengurai satu baris.
+
+        Returns:
+            bool: True jika baris adalah telemetri (sudah digabung ke state), False jika bukan.
+        """
+        if not line.startswith(TELEMETRY_PREFIX):
+            return False
+        now = time.monotonic() if now is None else now
+        state = self.state
+        decoders = self.decoders
+        for part in line[len(TELEMETRY_PREFIX):].split(';'):
+            key, _, rest = part.partition(',')
+            decoder = decoders.get(key)
+            if decoder is None:
+                continue
+            try:
+                decoder(state, rest.split(','), now)
+            except (ValueError, IndexError):
+                self.errors += 1
+        state.received = now
+        state.lines += 1
+        self.dirty = True
+        return True
+
+    def merge_binary(self, payload, now=None):
+        """Menggabungkan payload MSG_TELEMETRY biner (lihat core/binary_protocol.py) ke state."""
+        now = time.monotonic() if now is None else now
+        try:
+            _, flags, lat, lon, sats, battery_mv, heading_cdeg, speed_cms = TELEMETRY.unpack(payload)
+        except struct.error:
+            self.errors += 1
+            return
+        state = self.state
+        if flags & FLAG_GPS:
+            state.lat, state.lon, state.sats = lat * 1e-7, lon * 1e-7, sats
+            state.gps_time = now
+        if flags & FLAG_BATTERY:
+            state.battery = battery_mv / 1000.0
+            state.battery_time = now
+        if flags & FLAG_COMPASS:
+            state.heading = heading_cdeg / 100.0
+            state.heading_time = now
+        if flags & FLAG_SPEED:
+            state.speed = speed_cms / 100.0
+            state.speed_time = now
+        state.received = now
+        state.lines += 1
+        self.dirty = True
+
+    def snapshot(self):
+        """Mengambil salinan status terbaru dan mengosongkan penanda data baru."""
+        record = self.state.copy()
+        self.state.lines = 0
+        self.dirty = False
+        return record
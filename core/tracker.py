@@ -0,0 +1,185 @@
+# core/tracker.py
+
+import time
+
+import cv2
+import numpy as np
+
+
+class FlowBoxTracker:
+    """
+    Pelacak kotak ringan berbasis optical flow Lucas-Kanade (sparse).
+    Beberapa titik fitur di dalam setiap kotak dilacak dari frame ke frame;
+    pergeseran median titik yang valid menggeser kotaknya.
+    """
+    def __init__(self, points_per_box=12, fb_threshold=1.0, min_points=3):
+        """
+        Args:
+            points_per_box (int): Jumlah maksimum titik fitur per kotak.
+            fb_threshold (float): Batas error forward-backward (piksel) agar titik dianggap valid.
+            min_points (int): Minimum titik valid agar kotak tidak dianggap hilang.
+        """
+        self.points_per_box = points_per_box
+        self.fb_threshold = fb_threshold
+        self.min_points = min_points
+        self.lk_params = dict(winSize=(15, 15), maxLevel=2,
+                              criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03))
+        self.boxes = np.zeros((0, 6), dtype=np.float32) # [x1, y1, x2, y2, conf, cls]
+        self.confidence = 0.0 # Rasio titik valid terburuk di antara kotak yang dilacak
+        self.lost = False # True jika ada kotak yang hilang pada update terakhir
+        self._prev_gray = None
+        self._points = None # (M, 1, 2) float32
+        self._owners = None # Indeks kotak pemilik setiap titik
+
+    def _box_points(self, gray, box):
+        """Memilih titik fitur di dalam kotak; pakai grid jika tekstur terlalu sedikit."""
+        h, w = gray.shape
+        x1, y1 = int(max(box[0], 0)), int(max(box[1], 0))
+        x2, y2 = int(min(box[2], w - 1)), int(min(box[3], h - 1))
+        if x2 - x1 < 2 or y2 - y1 < 2:
+            return np.zeros((0, 1, 2), dtype=np.float32)
+        corners = cv2.goodFeaturesToTrack(gray[y1:y2, x1:x2], self.points_per_box, 0.01, 2)
+        if corners is not None and len(corners) >= self.min_points:
+            return corners + np.array([x1, y1], dtype=np.float32)
+        # Bola polos sering tidak punya sudut; pakai grid 3x3 di bagian tengah kotak.
+        xs = np.linspace(x1, x2, 5, dtype=np.float32)[1:-1]
+        ys = np.linspace(y1, y2, 5, dtype=np.float32)[1:-1]
+        grid = np.stack(np.meshgrid(xs, ys), axis=-1).reshape(-1, 1, 2)
+        return grid.astype(np.float32)
+
+    def init(self, gray, det):
+        """Memulai pelacakan dari hasil deteksi (N, 6) pada frame grayscale."""
+        self.boxes = np.asarray(det, dtype=np.float32).reshape(-1, 6).copy()
+        points, owners = [], []
+        for i, box in enumerate(self.boxes):
+            pts = self._box_points(gray, box)
+            points.append(pts)
+            owners.append(np.full(len(pts), i, dtype=np.int32))
+        self._points = np.concatenate(points) if points else np.zeros((0, 1, 2), dtype=np.float32)
+        self._owners = np.concatenate(owners) if owners else np.zeros(0, dtype=np.int32)
+        self._prev_gray = gray
+        # Tanpa kotak pun status ini valid ("tidak ada bola"); tidak memaksa deteksi ulang.
+        self.confidence = 1.0
+        self.lost = False
+
+    def update(self, gray):
+        """
+        Menggeser semua kotak ke posisi barunya pada frame grayscale berikutnya.
+
+        Returns:
+            np.ndarray: Kotak (N, 6) yang masih terlacak; conf dikalikan rasio titik valid.
+        """
+        if len(self.boxes) == 0:
+            return self.boxes
+        if self._prev_gray is None or len(self._points) == 0:
+            self.confidence = 0.0
+            self.lost = True
+            return self.boxes[:0]
+
+        nxt, status, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, self._points, None, **self.lk_params)
+        back, status_back, _ = cv2.calcOpticalFlowPyrLK(gray, self._prev_gray, nxt, None, **self.lk_params)
+        fb_error = np.linalg.norm((back - self._points).reshape(-1, 2), axis=1)
+        valid = (status.ravel() == 1) & (status_back.ravel() == 1) & (fb_error < self.fb_threshold)
+
+        shifts = (nxt - self._points).reshape(-1, 2)
+        keep_boxes = []
+        ratios = []
+        for i in range(len(self.boxes)):
+            mine = self._owners == i
+            good = mine & valid
+            total = int(mine.sum())
+            if total == 0 or good.sum() < self.min_points:
+                continue
+            dx, dy = np.median(shifts[good], axis=0)
+            self.boxes[i, [0, 2]] += dx
+            self.boxes[i, [1, 3]] += dy
+            ratio = good.sum() / total
+            self.boxes[i, 4] *= ratio
+            keep_boxes.append(i)
+            ratios.append(ratio)
+
+        self.lost = len(keep_boxes) < len(self.boxes)
+        self.confidence = min(ratios) if ratios else 0.0
+        # Hanya titik valid milik kotak yang masih ada yang dibawa ke frame berikutnya.
+        keep_mask = valid & np.isin(self._owners, keep_boxes)
+        remap = {old: new for new, old in enumerate(keep_boxes)}
+        self._points = nxt[keep_mask]
+        self._owners = np.array([remap[o] for o in self._owners[keep_mask]], dtype=np.int32)
+        self.boxes = self.boxes[keep_boxes]
+        self._prev_gray = gray
+        return self.boxes
+
+
+class DetectThenTrack:
+    """
+    Mesin deteksi yang menjalankan detektor penuh hanya setiap N frame (atau saat
+    kepercayaan pelacakan turun) dan melacak kotak Red_Ball/Green_Ball di antaranya.
+    Antarmukanya sama dengan detektor biasa: detect(frame, stats, roi) -> det (N, 6).
+    """
+    def __init__(self, detector, interval=5, min_confidence=0.5, redetect_on_loss=True, reacquire_interval=None):
+        """
+        Args:
+            detector: Detektor dengan atribut names dan metode detect(frame, stats, roi).
+            interval (int): Detektor dijalankan paling jarang setiap `interval` frame.
+            min_confidence (float): Deteksi ulang jika kepercayaan pelacak di bawah nilai ini.
+            redetect_on_loss (bool): Deteksi ulang segera jika salah satu kotak hilang.
+            reacquire_interval (int | None): Interval deteksi saat tidak ada objek yang dilacak
+                                    (mis. lebih pendek agar bola baru cepat ditemukan);
+                                    default sama dengan `interval`.
+        """
+        self.detector = detector
+        self.names = detector.names
+        self.interval = max(1, int(interval))
+        self.min_confidence = min_confidence
+        self.redetect_on_loss = redetect_on_loss
+        self.reacquire_interval = self.interval if reacquire_interval is None else max(1, int(reacquire_interval))
+        self.tracker = FlowBoxTracker()
+        self.frames_since_detect = None
+        self.last_detect_empty = False # True jika deteksi terakhir tidak menemukan objek
+        self.detector_runs = 0
+        self.tracked_frames = 0
+
+    @property
+    def skip_ratio(self):
+        """Fraksi frame yang tidak menjalankan inferensi detektor."""
+        total = self.detector_runs + self.tracked_frames
+        return self.tracked_frames / total if total else 0.0
+
+    def summary(self):
+        return (f"detector {self.detector_runs} frames, tracked {self.tracked_frames} frames "
+                f"({100 * self.skip_ratio:.1f}% inference skipped)")
+
+    def _needs_detection(self):
+        if self.frames_since_detect is None:
+            return True
+        if self.last_detect_empty:
+            # Deteksi terakhir memang kosong (bukan kotak yang hilang saat dilacak).
+            return self.frames_since_detect >= self.reacquire_interval
+        if self.frames_since_detect >= self.interval:
+            return True
+        if self.tracker.confidence < self.min_confidence:
+            return True
+        return self.redetect_on_loss and self.tracker.lost
+
+    def detect(self, frame, stats=None, roi=None):
+        t0 = time.perf_counter()
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self._needs_detection():
+            t_gray = time.perf_counter() - t0
+            det = self.detector.detect(frame, stats, roi)
+            det = det.cpu().numpy() if hasattr(det, 'cpu') else np.asarray(det)
+            t1 = time.perf_counter()
+            self.tracker.init(gray, det)
+            self.last_detect_empty = len(det) == 0
+            self.frames_since_detect = 1
+            self.detector_runs += 1
+            if stats is not None:
+                stats.add('track_init', t_gray + time.perf_counter() - t1)
+            return det
+
+        det = self.tracker.update(gray).copy()
+        self.frames_since_detect += 1
+        self.tracked_frames += 1
+        if stats is not None:
+            stats.add('track', time.perf_counter() - t0)
+        return det
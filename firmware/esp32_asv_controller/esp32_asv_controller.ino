@@ -9,6 +9,46 @@ const int MOTOR_PIN = 12;
 Servo servoKemudi;
 Servo motorESC;
 
+// --- Protokol Biner (opsional, lihat core/binary_protocol.py di aplikasi Python) ---
+// Default tetap protokol teks. GUI meminta protokol biner dengan baris "P:BIN1";
+// firmware membalas "P:BIN1 OK" lalu kedua arah memakai frame COBS:
+// [tipe u8][seq u8][payload little-endian][crc16 u16], diakhiri byte 0x00.
+// Mode biner bertahan sampai board di-reset, jadi selama mode biner baris teks mentah
+// tetap dikenali: "P:BIN1" dijawab ulang (GUI tersambung kembali tanpa reset board) dan
+// "P:TXT" kembali ke protokol teks (sesi "Text" setelah sesi "Binary").
+const uint8_t PROTOCOL_VERSION = 1;
+const uint8_t MSG_TELEMETRY = 0x01;
+const uint8_t MSG_TEXT = 0x02;
+const uint8_t MSG_SETPOINT = 0x10;
+const uint8_t MSG_ESTOP = 0x11;
+const uint8_t FLAG_GPS = 0x01, FLAG_BATTERY = 0x02, FLAG_COMPASS = 0x04, FLAG_SPEED = 0x08;
+const size_t MAX_FRAME = 256;
+
+struct __attribute__((packed)) TelemetryPayload {
+  uint32_t timeMs;
+  uint8_t flags;
+  int32_t lat;         // 1e-7 derajat
+  int32_t lon;         // 1e-7 derajat
+  uint8_t sats;
+  uint16_t batteryMv;
+  uint16_t headingCdeg; // 0.01 derajat
+  uint16_t speedCms;    // cm/s
+};
+
+struct __attribute__((packed)) SetpointPayload {
+  uint16_t pwm;
+  uint8_t degree;
+};
+
+bool binaryMode = false;
+uint8_t txSeq = 0;
+uint8_t rxFrame[MAX_FRAME];
+size_t rxLength = 0;
+bool rxOverflow = false;
+char rxLine[32];          // Baris teks mentah yang mungkin terselip di antara frame biner
+size_t rxLineLength = 0;
+bool rxLineValid = true;
+
 // --- Variabel untuk Pengiriman Telemetri ---
 unsigned long lastTelemetryTime = 0;     // Menyimpan waktu terakhir telemetri dikirim
 const long telemetryInterval = 1000;     // Interval pengiriman telemetri (1000 ms = 1 detik)
@@ -29,7 +69,11 @@ void setup() {
 void loop() {
   // Cek apakah ada perintah masuk dari GUI
   if (Serial.available() > 0) {
-    processSerialCommand(); // Proses perintah yang masuk
+    if (binaryMode) {
+      processBinaryInput();
+    } else {
+      processSerialCommand(); // Proses perintah yang masuk
+    }
   }
 
   // Cek apakah sudah waktunya mengirim data telemetri
@@ -44,7 +88,28 @@ void processSerialCommand() {
   // Fungsi ini sama seperti sebelumnya, untuk memproses perintah seperti S1550;D90
   String dataMasuk = Serial.readStringUntil('\n');
   dataMasuk.trim();
-  
+
+  // Negosiasi protokol biner: balas konfirmasi sebagai baris teks terakhir.
+  if (dataMasuk == "P:BIN" + String(PROTOCOL_VERSION)) {
+    enterBinaryMode();
+    return;
+  }
+
+  processTextSetpoint(dataMasuk);
+}
+
+void enterBinaryMode() {
+  // Baris kosong dulu: jika aliran biner sedang berjalan, konfirmasi tetap berada di baris sendiri.
+  Serial.print("\r\n");
+  Serial.println("P:BIN" + String(PROTOCOL_VERSION) + " OK");
+  binaryMode = true;
+  rxLength = 0;
+  rxOverflow = false;
+  rxLineLength = 0;
+  rxLineValid = true;
+}
+
+void processTextSetpoint(const String &dataMasuk) {
   int s_pos = dataMasuk.indexOf('S');
   int d_pos = dataMasuk.indexOf('D');
   int semicolon_pos = dataMasuk.indexOf(';');
@@ -56,11 +121,153 @@ void processSerialCommand() {
     String degreeString = dataMasuk.substring(d_pos + 1);
     int degreeValue = degreeString.toInt();
 
-    speedValue = constrain(speedValue, 1500, 2000);
-    degreeValue = constrain(degreeValue, 0, 180);
+    applySetpoint(speedValue, degreeValue);
+  }
+}
+
+void applySetpoint(int speedValue, int degreeValue) {
+  speedValue = constrain(speedValue, 1500, 2000);
+  degreeValue = constrain(degreeValue, 0, 180);
 
-    motorESC.writeMicroseconds(speedValue);
-    servoKemudi.write(degreeValue);
+  motorESC.writeMicroseconds(speedValue);
+  servoKemudi.write(degreeValue);
+}
+
+// CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF), sama dengan binascii.crc_hqx(data, 0xFFFF).
+uint16_t crc16(const uint8_t *data, size_t length) {
+  uint16_t crc = 0xFFFF;
+  for (size_t i = 0; i < length; i++) {
+    crc ^= (uint16_t)data[i] << 8;
+    for (int bit = 0; bit < 8; bit++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+    }
+  }
+  return crc;
+}
+
+// COBS encode; output harus muat length + length / 254 + 1 byte. Mengembalikan panjang hasil.
+size_t cobsEncode(const uint8_t *input, size_t length, uint8_t *output) {
+  size_t codeIndex = 0, out = 1;
+  uint8_t code = 1;
+  for (size_t i = 0; i < length; i++) {
+    if (input[i] == 0) {
+      output[codeIndex] = code;
+      codeIndex = out++;
+      code = 1;
+    } else {
+      output[out++] = input[i];
+      if (++code == 0xFF) {
+        output[codeIndex] = code;
+        codeIndex = out++;
+        code = 1;
+      }
+    }
+  }
+  output[codeIndex] = code;
+  return out;
+}
+
+// COBS decode; mengembalikan panjang hasil, atau 0 jika data tidak valid.
+size_t cobsDecode(const uint8_t *input, size_t length, uint8_t *output) {
+  size_t in = 0, out = 0;
+  while (in < length) {
+    uint8_t code = input[in];
+    if (code == 0 || in + code > length) return 0;
+    in++;
+    for (uint8_t i = 1; i < code; i++) output[out++] = input[in++];
+    if (code < 0xFF && in < length) output[out++] = 0;
+  }
+  return out;
+}
+
+void sendFrame(uint8_t type, const uint8_t *payload, size_t length) {
+  uint8_t body[MAX_FRAME];
+  uint8_t encoded[MAX_FRAME + MAX_FRAME / 254 + 2];
+  if (length + 4 > MAX_FRAME) return;
+  body[0] = type;
+  body[1] = txSeq++;
+  memcpy(body + 2, payload, length);
+  uint16_t crc = crc16(body, length + 2);
+  body[length + 2] = crc & 0xFF;
+  body[length + 3] = crc >> 8;
+  size_t encodedLength = cobsEncode(body, length + 4, encoded);
+  encoded[encodedLength++] = 0x00;
+  Serial.write(encoded, encodedLength);
+}
+
+void handleFrame(const uint8_t *encoded, size_t length) {
+  uint8_t body[MAX_FRAME];
+  size_t bodyLength = cobsDecode(encoded, length, body);
+  if (bodyLength < 4) return;
+  uint16_t crc = body[bodyLength - 2] | (body[bodyLength - 1] << 8);
+  if (crc16(body, bodyLength - 2) != crc) return; // Frame rusak: abaikan, setpoint berikutnya menyusul
+  uint8_t type = body[0];
+  const uint8_t *payload = body + 2;
+  size_t payloadLength = bodyLength - 4;
+  if (type == MSG_SETPOINT && payloadLength == sizeof(SetpointPayload)) {
+    SetpointPayload setpoint;
+    memcpy(&setpoint, payload, sizeof(setpoint));
+    applySetpoint(setpoint.pwm, setpoint.degree);
+  } else if (type == MSG_ESTOP) {
+    applySetpoint(1500, 90);
+  }
+}
+
+// Baris teks mentah selama mode biner (lihat komentar protokol di atas).
+// Mengembalikan true jika baris dikenali sebagai teks (bukan bagian dari frame).
+bool handleTextLine(const String &line) {
+  if (line == "P:BIN" + String(PROTOCOL_VERSION)) {
+    enterBinaryMode();
+  } else if (line == "P:TXT") {
+    binaryMode = false;
+  } else if (line.startsWith("S") && line.indexOf(';') != -1 && line.indexOf('D') != -1) {
+    // Setpoint teks yang terkirim sebelum GUI menerima konfirmasi: tetap dipakai, mode tidak berubah.
+    processTextSetpoint(line);
+  } else {
+    return false;
+  }
+  return true;
+}
+
+void processBinaryInput() {
+  // Kumpulkan byte hingga pembatas 0x00, lalu dekode satu frame. Byte yang sama juga
+  // dikumpulkan sebagai baris teks ASCII; frame COBS diawali byte kode < 0x20 dan baris
+  // harus cocok dengan perintah yang dikenal, jadi frame praktis tidak terbaca sebagai baris.
+  while (binaryMode && Serial.available() > 0) {
+    uint8_t value = Serial.read();
+    if (value == '\n') {
+      bool isText = false;
+      if (rxLineValid && rxLineLength > 0) {
+        rxLine[rxLineLength] = '\0';
+        isText = handleTextLine(String(rxLine));
+      }
+      rxLineLength = 0;
+      rxLineValid = true;
+      if (isText) {
+        rxLength = 0; // Byte baris teks bukan bagian dari frame berikutnya
+        rxOverflow = false;
+        continue;
+      }
+    } else if (value == 0x00) {
+      rxLineLength = 0;
+      rxLineValid = true;
+    } else if (value != '\r') {
+      if (value >= 0x20 && value < 0x7F && rxLineLength < sizeof(rxLine) - 1) {
+        rxLine[rxLineLength++] = value;
+      } else {
+        rxLineValid = false;
+      }
+    }
+
+    if (value == 0x00) {
+      if (!rxOverflow && rxLength > 0) handleFrame(rxFrame, rxLength);
+      rxLength = 0;
+      rxOverflow = false;
+    } else if (rxLength < MAX_FRAME) {
+      rxFrame[rxLength++] = value;
+    } else {
+      rxOverflow = true; // Frame terlalu panjang: buang sampai pembatas berikutnya
+    }
   }
 }
 
@@ -83,6 +290,20 @@ void sendTelemetry() {
   // Simulasi data Kecepatan
   float speed = 1.5 + (random(0, 20) / 10.0);
 
+  if (binaryMode) {
+    TelemetryPayload payload;
+    payload.timeMs = millis();
+    payload.flags = FLAG_GPS | FLAG_BATTERY | FLAG_COMPASS | FLAG_SPEED;
+    payload.lat = (int32_t)lround(lat * 1e7);
+    payload.lon = (int32_t)lround(lon * 1e7);
+    payload.sats = sats;
+    payload.batteryMv = (uint16_t)lroundf(battery * 1000.0f);
+    payload.headingCdeg = (uint16_t)(compass * 100);
+    payload.speedCms = (uint16_t)lroundf(speed * 100.0f);
+    sendFrame(MSG_TELEMETRY, (const uint8_t *)&payload, sizeof(payload));
+    return;
+  }
+
   // Buat string telemetri dengan format yang telah ditentukan
   String telemetryData = "T:";
   telemetryData += "GPS," + String(lat, 4) + "," + String(lon, 4) + "," + String(sats) + ";";
@@ -9,6 +9,7 @@ from .pid_view import PidView
 from .servo_setting_view import ServoSettingView
 from .system_settings_view import SystemSettingsView
 from core.pid_controller import PIDController
+from core.binary_protocol import ESTOP_COMMAND
 
 class ControlPanel(QScrollArea):
     # --- Definisi Sinyal ---
@@ -123,7 +124,8 @@ class ControlPanel(QScrollArea):
     def _send_control_data(self):
         if not self.is_auto_mode:
             data_to_send = f"S{self.current_speed_value};D{self.current_servo_degree}\n"
-            if self.serial_handler and self.serial_handler.is_connected():
+            # Dikirim juga saat sedang menyambung ulang: handler menyimpan perintah terakhir untuk diputar ulang.
+            if self.serial_handler:
                 self.serial_handler.send_data(data_to_send)
     def set_servo_from_yolo(self, degree_from_camera):
         if self.is_auto_mode:
@@ -133,13 +135,13 @@ class ControlPanel(QScrollArea):
             self.current_servo_degree = int(new_servo_degree)
             auto_speed_pwm = 1550
             data_to_send = f"S{auto_speed_pwm};D{self.current_servo_degree}\n"
-            if self.serial_handler and self.serial_handler.is_connected():
+            if self.serial_handler:
                 self.serial_handler.send_data(data_to_send)
             self.pid_data_updated.emit(self.pid_steering.setpoint, degree_from_camera)
     def emergency_stop(self):
-        data_to_send = f"S1500;D90\n"
-        if self.serial_handler and self.serial_handler.is_connected():
-            self.serial_handler.send_data(data_to_send)
+        data_to_send = f"{ESTOP_COMMAND}\n"
+        if self.serial_handler:
+            self.serial_handler.send_priority(data_to_send)
         self.message_to_show.emit("EMERGENCY STOP ACTIVATED", 5000)
     def toggle_mode(self):
         self.is_auto_mode = not self.is_auto_mode
@@ -2,8 +2,10 @@
 
 # --- Impor Pustaka PyQt5 ---
 # Tambahkan QSplitter ke daftar impor untuk layout yang fleksibel
-from PyQt5.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QLabel, QVBoxLayout, QPushButton, QSplitter
+from PyQt5.QtWidgets import (QMainWindow, QWidget, QHBoxLayout, QLabel, QVBoxLayout, QPushButton, QSplitter,
+                             QFileDialog)
 from PyQt5.QtCore import Qt, QFile, QTextStream, QTimer
+from datetime import datetime
 
 # --- Impor Widget Kustom & Logika Inti ---
 from .control_panel import ControlPanel
@@ -57,6 +59,9 @@ class DashboardWindow(QMainWindow):
         self.central_view = CentralWidget(parent=self)
         self.status_panel = StatusPanel(parent=self)
         self.control_panel.tab_connection_settings.set_serial_handler(self.serial_handler)
+        # Satu StageStats untuk seluruh aplikasi: pipeline video, penulisan serial, dan loop navigasi.
+        self.perf_stats = self.central_view.tab_video.stats
+        self.serial_handler.stats = self.perf_stats
         
         # === Gunakan QSplitter untuk Layout Fleksibel ===
         # QSplitter adalah kontainer yang memungkinkan pengguna untuk mengubah ukuran widget di dalamnya.
@@ -87,6 +92,11 @@ class DashboardWindow(QMainWindow):
         self.nav_timer.timeout.connect(self.navigation_loop)
         self.nav_timer.start(200) # Jalankan setiap 200 ms (5 Hz)
 
+        # Timer untuk menyegarkan bagian Performance di StatusPanel.
+        self.perf_timer = QTimer(self)
+        self.perf_timer.timeout.connect(self.refresh_performance)
+        self.perf_timer.start(1000)
+
     def connect_signals(self):
         """Fungsi terpusat untuk mengatur semua koneksi sinyal-slot."""
         # Sinyal dari tombol misi di ControlPanel dihubungkan ke slot di sini
@@ -101,6 +111,9 @@ class DashboardWindow(QMainWindow):
         self.control_panel.message_to_show.connect(self.show_temporary_message)
         # Sinyal dari StatusPanel (pesan) dihubungkan ke slot di sini
         self.status_panel.message_to_show.connect(self.show_temporary_message)
+        # Sinyal panel performa (nyala/mati timer, ekspor CSV)
+        self.status_panel.perf_enabled_changed.connect(self.perf_stats.set_enabled)
+        self.status_panel.perf_export_requested.connect(self.export_performance_csv)
         
         print("Semua sinyal utama telah berhasil terhubung.")
 
@@ -141,25 +154,25 @@ class DashboardWindow(QMainWindow):
     # --- Fungsi Logika dan Slot Penerima Sinyal ---
 
     def handle_received_data(self, data):
-        """Slot untuk menangani semua data yang diterima dari ESP32."""
+        """Slot untuk baris selain telemetri dari ESP32 (pesan status, log)."""
         print(f"[ESP32 -> GUI]: {data}")
-        # Jika data adalah telemetri, urai dan perbarui variabel
-        if data.startswith("T:"):
-            telemetry_string = data[2:]
-            parts = telemetry_string.split(';')
-            for part in parts:
-                values = part.split(',')
-                key = values[0]
-                try:
-                    if key == "GPS" and len(values) == 4:
-                        self.current_lat = float(values[1])
-                        self.current_lon = float(values[2])
-                        self.status_panel.update_gps(values[1], values[2], values[3])
-                    elif key == "COMP" and len(values) == 2:
-                        self.current_heading = float(values[1])
-                        self.status_panel.update_compass(values[1])
-                except Exception as e:
-                    print(f"Error parsing telemetry part '{part}': {e}")
+
+    def handle_telemetry(self, record):
+        """
+        Slot untuk snapshot telemetri (TelemetryRecord) yang sudah diurai di thread
+        pembaca. Dipanggil dengan laju terbatas, jadi biayanya tetap per penyegaran.
+        """
+        if record.gps_time is not None:
+            self.current_lat, self.current_lon = record.lat, record.lon
+            self.status_panel.update_gps(record.lat, record.lon, record.sats)
+            self.header_status_gps.setText(f"GPS: {record.sats} Sats")
+        if record.heading_time is not None:
+            self.current_heading = record.heading
+            self.status_panel.update_compass(f"{record.heading:g}")
+        if record.battery_time is not None:
+            self.status_panel.update_battery(record.battery)
+        if record.speed_time is not None:
+            self.status_panel.update_speed(record.speed)
 
     def update_header_connection_status(self, is_connected, message):
         """Slot yang menerima sinyal untuk mengupdate status koneksi di header."""
@@ -169,11 +182,14 @@ class DashboardWindow(QMainWindow):
         
         # Hubungkan sinyal dari thread pembaca SETELAH koneksi berhasil dibuat.
         if is_connected and self.serial_handler.reader_thread:
-            try:
-                self.serial_handler.reader_thread.data_received.disconnect(self.handle_received_data)
-            except TypeError:
-                pass # Abaikan jika belum terhubung
-            self.serial_handler.reader_thread.data_received.connect(self.handle_received_data)
+            reader = self.serial_handler.reader_thread
+            for signal, slot in ((reader.data_received, self.handle_received_data),
+                                 (reader.telemetry_received, self.handle_telemetry)):
+                try:
+                    signal.disconnect(slot)
+                except TypeError:
+                    pass # Abaikan jika belum terhubung
+                signal.connect(slot)
         
         print(f"Header status diupdate: {message}")
 
@@ -186,6 +202,23 @@ class DashboardWindow(QMainWindow):
         self.show_temporary_message(f"Mode switched to {mode_text.replace(' Mode', '')}", 3000)
         print(f"Header status diupdate: {mode_text}")
 
+    def refresh_performance(self):
+        """Slot timer: memperbarui ringkasan performa di StatusPanel."""
+        self.status_panel.update_performance(self.central_view.tab_video.perf_lines())
+
+    def export_performance_csv(self):
+        """Slot untuk tombol 'Export CSV': menyimpan ringkasan StageStats ke file CSV."""
+        default_name = f"perf_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        path, _ = QFileDialog.getSaveFileName(self, "Export Performance CSV", default_name, "CSV Files (*.csv)")
+        if not path:
+            return
+        self.central_view.tab_video.update_perf_counters()
+        try:
+            self.perf_stats.to_csv(path)
+            self.show_temporary_message(f"Performance stats exported to {path}", 4000)
+        except OSError as e:
+            self.show_temporary_message(f"Error exporting performance stats: {e}", 5000)
+
     def show_temporary_message(self, message, duration=3000):
         """Slot yang menerima sinyal untuk menampilkan pesan di status bar."""
         self.statusBar().showMessage(message, duration)
@@ -212,6 +245,7 @@ class DashboardWindow(QMainWindow):
     def closeEvent(self, event):
         """Dipanggil saat pengguna menutup jendela. Memastikan koneksi serial ditutup."""
         print("Closing application, disconnecting serial port...")
+        self.central_view.tab_video.shutdown() # Hentikan thread kamera, inferensi & pemuat model
         self.serial_handler.disconnect()
         event.accept()
 
@@ -248,6 +282,12 @@ class DashboardWindow(QMainWindow):
         """Loop utama yang berjalan setiap 200ms untuk navigasi otonom."""
         if self.navigation_mode != "AUTO_MISSION":
             return
+        # Durasi setiap iterasi misi dicatat sebagai tahap 'navigation'.
+        with self.perf_stats.measure('navigation'):
+            self._navigation_step()
+
+    def _navigation_step(self):
+        """Satu iterasi navigasi misi: cek waypoint, hitung PID heading, kirim perintah servo."""
 
         if self.current_waypoint_index >= len(self.waypoints):
             self.show_temporary_message("Mission Complete!", 5000)
@@ -276,7 +316,6 @@ class DashboardWindow(QMainWindow):
         new_servo_degree = max(0, min(180, new_servo_degree))
         
         data_to_send = f"S1550;D{int(new_servo_degree)}\n"
-        if self.serial_handler and self.serial_handler.is_connected():
-            self.serial_handler.send_data(data_to_send)
+        if self.serial_handler and self.serial_handler.send_data(data_to_send):
             print(f"[MISSION] To WP-{self.current_waypoint_index+1} | Target: {target_bearing:.1f}°, Current: {self.current_heading:.1f}° | Servo: {int(new_servo_degree)}°")
 
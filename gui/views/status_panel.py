@@ -2,13 +2,16 @@
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QGroupBox, QLabel,
                              QListWidget, QListWidgetItem, QHBoxLayout, QPushButton,
-                             QLineEdit, QFormLayout)
+                             QLineEdit, QFormLayout, QCheckBox)
 from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QDoubleValidator
+from PyQt5.QtGui import QDoubleValidator, QFont
 import re # Impor pustaka Regular Expression untuk parsing teks
 
 class StatusPanel(QWidget):
     message_to_show = pyqtSignal(str, int)
+    # Sinyal panel performa: timer dinyalakan/dimatikan, dan permintaan ekspor CSV
+    perf_enabled_changed = pyqtSignal(bool)
+    perf_export_requested = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -77,6 +80,27 @@ class StatusPanel(QWidget):
         
         status_group.setLayout(status_layout)
         self.main_layout.addWidget(status_group)
+
+        # --- Grup Performa (latensi per tahap, FPS, frame yang dibuang) ---
+        perf_group = QGroupBox("Performance")
+        perf_layout = QVBoxLayout(perf_group)
+        perf_buttons_layout = QHBoxLayout()
+        self.perf_enabled_checkbox = QCheckBox("Timers enabled")
+        self.perf_enabled_checkbox.setChecked(True)
+        self.perf_enabled_checkbox.toggled.connect(self.perf_enabled_changed.emit)
+        self.perf_export_button = QPushButton("Export CSV")
+        self.perf_export_button.clicked.connect(self.perf_export_requested.emit)
+        perf_buttons_layout.addWidget(self.perf_enabled_checkbox)
+        perf_buttons_layout.addWidget(self.perf_export_button)
+        perf_layout.addLayout(perf_buttons_layout)
+        self.perf_label = QLabel("No samples yet.")
+        perf_font = QFont("Monospace", 8)
+        perf_font.setStyleHint(QFont.TypeWriter)
+        self.perf_label.setFont(perf_font)
+        self.perf_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        perf_layout.addWidget(self.perf_label)
+        perf_group.setLayout(perf_layout)
+        self.main_layout.addWidget(perf_group)
         self.main_layout.addStretch()
         self._update_delete_button_state()
 
@@ -112,6 +136,10 @@ class StatusPanel(QWidget):
     def update_auto_steering_degree(self, degree):
         self.auto_steering_label.setText(f"{degree}°")
 
+    def update_performance(self, lines):
+        """Menampilkan baris ringkas statistik performa (dari StageStats.compact_lines)."""
+        self.perf_label.setText("\n".join(lines) if lines else "No samples yet.")
+
     def add_waypoint(self):
         lat = self.lat_input.text().strip().replace(',', '.')
         lon = self.lon_input.text().strip().replace(',', '.')
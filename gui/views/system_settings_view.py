@@ -30,6 +30,9 @@ class SystemSettingsView(QWidget):
 
         # === PERUBAHAN: Gunakan QComboBox (Dropdown) untuk COM Port ===
         self.com_port_combo = QComboBox()
+        # Bisa diketik agar port yang tidak terdaftar (mis. pty dari tools/esp32_emulator.py) tetap bisa dipakai.
+        self.com_port_combo.setEditable(True)
+        self.com_port_combo.lineEdit().setPlaceholderText("No ports found - type a device path")
         self.refresh_ports_button = QPushButton("Refresh")
         self.refresh_ports_button.clicked.connect(self.populate_ports)
         
@@ -38,12 +41,20 @@ class SystemSettingsView(QWidget):
         port_layout.addWidget(self.com_port_combo)
         port_layout.addWidget(self.refresh_ports_button)
 
+        # Protokol serial: teks (kompatibel dengan firmware lama) atau biner (COBS + CRC16).
+        # Protokol biner dinegosiasikan; firmware yang tidak mendukungnya tetap memakai teks.
+        self.protocol_combo = QComboBox()
+        self.protocol_combo.addItem("Text", 'text')
+        self.protocol_combo.addItem("Binary (COBS + CRC16)", 'binary')
+        self.protocol_combo.setToolTip("Binary is negotiated with the firmware; falls back to text if unsupported.")
+
         # Label untuk menampilkan status koneksi di dalam tab ini.
         self.connection_status_label = QLabel("Status: Disconnected")
         self.connection_status_label.setStyleSheet("font-weight: bold; color: #EF4444;") # Merah
 
         # Menambahkan baris COM port (yang sekarang berisi layout horizontal) ke form.
         form_layout.addRow("COM Port:", port_layout)
+        form_layout.addRow("Protocol:", self.protocol_combo)
         form_layout.addRow(self.connection_status_label)
 
         # Tombol untuk memulai/menghentikan koneksi.
@@ -65,6 +76,8 @@ class SystemSettingsView(QWidget):
         Ini adalah 'jembatan' yang menghubungkan UI ini dengan logika serial.
         """
         self.serial_handler = handler
+        # Status koneksi (menyambung, tersambung, hilang, mencoba ulang) datang lewat sinyal.
+        handler.state_changed.connect(self.on_connection_state)
         # Langsung isi daftar port saat handler pertama kali diterima.
         self.populate_ports()
 
@@ -77,55 +90,40 @@ class SystemSettingsView(QWidget):
             return
         self.com_port_combo.clear() # Kosongkan daftar lama
         ports = self.serial_handler.list_available_ports()
-        if ports:
-            self.com_port_combo.addItems(ports)
-            self.connect_button.setEnabled(True) # Aktifkan tombol connect jika ada port
-        else:
-            self.com_port_combo.addItem("Tidak ada port ditemukan")
-            self.connect_button.setEnabled(False) # Nonaktifkan jika tidak ada port
+        # Jika kosong, placeholder meminta pengguna mengetik path device secara manual.
+        self.com_port_combo.addItems(ports)
 
     def toggle_connection(self):
         """
         Menghubungkan atau memutus koneksi menggunakan SerialHandler.
-        Fungsi ini dipanggil saat tombol 'Connect'/'Disconnect' diklik.
+        Fungsi ini dipanggil saat tombol 'Connect'/'Disconnect'/'Cancel' diklik.
+        Koneksi dibuka di latar belakang; UI diperbarui oleh on_connection_state.
         """
         if not self.serial_handler:
             print("Error: Serial Handler belum diatur!")
             return
 
-        if not self.serial_handler.is_connected():
+        if self.serial_handler.state == 'disconnected':
             # --- Logika untuk Menyambung ---
-            selected_port = self.com_port_combo.currentText()
-            if "Tidak ada port" in selected_port:
+            selected_port = self.com_port_combo.currentText().strip()
+            if not selected_port:
                 return
-            
-            # Coba hubungkan menggunakan handler
-            success = self.serial_handler.connect(selected_port)
-            
-            if success:
-                message = "Connected"
-                # Update UI di tab ini
-                self.connection_status_label.setText(f"Status: {message}")
-                self.connection_status_label.setStyleSheet("font-weight: bold; color: #10B981;") # Hijau
-                self.connect_button.setText("Disconnect")
-                self.com_port_combo.setEnabled(False) # Nonaktifkan dropdown saat terhubung
-                self.refresh_ports_button.setEnabled(False)
-                # Pancarkan sinyal sukses ke seluruh aplikasi
-                self.connection_status_changed.emit(True, message)
-            else:
-                message = "Failed to connect"
-                self.connection_status_label.setText(f"Status: {message}")
-                # Pancarkan sinyal gagal
-                self.connection_status_changed.emit(False, message)
+            self.serial_handler.connect(selected_port, protocol=self.protocol_combo.currentData())
         else:
-            # --- Logika untuk Memutus Koneksi ---
+            # --- Memutus koneksi, atau membatalkan percobaan sambung (ulang) ---
             self.serial_handler.disconnect()
-            message = "Disconnected"
-            # Update UI di tab ini
-            self.connection_status_label.setText(f"Status: {message}")
-            self.connection_status_label.setStyleSheet("font-weight: bold; color: #EF4444;") # Merah
-            self.connect_button.setText("Connect")
-            self.com_port_combo.setEnabled(True) # Aktifkan kembali dropdown
-            self.refresh_ports_button.setEnabled(True)
-            # Pancarkan sinyal bahwa koneksi telah terputus
-            self.connection_status_changed.emit(False, message)
+
+    def on_connection_state(self, state, message):
+        """Slot untuk SerialHandler.state_changed: memperbarui tab ini dan meneruskan status ke header."""
+        colors = {'connected': "#10B981", 'disconnected': "#EF4444"} # Hijau / merah; lainnya kuning
+        self.connection_status_label.setText(f"Status: {message}")
+        self.connection_status_label.setStyleSheet(f"font-weight: bold; color: {colors.get(state, '#F59E0B')};")
+        buttons = {'connected': "Disconnect", 'disconnected': "Connect"}
+        self.connect_button.setText(buttons.get(state, "Cancel"))
+        idle = state == 'disconnected'
+        # Dropdown hanya bisa diubah saat tidak ada koneksi atau percobaan koneksi.
+        self.com_port_combo.setEnabled(idle)
+        self.refresh_ports_button.setEnabled(idle)
+        self.protocol_combo.setEnabled(idle)
+        # Pancarkan status ke seluruh aplikasi (header, penyambungan sinyal pembaca).
+        self.connection_status_changed.emit(state == 'connected', message)
@@ -0,0 +1,82 @@
+# gui/views/video_display.py
+
+import time
+
+from PyQt5.QtWidgets import QLabel
+from PyQt5.QtCore import QRect
+from PyQt5.QtGui import QImage, QPainter, QColor, QFont, QFontMetrics
+
+
+class VideoDisplay(QLabel):
+    """
+    Widget tampilan video yang melukis QImage langsung di paintEvent.
+    Frame sudah diperkecil ke ukuran widget oleh OpenCV di thread inferensi,
+    sehingga thread GUI tidak perlu konversi QPixmap maupun SmoothTransformation.
+    Saat tidak ada frame, widget berperilaku seperti QLabel biasa (menampilkan teks).
+    """
+    def __init__(self, text="", parent=None):
+        super().__init__(text, parent)
+        self._image = None
+        self._buffer = None # Referensi ke array NumPy agar memori QImage tetap hidup
+        self.stats = None # StageStats opsional untuk mencatat durasi melukis
+        self.overlay_lines = [] # Teks overlay performa (kosong = tidak digambar)
+        self._overlay_font = QFont("Monospace", 9)
+        self._overlay_font.setStyleHint(QFont.TypeWriter)
+
+    def set_frame(self, frame):
+        """Menampilkan frame BGR uint8 (HWC, kontigu) yang sudah seukuran widget."""
+        h, w = frame.shape[:2]
+        self._buffer = frame
+        self._image = QImage(frame.data, w, h, frame.strides[0], QImage.Format_BGR888)
+        self.update()
+
+    def clear(self):
+        """Menghapus frame (dan teks) yang sedang ditampilkan."""
+        self._image = None
+        self._buffer = None
+        super().clear()
+
+    def setText(self, text):
+        # Teks status menggantikan frame terakhir.
+        self._image = None
+        self._buffer = None
+        super().setText(text)
+
+    def set_overlay_lines(self, lines):
+        """Mengganti teks overlay performa yang digambar di pojok kiri atas frame."""
+        self.overlay_lines = list(lines)
+        self.update()
+
+    def _paint_overlay(self, painter, origin):
+        """Menggambar kotak semi-transparan berisi overlay_lines mulai dari origin (QPoint)."""
+        metrics = QFontMetrics(self._overlay_font)
+        line_h = metrics.height()
+        width = max(metrics.horizontalAdvance(line) for line in self.overlay_lines) + 12
+        height = line_h * len(self.overlay_lines) + 8
+        painter.fillRect(QRect(origin.x(), origin.y(), width, height), QColor(0, 0, 0, 160))
+        painter.setFont(self._overlay_font)
+        painter.setPen(QColor(120, 255, 120))
+        for i, line in enumerate(self.overlay_lines):
+            painter.drawText(origin.x() + 6, origin.y() + 4 + metrics.ascent() + i * line_h, line)
+
+    def paintEvent(self, event):
+        if self._image is None:
+            super().paintEvent(event)
+            return
+        start = time.perf_counter()
+        painter = QPainter(self)
+        # Pusatkan gambar; ukurannya biasanya sudah sama dengan widget sehingga tidak ada skala.
+        img_w, img_h = self._image.width(), self._image.height()
+        scale = min(self.width() / img_w, self.height() / img_h)
+        if abs(scale - 1.0) < 0.01:
+            target_w, target_h = img_w, img_h
+        else:
+            # Hanya terjadi sesaat setelah resize, sebelum frame berikutnya tiba.
+            target_w, target_h = int(img_w * scale), int(img_h * scale)
+        target = QRect((self.width() - target_w) // 2, (self.height() - target_h) // 2, target_w, target_h)
+        painter.drawImage(target, self._image)
+        if self.overlay_lines:
+            self._paint_overlay(painter, target.topLeft())
+        painter.end()
+        if self.stats is not None:
+            self.stats.add('paint', time.perf_counter() - start)
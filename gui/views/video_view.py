@@ -1,114 +1,529 @@
 # gui/views/video_view.py
 
-import sys
-import os
+import threading
+import time
+
 import cv2
-import torch
 import numpy as np
-from pathlib import Path
-
-if os.name == 'nt':
-    import pathlib
-    pathlib.PosixPath = pathlib.WindowsPath
-
-# PENTING: Penambahan Path YOLOv5 yang Sangat Robust
-CURRENT_FILE_DIR = Path(os.path.abspath(__file__)).resolve()
-PROJECT_ROOT = CURRENT_FILE_DIR.parents[2]
-
-YOLOV5_ROOT_PATH = PROJECT_ROOT / 'yolov5'
-if str(YOLOV5_ROOT_PATH) not in sys.path:
-    sys.path.insert(0, str(YOLOV5_ROOT_PATH))
-
-# PENTING: Definisi TryExcept di sini (jika diperlukan oleh YOLOv5 Anda)
-def TryExcept(*args, **kwargs):
-    def try_except(func):
-        def wrap_function(*args, **kwargs):
-            try:
-                return func(*args, **kwargs)
-            except Exception as e:
-                return None
-        return wrap_function
-    return try_except if len(args) == 0 else try_except(args[0])
-
-# Impor dari YOLOv5
-from models.common import DetectMultiBackend
-from utils.general import non_max_suppression, scale_boxes # <<< NON_MAX_SUPPRESSION & SCALE_BOXES dari general
-# <<< PENTING: select_device & smart_inference_mode dari torch_utils >>>
-from utils.torch_utils import select_device, smart_inference_mode
-from ultralytics.utils.plotting import Annotator, colors
-
-from PyQt5.QtWidgets import QWidget, QLabel, QVBoxLayout, QPushButton, QHBoxLayout, QComboBox, QSizePolicy
-from PyQt5.QtCore import QTimer, Qt, pyqtSignal
-from PyQt5.QtGui import QImage, QPixmap
+
+from PyQt5.QtWidgets import (QWidget, QLabel, QVBoxLayout, QPushButton, QHBoxLayout, QComboBox, QSizePolicy,
+                             QCheckBox, QSpinBox, QDoubleSpinBox, QFileDialog, QToolButton, QMenu)
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+
+# Catatan: core.detector (torch + YOLOv5) sengaja TIDAK diimpor di sini agar dashboard
+# langsung tampil; modul itu diimpor oleh ModelLoader di thread latar.
+from core.frame_pipeline import LatestFrameQueue, CaptureThread, InferenceWorker, BatchInferenceWorker, ModelLoader
+from core.gate_detection import find_gate
+from core.hud import HudOverlay
+from core.tracker import DetectThenTrack
+from core.motion_gate import MotionGate
+from core.color_detector import HsvBallDetector
+from core.roi import RoiSelector
+from core.governor import LatencyGovernor, build_levels, GOVERNOR_IMG_SIZES
+from core.backends import BACKEND_LABELS, is_cached
+from core.camera_enum import CameraEnumerator, CameraScanThread
+from core.perf import StageStats
+from core.frame_sources import open_source
+from core.capture_profile import CAPTURE_PROFILES
+from core.recorder import FrameRecorder, DEFAULT_RECORDINGS_DIR, new_session_dir
+from .video_display import VideoDisplay
 
 class VideoView(QWidget):
     degree_changed = pyqtSignal(int)
+    # Hasil deteksi lengkap: (detections, degree atau None, timestamp frame)
+    gate_result_ready = pyqtSignal(object, object, float)
+    # Dipancarkan saat model selesai dimuat: (nama backend, durasi pemuatan dalam detik)
+    model_loaded = pyqtSignal(str, float)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.is_camera_active = False
         self.yolo_loaded = False
+        self.engine = None # Mesin deteksi aktif (YoloDetector, DetectThenTrack, atau MotionGate di atasnya)
+        self.track_engine = None # DetectThenTrack aktif, atau None
+        self.motion_gate = None # MotionGate aktif, atau None
+        self.detector = None # Detektor dasar yang aktif (YOLO atau HSV), None jika belum siap
+        self.yolo_detector = None # YoloDetector setelah dimuat ModelLoader
+        self.loaded_backend = None # Data dropdown Backend (backend, int8) milik yolo_detector
+        self.loading_backend = None # Data dropdown Backend yang sedang dimuat ModelLoader
+        self.hsv_detector = HsvBallDetector() # Detektor warna klasik, selalu tersedia (tanpa model)
+        self.names = []
+        self.model_loader = None
+        self.camera_enumerator = CameraEnumerator()
+        self.camera_scan_thread = None
         self.current_degree = 0
         self.cap = None
-        self.timer = None
+        self.capture_thread = None
+        self.inference_worker = None
+        self.capture_queue = None
+        self.display_queue = None
+        # Kamera tambahan (multi-kamera): daftar (cap, CaptureThread, LatestFrameQueue), indeks 1..N.
+        self.extra_captures = []
+        self.camera_names = [] # Label semua kamera aktif; indeks 0 = kamera utama
+        self.camera_degrees = {} # Derajat gate terakhir per kamera
+        self.steering_camera = 0 # Kamera yang hasil gate-nya dipakai untuk kemudi (dan ditampilkan)
+        self.recorder = None # FrameRecorder aktif, atau None jika tidak merekam
+        self.file_sources = [] # Path file video / folder gambar yang sudah dibuka (untuk dropdown)
+        self.replay_started = None # perf_counter saat replay file dimulai
+        self.replay_expected = None # Jumlah frame yang harus selesai diproses sebelum replay berakhir
+        # Statistik per tahap (preprocess, inference, annotate, hud, display_prep, paint) untuk sesi GUI.
+        self.stats = StageStats(window=1000)
+        # Dibaca oleh InferenceWorker: frame diperkecil ke ukuran ini, dan anotasi
+        # dilewati seluruhnya jika tab video sedang tidak terlihat.
+        self.display_size = (400, 300)
+        self.display_enabled = False
+        # HUD statis (bar kemudi) di-cache per resolusi; hanya bagian dinamis digambar per frame.
+        self.hud = HudOverlay()
         
-        self.label = QLabel("Camera is stopped. Select a source and click 'Start Camera'.")
+        self.label = VideoDisplay("Camera is stopped. Select a source and click 'Start Camera'.")
         self.label.setAlignment(Qt.AlignCenter)
         self.label.setMinimumSize(400, 300)
+        self.label.stats = self.stats
 
         self.camera_selector = QComboBox()
         self.refresh_button = QPushButton("Refresh List")
-        self.refresh_button.clicked.connect(self.list_cameras)
+        self.refresh_button.clicked.connect(lambda: self.list_cameras(force=True))
+        
+        # --- Sumber rekaman: file video atau folder gambar, diputar ulang lewat pipeline yang sama ---
+        self.open_file_button = QPushButton("Open Video...")
+        self.open_file_button.clicked.connect(self.open_video_file)
+        self.open_folder_button = QPushButton("Open Folder...")
+        self.open_folder_button.clicked.connect(self.open_image_folder)
+        self.replay_combo = QComboBox()
+        self.replay_combo.addItem("Real-time", 'realtime')
+        self.replay_combo.addItem("As fast as possible", 'fast')
+        self.replay_combo.setToolTip("Replay clock for video files and image folders.")
+        # --- Profil kamera: format, resolusi, FPS, dan buffer driver (hanya untuk kamera) ---
+        self.profile_combo = QComboBox()
+        for key, profile in CAPTURE_PROFILES.items():
+            self.profile_combo.addItem(profile.name, key)
+        self.profile_combo.setCurrentIndex(self.profile_combo.findData('low_latency'))
+        self.profile_combo.setToolTip("Camera capture profile (FOURCC, resolution, FPS, driver buffer). "
+                                      "Applied when the camera starts.")
         
         self.start_stop_button = QPushButton("Start Camera")
         self.start_stop_button.clicked.connect(self.toggle_camera)
 
+        # --- Multi-kamera: kamera tambahan diinferensi dalam satu batch bersama kamera utama ---
+        self.extra_camera_menu = QMenu(self)
+        self.extra_cameras_button = QToolButton()
+        self.extra_cameras_button.setText("+ Cameras")
+        self.extra_cameras_button.setToolTip("Extra sources that run alongside the selected camera, batched into one inference call.")
+        self.extra_cameras_button.setMenu(self.extra_camera_menu)
+        self.extra_cameras_button.setPopupMode(QToolButton.InstantPopup)
+        self.steer_combo = QComboBox()
+        self.steer_combo.setToolTip("Camera whose gate result steers the boat and is shown.")
+        self.steer_combo.setEnabled(False)
+        self.steer_combo.currentIndexChanged.connect(self.set_steering_camera)
+        self.camera_status_label = QLabel("")
+
+        # --- Perekaman misi: frame mentah dan/atau teranotasi + metadata deteksi ---
+        self.record_combo = QComboBox()
+        self.record_combo.addItem("Raw + Annotated", ('raw', 'annotated'))
+        self.record_combo.addItem("Annotated", ('annotated',))
+        self.record_combo.addItem("Raw", ('raw',))
+        self.record_button = QPushButton("Record")
+        self.record_button.setCheckable(True)
+        self.record_button.setEnabled(False)
+        self.record_button.toggled.connect(self.toggle_recording)
+
+        # --- Mode deteksi: YOLO setiap frame, atau deteksi setiap N frame + pelacakan ---
+        self.track_checkbox = QCheckBox("Detect + Track")
+        self.track_checkbox.setToolTip("Run YOLO every N frames and track the balls with optical flow in between.")
+        self.track_interval_spin = QSpinBox()
+        self.track_interval_spin.setRange(1, 60)
+        self.track_interval_spin.setValue(5)
+        self.track_interval_spin.setPrefix("every ")
+        self.track_interval_spin.setSuffix(" frames")
+        self.track_checkbox.toggled.connect(self.configure_detection_engine)
+        self.track_interval_spin.valueChanged.connect(self.configure_detection_engine)
+        # --- Motion gate: pakai ulang hasil deteksi jika pemandangan tidak berubah ---
+        self.motion_checkbox = QCheckBox("Motion Gate")
+        self.motion_checkbox.setToolTip("Reuse the previous detections while a grayscale thumbnail of the frame "
+                                        "differs from the last detected frame by less than the threshold.")
+        self.motion_threshold_spin = QDoubleSpinBox()
+        self.motion_threshold_spin.setRange(0.1, 50.0)
+        self.motion_threshold_spin.setSingleStep(0.5)
+        self.motion_threshold_spin.setValue(2.0)
+        self.motion_threshold_spin.setPrefix("diff < ")
+        self.motion_threshold_spin.setToolTip("Mean absolute difference of the thumbnail, in gray levels (0-255).")
+        self.motion_max_skip_spin = QSpinBox()
+        self.motion_max_skip_spin.setRange(1, 300)
+        self.motion_max_skip_spin.setValue(10)
+        self.motion_max_skip_spin.setPrefix("max skip ")
+        self.motion_checkbox.toggled.connect(self.configure_detection_engine)
+        self.motion_threshold_spin.valueChanged.connect(self.configure_detection_engine)
+        self.motion_max_skip_spin.valueChanged.connect(self.configure_detection_engine)
+        self.tracking_label = QLabel("")
+
+        # --- Detektor dasar: YOLOv5, atau threshold warna HSV (tanpa model, cepat di CPU) ---
+        self.engine_combo = QComboBox()
+        self.engine_combo.addItem("YOLOv5", 'yolo')
+        self.engine_combo.addItem("HSV Colour", 'hsv')
+        self.engine_combo.setToolTip("Detector used for the gate balls. HSV needs no model and runs at full camera rate.")
+        self.engine_combo.currentIndexChanged.connect(self.configure_detection_engine)
+        self.model_status_label = QLabel("Model: not loaded")
+
+        # --- Overlay performa: FPS, frame yang dibuang, dan p50/p95/p99 per tahap ---
+        self.perf_overlay_checkbox = QCheckBox("Perf Overlay")
+        self.perf_overlay_checkbox.setToolTip("Show per-stage latency percentiles, FPS and dropped frames on the video.")
+        self.perf_overlay_checkbox.toggled.connect(self.refresh_perf_overlay)
+        # Penghitung frame dibuang diperbarui berkala; overlay hanya digambar jika dicentang.
+        self.perf_timer = QTimer(self)
+        self.perf_timer.timeout.connect(self.refresh_perf_overlay)
+        self.perf_timer.start(500)
+
+        # --- Governor: menurunkan ukuran input, memaksa ROI, lalu membatasi FPS deteksi
+        # agar latensi kamera-ke-hasil tetap di bawah anggaran ---
+        self.governor = None # LatencyGovernor aktif, atau None jika dimatikan
+        self.base_img_size = None # Ukuran input awal detektor aktif (tingkat governor 0)
+        self.band_roi_selector = RoiSelector('band') # ROI paksa governor (tanpa state, dipakai semua kamera)
+        self.last_results = {} # Kamera -> (det, gate, roi) terakhir, untuk frame yang dilewati governor
+        self.governor_checkbox = QCheckBox("Governor")
+        self.governor_checkbox.setToolTip("Lower the input size, force the water-band ROI and cap the detection "
+                                          "rate to keep camera-to-result latency under the budget.")
+        self.governor_checkbox.toggled.connect(self.configure_governor)
+        self.governor_budget_spin = QSpinBox()
+        self.governor_budget_spin.setRange(30, 2000)
+        self.governor_budget_spin.setSingleStep(10)
+        self.governor_budget_spin.setValue(150)
+        self.governor_budget_spin.setPrefix("budget ")
+        self.governor_budget_spin.setSuffix(" ms")
+        self.governor_budget_spin.valueChanged.connect(self.on_governor_budget_changed)
+        self.governor_label = QLabel("")
+
+        # --- Region-of-interest: inferensi hanya pada pita air di bawah cakrawala ---
+        self.roi_selector = RoiSelector('full')
+        self.roi_selectors = [self.roi_selector] # Satu per kamera (perkiraan cakrawala per kamera)
+        self.roi_combo = QComboBox()
+        self.roi_combo.addItem("Full Frame", 'full')
+        self.roi_combo.addItem("Water Band", 'band')
+        self.roi_combo.addItem("Auto Horizon", 'horizon')
+        self.roi_combo.currentIndexChanged.connect(self.configure_roi)
+
+        # --- Backend inferensi (artefak hasil ekspor di-cache di samping best.pt) ---
+        self.backend_combo = QComboBox()
+        for backend, label in BACKEND_LABELS.items():
+            self.backend_combo.addItem(label, (backend, False))
+        # Varian INT8 butuh set kalibrasi saat ekspor, jadi baru ditampilkan setelah artefaknya
+        # diekspor dari CLI (lihat refresh_int8_backends).
+        self.backend_combo.setToolTip("INT8 variants appear after exporting them with "
+                                      "'python -m tools.compare_backends --int8 --calibration <recording>'.")
+        self.backend_combo.activated.connect(self.load_model)
+
         control_layout = QHBoxLayout()
         control_layout.addWidget(QLabel("Camera Source:"))
         control_layout.addWidget(self.camera_selector, 1)
         control_layout.addWidget(self.refresh_button)
+        control_layout.addWidget(self.open_file_button)
+        control_layout.addWidget(self.open_folder_button)
+        control_layout.addWidget(self.replay_combo)
+        control_layout.addWidget(self.profile_combo)
+        control_layout.addWidget(self.extra_cameras_button)
         control_layout.addWidget(self.start_stop_button)
+        control_layout.addWidget(self.record_combo)
+        control_layout.addWidget(self.record_button)
+
+        detection_layout = QHBoxLayout()
+        detection_layout.addWidget(self.track_checkbox)
+        detection_layout.addWidget(self.track_interval_spin)
+        detection_layout.addWidget(self.tracking_label, 1)
+        detection_layout.addWidget(QLabel("Steer:"))
+        detection_layout.addWidget(self.steer_combo)
+        detection_layout.addWidget(self.camera_status_label)
+        detection_layout.addWidget(QLabel("Detector:"))
+        detection_layout.addWidget(self.engine_combo)
+        detection_layout.addWidget(QLabel("ROI:"))
+        detection_layout.addWidget(self.roi_combo)
+        detection_layout.addWidget(QLabel("Backend:"))
+        detection_layout.addWidget(self.backend_combo)
+        detection_layout.addWidget(self.model_status_label)
+        detection_layout.addWidget(self.perf_overlay_checkbox)
+
+        governor_layout = QHBoxLayout()
+        governor_layout.addWidget(self.motion_checkbox)
+        governor_layout.addWidget(self.motion_threshold_spin)
+        governor_layout.addWidget(self.motion_max_skip_spin)
+        governor_layout.addWidget(self.governor_checkbox)
+        governor_layout.addWidget(self.governor_budget_spin)
+        governor_layout.addWidget(self.governor_label, 1)
         
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(5, 5, 5, 5)
         main_layout.addLayout(control_layout)
+        main_layout.addLayout(detection_layout)
+        main_layout.addLayout(governor_layout)
         main_layout.addWidget(self.label, 1)
         
-        try:
-            self.device = select_device('')
-            model_path = str(YOLOV5_ROOT_PATH / "best.pt")
-            self.model = DetectMultiBackend(model_path, device=self.device, dnn=False)
-            self.model.warmup(imgsz=(1, 3, 640, 640))
-            self.names = self.model.names
-            self.yolo_loaded = True
-            print(f"Model YOLOv5 berhasil dimuat dari: {model_path}")
-        except Exception as e:
-            self.yolo_loaded = False
-            self.label.setText(f"Model 'best.pt' not found or failed to load:\n{e}\nClick 'Start Camera' for video only.")
+        self.list_cameras(force=False)
+        # Model dimuat setelah jendela tampil (saat event loop mulai berjalan),
+        # sementara itu kamera sudah bisa dipakai tanpa deteksi.
+        QTimer.singleShot(0, self.load_model)
+
+    def load_model(self):
+        """Memuat model YOLOv5 dengan backend yang dipilih di dropdown Backend, di thread latar."""
+        if self.model_loader and self.model_loader.isRunning():
+            return
+        backend, int8 = self.loading_backend = self.backend_combo.currentData()
+
+        def create_detector():
+            from core.detector import YoloDetector, DEFAULT_WEIGHTS
+            return YoloDetector(DEFAULT_WEIGHTS, backend=backend, int8=int8)
+
+        # Detektor lama tetap berjalan selama model baru dimuat; baru diganti di on_model_loaded.
+        self.backend_combo.setEnabled(False)
+        self.model_status_label.setText("Model: loading...")
+        self.model_status_label.setStyleSheet("color: orange; font-weight: bold;")
+        self.model_loader = ModelLoader(create_detector)
+        self.model_loader.loaded.connect(self.on_model_loaded)
+        self.model_loader.failed.connect(self.on_model_failed)
+        self.model_loader.start()
+
+    def on_model_loaded(self, detector, seconds):
+        """Slot (thread GUI) saat ModelLoader selesai memuat dan warmup model."""
+        self.yolo_detector = detector
+        self.yolo_loaded = True
+        self.loaded_backend = self.loading_backend
+        # Mesin deteksi disiapkan di sini; InferenceWorker memakainya begitu self.engine terisi.
+        self.configure_detection_engine()
+        self.refresh_int8_backends(detector.weights)
+        self.backend_combo.setEnabled(True)
+        self.model_status_label.setText(f"Model: {detector.backend}")
+        self.model_status_label.setStyleSheet("color: #10B981; font-weight: bold;")
+        print(f"Model YOLOv5 berhasil dimuat dari: {detector.weights} (backend {detector.backend}, {seconds:.2f} s)")
+        self.model_loaded.emit(detector.backend, seconds)
+
+    def on_model_failed(self, message):
+        """
+        Slot (thread GUI) saat model gagal dimuat. Jika sudah ada model yang berjalan, model
+        itu tetap dipakai dan dropdown dikembalikan ke backend-nya; jika belum, video tetap
+        bisa dipakai tanpa deteksi YOLO.
+        """
+        self.backend_combo.setEnabled(True)
+        if self.yolo_loaded:
+            self.backend_combo.setCurrentIndex(self.find_backend_index(self.loaded_backend))
+            self.model_status_label.setText(f"Model: {self.yolo_detector.backend} (switch failed)")
+            self.model_status_label.setStyleSheet("color: orange; font-weight: bold;")
+            print(f"Error memuat backend baru, tetap memakai {self.yolo_detector.backend}: {message}")
+            return
+        self.model_status_label.setText("Model: failed")
+        self.model_status_label.setStyleSheet("color: red; font-weight: bold;")
+        if not self.is_camera_active:
+            self.label.setText(f"Model 'best.pt' not found or failed to load:\n{message}\n"
+                               "Select the 'HSV Colour' detector, or click 'Start Camera' for video only.")
             self.label.setStyleSheet("color: red; font-weight: bold;")
-            print(f"Error memuat model YOLOv5: {e}")
-            
-        self.list_cameras()
+        print(f"Error memuat model YOLOv5: {message}")
+
+    def find_backend_index(self, data):
+        """Indeks entri dropdown Backend dengan data (backend, int8), -1 jika tidak ada."""
+        for index in range(self.backend_combo.count()):
+            if self.backend_combo.itemData(index) == data:
+                return index
+        return -1
+
+    def refresh_int8_backends(self, weights):
+        """Menampilkan entri INT8 hanya jika artefaknya sudah diekspor (butuh set kalibrasi)."""
+        for backend, label in (('onnx', "ONNX Runtime INT8"), ('openvino', "OpenVINO INT8")):
+            index = self.find_backend_index((backend, True))
+            cached = is_cached(weights, backend, int8=True)
+            if cached and index < 0:
+                self.backend_combo.addItem(label, (backend, True))
+            elif not cached and index >= 0 and index != self.backend_combo.currentIndex():
+                self.backend_combo.removeItem(index)
 
-    def list_cameras(self):
+    def configure_detection_engine(self):
+        """
+        Memilih mesin deteksi: detektor dasar (YOLO atau HSV) penuh atau DetectThenTrack
+        dengan interval N, opsional dibungkus MotionGate yang melewati frame tanpa perubahan.
+        Bisa dipanggil saat kamera berjalan; InferenceWorker memakai mesin baru di frame berikutnya.
+        """
+        if self.engine_combo.currentData() == 'hsv':
+            detector = self.hsv_detector
+        else:
+            detector = self.yolo_detector if self.yolo_loaded else None
+        self.last_results = {}
+        if detector is None:
+            self.engine = self.detector = self.track_engine = self.motion_gate = None
+            self.tracking_label.setText("")
+            self.configure_governor()
+            return
+        detector_changed = detector is not self.detector
+        if detector_changed:
+            self.names = detector.names
+            self.base_img_size = detector.default_img_size
+            print(f"Detektor aktif: {detector.backend}")
+        self.detector = detector
+        if self.track_checkbox.isChecked():
+            engine = self.track_engine = DetectThenTrack(detector, interval=self.track_interval_spin.value())
+            print(f"Mode Detect+Track aktif: deteksi setiap {self.track_interval_spin.value()} frame.")
+        else:
+            engine = detector
+            self.track_engine = None
+            print("Mode deteksi penuh aktif: deteksi setiap frame.")
+        if self.motion_checkbox.isChecked():
+            engine = self.motion_gate = MotionGate(engine, threshold=self.motion_threshold_spin.value(),
+                                                   max_skip=self.motion_max_skip_spin.value())
+            print(f"Motion gate aktif: ambang {self.motion_gate.threshold}, maks {self.motion_gate.max_skip} frame dilewati.")
+        else:
+            self.motion_gate = None
+        self.engine = engine
+        self.update_skip_label()
+        if detector_changed:
+            self.configure_governor() # Tangga ukuran input bergantung pada detektor
+
+    def update_skip_label(self):
+        """Menampilkan berapa banyak inferensi yang dihemat oleh Detect+Track dan/atau motion gate."""
+        parts = []
+        if self.track_engine is not None:
+            parts.append(f"Inference skipped: {100 * self.track_engine.skip_ratio:.0f}%")
+        if self.motion_gate is not None:
+            parts.append(f"Motion hits: {100 * self.motion_gate.hit_rate:.0f}% "
+                         f"(diff {self.motion_gate.last_difference:.1f})")
+        self.tracking_label.setText(" | ".join(parts))
+
+    def configure_governor(self):
+        """Menyalakan/mematikan governor; tangga tingkatnya bergantung pada detektor aktif."""
+        if not self.governor_checkbox.isChecked() or self.detector is None:
+            # Ukuran input kembali ke base_img_size pada frame berikutnya (di thread inferensi).
+            self.governor = None
+            self.governor_label.setText("")
+            return
+        if self.detector.supports_dynamic_size:
+            sizes = tuple(size for size in GOVERNOR_IMG_SIZES if size < self.base_img_size)
+            sizes = (self.base_img_size,) + sizes
+        else:
+            sizes = (self.base_img_size,) # Backend input statis: hanya ROI dan batas FPS
+        self.governor = LatencyGovernor(budget=self.governor_budget_spin.value() / 1000.0,
+                                        levels=build_levels(sizes))
+        self.governor_label.setText(self.governor.describe())
+        print(f"Governor aktif: {self.governor.describe()}")
+
+    def on_governor_budget_changed(self, value):
+        if self.governor is not None:
+            self.governor.set_budget(value / 1000.0)
+
+    def apply_governor(self):
+        """
+        Dijalankan di thread inferensi sebelum deteksi: menerapkan ukuran input tingkat
+        aktif. Mengembalikan False jika frame ini dilewati karena batas FPS deteksi.
+        """
+        governor = self.governor
+        detector = self.detector
+        target = governor.level.img_size if governor is not None else self.base_img_size
+        if detector is not None and detector.img_size != target:
+            detector.set_img_size(target)
+        return governor is None or governor.should_run()
+
+    def governed_roi(self, camera, frame):
+        """ROI untuk kamera ini; governor bisa memaksa pita air jika pengguna memilih Full Frame."""
+        roi_selector = self.roi_selectors[camera]
+        governor = self.governor
+        if governor is not None and governor.level.roi and roi_selector.mode == 'full':
+            roi_selector = self.band_roi_selector
+        return roi_selector.select(frame)
+
+    def observe_latency(self, packet):
+        """Melaporkan latensi kamera-ke-hasil ke governor dan mencatat setiap perubahan tingkat."""
+        governor = self.governor
+        if governor is None:
+            return
+        reason = governor.observe(time.monotonic() - packet.timestamp)
+        if reason:
+            print(f"Governor: {governor.describe()} - {reason}")
+
+    def configure_roi(self):
+        """Mengganti mode ROI (full / pita tetap / cakrawala otomatis) saat runtime."""
+        mode = self.roi_combo.currentData()
+        self.roi_selectors = [RoiSelector(mode) for _ in range(max(1, len(self.roi_selectors)))]
+        self.roi_selector = self.roi_selectors[0]
+        print(f"Mode ROI: {mode}")
+
+    def list_cameras(self, force=True):
+        """
+        Memindai kamera di thread latar (tidak memblokir GUI). Hasil ditampilkan
+        oleh on_cameras_found; tombol Refresh memaksa pemindaian ulang.
+        """
+        if self.camera_scan_thread and self.camera_scan_thread.isRunning():
+            return
+        self.refresh_button.setEnabled(False)
+        self.refresh_button.setText("Scanning...")
+        self.camera_scan_thread = CameraScanThread(self.camera_enumerator, force=force)
+        self.camera_scan_thread.cameras_found.connect(self.on_cameras_found)
+        self.camera_scan_thread.start()
+
+    def on_cameras_found(self, cameras):
+        """Slot (thread GUI) yang mengisi dropdown dengan hasil pemindaian kamera."""
+        self.refresh_button.setEnabled(True)
+        self.refresh_button.setText("Refresh List")
         self.camera_selector.clear()
-        available_cameras = []
-        for index in range(10): 
-            cap = cv2.VideoCapture(index)
-            if cap.isOpened():
-                available_cameras.append(f"Camera {index}")
-                cap.release()
-            else:
-                cap.release()
-        
-        if available_cameras:
-            self.camera_selector.addItems(available_cameras)
+        for camera in cameras:
+            self.camera_selector.addItem(camera.label(), camera.index)
+            resolutions = ", ".join(f"{w}x{h}" for w, h in camera.resolutions) or "unknown"
+            tooltip = f"{camera.device or ''}\nResolutions: {resolutions}".strip()
+            self.camera_selector.setItemData(self.camera_selector.count() - 1, tooltip, Qt.ToolTipRole)
+        # File/folder yang pernah dibuka tetap ada setelah pemindaian ulang kamera.
+        for path in self.file_sources:
+            self.camera_selector.addItem(f"File: {path}", path)
+        self.update_extra_camera_menu()
+        if cameras or self.file_sources:
             self.start_stop_button.setEnabled(True)
         else:
             self.camera_selector.addItem("No cameras found")
-            self.start_stop_button.setEnabled(False)
-            self.label.setText("No cameras found. Connect a camera.")
-            self.label.setStyleSheet("color: orange; font-weight: bold;")
+            self.start_stop_button.setEnabled(self.is_camera_active)
+            if not self.is_camera_active:
+                self.label.setText("No cameras found. Connect a camera.")
+                self.label.setStyleSheet("color: orange; font-weight: bold;")
+
+    def open_video_file(self):
+        """Memilih file video rekaman sebagai sumber frame."""
+        path, _ = QFileDialog.getOpenFileName(self, "Open Video", "", "Videos (*.mp4 *.avi *.mkv *.mov);;All Files (*)")
+        if path:
+            self.add_file_source(path)
+
+    def open_image_folder(self):
+        """Memilih folder berisi gambar (diputar urut nama) sebagai sumber frame."""
+        path = QFileDialog.getExistingDirectory(self, "Open Image Folder")
+        if path:
+            self.add_file_source(path)
+
+    def add_file_source(self, path):
+        """Menambahkan file/folder ke dropdown sumber dan memilihnya."""
+        if path not in self.file_sources:
+            self.file_sources.append(path)
+            self.camera_selector.addItem(f"File: {path}", path)
+            self.update_extra_camera_menu()
+        self.camera_selector.setCurrentIndex(self.camera_selector.findData(path))
+        self.start_stop_button.setEnabled(True)
+
+    def update_extra_camera_menu(self):
+        """Mengisi ulang menu kamera tambahan dari dropdown sumber, centang yang lama dipertahankan."""
+        checked = {source for _, source in self.selected_extra_sources()}
+        self.extra_camera_menu.clear()
+        for i in range(self.camera_selector.count()):
+            source = self.camera_selector.itemData(i)
+            if source is None:
+                continue
+            action = self.extra_camera_menu.addAction(self.camera_selector.itemText(i))
+            action.setCheckable(True)
+            action.setData(source)
+            action.setChecked(source in checked)
+        self.extra_cameras_button.setEnabled(not self.extra_camera_menu.isEmpty() and not self.is_camera_active)
+
+    def selected_extra_sources(self):
+        """Daftar (label, sumber) kamera tambahan yang dicentang di menu '+ Cameras'."""
+        return [(action.text(), action.data()) for action in self.extra_camera_menu.actions() if action.isChecked()]
+
+    def set_steering_camera(self, index):
+        """Memilih kamera yang hasil gate-nya mengemudikan kapal (bisa diganti saat berjalan)."""
+        if index < 0:
+            return
+        self.steering_camera = index
+        degree = self.camera_degrees.get(index)
+        if degree is not None and degree != self.current_degree:
+            self.current_degree = degree
+            self.degree_changed.emit(self.current_degree)
+        if self.is_camera_active and len(self.camera_names) > 1:
+            print(f"Kamera kemudi: {self.camera_names[index]}")
 
     def toggle_camera(self):
         if self.is_camera_active:
@@ -120,13 +535,16 @@ class VideoView(QWidget):
         if self.is_camera_active: return
         
         selected_text = self.camera_selector.currentText()
-        if "Camera" in selected_text:
-            selected_index = int(selected_text.split(" ")[1])
-        else:
+        selected_index = self.camera_selector.currentData()
+        if selected_index is None:
             self.label.setText("Please select a valid camera source.")
             return
 
-        self.cap = cv2.VideoCapture(selected_index)
+        # Data dropdown: indeks kamera (int) atau path file video / folder gambar (str).
+        is_file = isinstance(selected_index, str)
+        replay_clock = self.replay_combo.currentData()
+        profile = CAPTURE_PROFILES[self.profile_combo.currentData()]
+        self.cap = open_source(selected_index, clock=replay_clock, profile=profile)
         if not self.cap.isOpened():
             self.label.setText(f"Error: Could not open {selected_text}.")
             self.cap = None
@@ -143,143 +561,396 @@ class VideoView(QWidget):
             self.original_frame_height = original_height
         self.aspect_ratio = self.original_frame_width / self.original_frame_height
 
+        # Kamera tambahan (multi-kamera), selain sumber utama.
+        extra_caps = []
+        for label, source in self.selected_extra_sources():
+            if source == selected_index:
+                continue
+            cap = open_source(source, clock=replay_clock, profile=profile)
+            if cap.isOpened():
+                extra_caps.append((label, cap))
+            else:
+                print(f"Warning: Could not open {label}, skipping it.")
+
         self.label.clear()
         self.is_camera_active = True
         self.start_stop_button.setText("Stop Camera")
+        self.record_button.setEnabled(True)
+        self.extra_cameras_button.setEnabled(False)
+
+        # --- Rakit pipeline: kamera -> inferensi -> tampilan ---
+        # Setiap antrian hanya menyimpan frame terbaru; frame basi dibuang, bukan diantrekan.
+        # Dengan beberapa kamera, semua antrian kamera berbagi satu Condition agar
+        # BatchInferenceWorker bisa menunggu frame dari kamera mana pun.
+        condition = threading.Condition() if extra_caps else None
+        self.capture_queue = LatestFrameQueue(maxsize=1, condition=condition)
+        self.display_queue = LatestFrameQueue(maxsize=1)
+        # Replay 'fast': kamera virtual menunggu inferensi sehingga tidak ada frame yang dibuang.
+        block = is_file and replay_clock == 'fast'
+        self.capture_thread = CaptureThread(self.cap, self.capture_queue, block=block, stats=self.stats)
+        self.capture_thread.capture_failed.connect(self.on_capture_failed)
+        self.capture_thread.source_finished.connect(self.on_source_finished)
+        self.replay_started = time.perf_counter() if is_file else None
+        self.replay_expected = None
+        self.camera_names = [selected_text] + [label for label, _ in extra_caps]
+        self.camera_degrees = {}
+        self.last_results = {}
+        if self.governor is not None:
+            self.governor.reset()
+        self.roi_selectors = [RoiSelector(self.roi_combo.currentData()) for _ in self.camera_names]
+        self.roi_selector = self.roi_selectors[0]
+
+        if extra_caps:
+            self.extra_captures = []
+            for camera, (label, cap) in enumerate(extra_caps, start=1):
+                queue = LatestFrameQueue(maxsize=1, condition=condition)
+                thread = CaptureThread(cap, queue, block=block and not getattr(cap, 'is_live', True),
+                                       camera=camera)
+                thread.capture_failed.connect(self.on_capture_failed)
+                self.extra_captures.append((cap, thread, queue))
+            queues = [self.capture_queue] + [queue for _, _, queue in self.extra_captures]
+            self.inference_worker = BatchInferenceWorker(queues, self.display_queue, self.process_batch,
+                                                         stats=self.stats)
+            self.inference_worker.result_ready.connect(self.on_camera_result)
+            if self.track_checkbox.isChecked() or self.motion_checkbox.isChecked():
+                print("Detect+Track dan Motion Gate tidak dipakai dalam mode multi-kamera; YOLO berjalan di setiap batch.")
+        else:
+            self.inference_worker = InferenceWorker(self.capture_queue, self.display_queue, self.process_frame,
+                                                    stats=self.stats)
+            self.inference_worker.result_ready.connect(self.on_gate_result)
+        self.inference_worker.frame_ready.connect(self.display_latest_frame)
+
+        self.steer_combo.blockSignals(True)
+        self.steer_combo.clear()
+        self.steer_combo.addItems(self.camera_names)
+        self.steering_camera = min(self.steering_camera, len(self.camera_names) - 1) if extra_caps else 0
+        self.steer_combo.setCurrentIndex(self.steering_camera)
+        self.steer_combo.blockSignals(False)
+        self.steer_combo.setEnabled(len(self.camera_names) > 1)
+
+        self.inference_worker.start()
+        self.capture_thread.start()
+        for _, thread, _ in self.extra_captures:
+            thread.start()
         
-        if self.timer is None:
-            self.timer = QTimer(self)
-            self.timer.timeout.connect(self.update_frame)
-        self.timer.start(30)
-        
-        print(f"{selected_text} started.")
-        self.update_frame()
+        print(f"{selected_text} started{f' ({replay_clock} replay)' if is_file else ''}"
+              f"{f' with {len(extra_caps)} extra camera(s), batched inference' if extra_caps else ''}.")
+        for label, cap in [(selected_text, self.cap)] + extra_caps:
+            self.print_negotiated(label, cap)
+
+    def print_negotiated(self, label, cap):
+        """Mencetak format kamera yang benar-benar dinegosiasikan oleh profil (bisa berbeda dari permintaan)."""
+        negotiated = getattr(cap, 'negotiated', None)
+        if not negotiated:
+            return
+        print(f"Kamera {label}: profil '{cap.profile.name}' -> {negotiated['fourcc'] or '?'} "
+              f"{negotiated['width']}x{negotiated['height']} @{negotiated['fps']:g} fps, "
+              f"buffer {negotiated['buffer_size']}")
 
     def stop_camera(self):
         if not self.is_camera_active: return
         
-        if self.timer and self.timer.isActive():
-            self.timer.stop()
+        self.record_button.setChecked(False) # Menghentikan rekaman (toggle_recording)
+        self.record_button.setEnabled(False)
+        # Hentikan thread kamera dan inferensi sebelum melepas kamera.
+        if self.capture_thread:
+            self.capture_thread.stop()
+            self.capture_thread.wait()
+            self.capture_thread = None
+        for cap, thread, queue in self.extra_captures:
+            thread.stop()
+            queue.close() # Membangunkan thread yang menunggu ruang (replay 'fast')
+            thread.wait()
+            cap.release()
+        if self.inference_worker:
+            self.inference_worker.stop()
+            self.capture_queue.close()
+            self.inference_worker.wait()
+            self.inference_worker = None
+        if self.display_queue:
+            self.display_queue.close()
         if self.cap and self.cap.isOpened():
+            if getattr(self.cap, 'drained', 0):
+                print(f"Kamera: {self.cap.drained} frame basi dibuang (grab_newest).")
             self.cap.release()
+        if self.track_engine is not None:
+            print(f"Detect+Track: {self.track_engine.summary()}")
+        if self.motion_gate is not None:
+            print(f"Motion gate: {self.motion_gate.summary()}")
+            self.motion_gate.reset()
+        if self.stats.samples:
+            print(self.stats.report())
         
+        self.replay_expected = None
+        self.extra_captures = []
+        self.camera_status_label.setText("")
+        self.steer_combo.setEnabled(False)
         self.is_camera_active = False
+        self.extra_cameras_button.setEnabled(not self.extra_camera_menu.isEmpty())
         self.start_stop_button.setText("Start Camera")
         self.label.clear()
         self.label.setText("Camera is stopped.")
         self.label.setStyleSheet("color: #abb2bf; font-weight: normal; font-size: 14px;")
         print("Camera stopped.")
 
-    @smart_inference_mode()
-    def update_frame(self):
-        if not self.is_camera_active or self.cap is None or not self.cap.isOpened():
-            self.label.setText("No active camera stream.")
-            return
+    def toggle_recording(self, checked):
+        """Memulai/menghentikan FrameRecorder. Encoding berjalan di thread-nya sendiri."""
+        if checked and self.recorder is None:
+            fps = self.cap.get(cv2.CAP_PROP_FPS) if self.cap else 0
+            output_dir = new_session_dir(DEFAULT_RECORDINGS_DIR)
+            recorder = FrameRecorder(output_dir, streams=self.record_combo.currentData(), fps=fps or 30.0)
+            recorder.record_failed.connect(self.on_record_failed)
+            recorder.start()
+            self.recorder = recorder
+            self.record_combo.setEnabled(False)
+            self.record_button.setText("Stop Recording")
+            self.record_button.setStyleSheet("color: red; font-weight: bold;")
+            print(f"Merekam ke {output_dir}")
+        elif not checked and self.recorder is not None:
+            recorder, self.recorder = self.recorder, None # InferenceWorker berhenti mengirim frame
+            recorder.stop()
+            recorder.wait()
+            self.record_combo.setEnabled(True)
+            self.record_button.setText("Record")
+            self.record_button.setStyleSheet("")
+            print(f"Rekaman selesai: {recorder.summary()}")
+
+    def on_record_failed(self, message):
+        """Slot saat FrameRecorder gagal menulis file."""
+        print(f"Error: {message}")
+        self.record_button.setChecked(False)
 
-        ret, frame = self.cap.read()
-        if not ret:
-            print("Warning: Failed to read frame from camera. Stopping camera.")
+    def on_source_finished(self, frames_read):
+        """Slot saat file/folder habis dibaca; kamera dihentikan setelah frame terakhir diproses."""
+        if not self.is_camera_active:
+            return
+        if self.extra_captures:
+            # Multi-kamera: replay berakhir bersama sumber utama.
+            print(f"Replay selesai: {frames_read} frame dari sumber utama.")
             self.stop_camera()
             return
-        
-        display_frame = frame.copy()
-        
-        annotator = Annotator(display_frame, line_width=2, example=str(self.names if self.yolo_loaded else [])) # Example for Annotator
-        font = cv2.FONT_HERSHEY_SIMPLEX
+        self.replay_expected = frames_read - self.capture_queue.dropped
+        self.check_replay_done()
 
-        red_centers, green_centers = [], []
-        new_degree = 0
+    def check_replay_done(self):
+        """Menghentikan replay jika semua frame yang tidak dibuang sudah selesai diproses."""
+        worker = self.inference_worker
+        if self.replay_expected is None or worker is None or not self.is_camera_active:
+            return
+        if worker.processed + worker.errors < self.replay_expected:
+            return
+        elapsed = time.perf_counter() - self.replay_started
+        frames_read = self.capture_thread.frames_read
+        summary = (f"{worker.processed} frames processed in {elapsed:.2f} s "
+                   f"({worker.processed / elapsed if elapsed else 0:.1f} FPS), "
+                   f"{self.capture_queue.dropped} of {frames_read} dropped")
+        print(f"Replay selesai: {summary}")
+        self.stop_camera()
+        self.label.setText(f"Replay finished: {summary}")
 
-        if self.yolo_loaded:
-            img_for_detection = cv2.resize(frame, (640, 640))
-            img_for_detection_rgb = cv2.cvtColor(img_for_detection, cv2.COLOR_BGR2RGB)
-            img_tensor = torch.from_numpy(img_for_detection_rgb).to(self.device).permute(2, 0, 1).float() / 255.0
-            img_tensor = img_tensor.unsqueeze(0)
-            
-            with torch.no_grad():
-                pred = self.model(img_tensor, augment=False, visualize=False)
-                pred = non_max_suppression(pred, conf_thres=0.4, iou_thres=0.45)
-            
-            for det in pred:
-                if len(det):
-                    det[:, :4] = scale_boxes(img_tensor.shape[2:], det[:, :4], display_frame.shape).round()
-                    for *xyxy, conf, cls in det:
-                        class_name = self.names[int(cls)]
-                        x1, y1, x2, y2 = map(int, xyxy)
-                        cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
-
-                        color = (255, 255, 255)
-                        if "Red_Ball" in class_name:
-                            red_centers.append((cx, cy))
-                            color = (0, 0, 255)
-                        elif "Green_Ball" in class_name:
-                            green_centers.append((cx, cy))
-                            color = (0, 255, 0)
-                        
-                        annotator.box_label(xyxy, f"{class_name} {conf:.2f}", color=colors(int(cls), True))
-                        cv2.circle(display_frame, (cx, cy), 5, (255, 255, 255), -1)
-
-            red_centers.sort(key=lambda pt: -pt[1])
-            green_centers.sort(key=lambda pt: -pt[1])
-            midpoint = None
-            
-            if red_centers and green_centers:
-                red_nearest = red_centers[0]
-                green_nearest = green_centers[0]
-                
-                midpoint = ((red_nearest[0] + green_nearest[0]) // 2, (red_nearest[1] + green_nearest[1]) // 2)
-                cv2.line(display_frame, red_nearest, green_nearest, (200, 200, 200), 2)
-                cv2.circle(display_frame, midpoint, 6, (255, 0, 255), -1)
-                cv2.putText(display_frame, "Midpoint", (midpoint[0] - 40, midpoint[1] - 10), font, 0.6, (255, 0, 255), 2)
-
-                bar_y = display_frame.shape[0] - 50
-                bar_left = 50
-                bar_right = display_frame.shape[1] - 50
-                bar_width = bar_right - bar_left
-                
-                cv2.rectangle(display_frame, (bar_left, bar_y), (bar_right, bar_y + 20), (0, 140, 255), 2)
-                center_x = (bar_left + bar_right) // 2
-                cv2.line(display_frame, (center_x, bar_y), (center_x, bar_y + 20), (0, 140, 255), 2)
-                
-                cv2.putText(display_frame, "0", (bar_left - 10, bar_y + 40), font, 0.5, (255, 255, 255), 2)
-                cv2.putText(display_frame, "90", (center_x - 15, bar_y + 40), font, 0.5, (255, 255, 255), 2)
-                cv2.putText(display_frame, "180", (bar_right - 20, bar_y + 40), font, 0.5, (255, 255, 255), 2)
-
-                if midpoint:
-                    relative_position_on_bar = (midpoint[0] - bar_left) / bar_width
-                    relative_position_on_bar = np.clip(relative_position_on_bar, 0, 1)
-
-                    new_degree = int(relative_position_on_bar * 180)
-                    
-                    indicator_x = int(bar_left + relative_position_on_bar * bar_width - 15)
-                    cv2.rectangle(display_frame, (indicator_x, bar_y), (indicator_x + 30, bar_y + 20), (0, 0, 255), -1)
-
-                    text = f"{new_degree}°"
-                    text_size = cv2.getTextSize(text, font, 0.6, 2)[0]
-                    text_x = indicator_x + (30 - text_size[0]) // 2
-                    text_y = bar_y - 10
-                    cv2.putText(display_frame, text, (text_x, text_y), font, 0.6, (0, 0, 255), 2)
-                    
-                    if new_degree != self.current_degree:
-                        self.current_degree = new_degree
-                        self.degree_changed.emit(self.current_degree)
-        
-        display_frame_rgb = cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = display_frame_rgb.shape
-        q_image = QImage(display_frame_rgb.data, w, h, ch * w, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(q_image)
-        
-        label_size = self.label.size()
-        if label_size.width() > 0 and label_size.height() > 0:
-            scaled_pixmap = pixmap.scaled(label_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.label.setPixmap(scaled_pixmap)
-        else:
-            self.label.setPixmap(pixmap)
+    def on_capture_failed(self, message):
+        """Slot saat CaptureThread gagal membaca frame dari kamera."""
+        print(f"Warning: {message} Stopping camera.")
+        self.stop_camera()
+
+    def process_frame(self, packet):
+        """
+        Dijalankan di InferenceWorker (bukan thread GUI). Melakukan deteksi (YOLO atau HSV) dan
+        logika gate merah/hijau, lalu (hanya jika tampilan terlihat) anotasi dan
+        pengecilan frame ke ukuran tampilan. Jika sedang merekam, frame diserahkan ke
+        FrameRecorder tanpa menunggu. Jangan menyentuh widget Qt di sini.
+        """
+        det, gate, roi = None, None, None
+        engine = self.engine
+        if engine is not None:
+            if self.apply_governor():
+                roi = self.governed_roi(0, packet.frame)
+                det = engine.detect(packet.frame, self.stats, roi)
+                gate = self.apply_detections(packet, det)
+                self.last_results[0] = (det, gate, roi)
+                self.observe_latency(packet)
+            else:
+                # Dilewati governor: anotasi terakhir digambar ulang agar tampilan tidak berkedip,
+                # tapi packet tidak membawa derajat baru.
+                det, gate, roi = self.last_results.get(0, (None, None, None))
+        self.finish_frame(packet, det, gate, roi)
+
+    def process_batch(self, packets):
+        """
+        Versi multi-kamera dari process_frame (dijalankan di BatchInferenceWorker).
+        Frame terbaru dari setiap kamera dideteksi dalam satu panggilan model; setiap
+        kamera mendapat hasil gate sendiri, sedangkan anotasi, rekaman, dan tampilan
+        hanya dikerjakan untuk kamera kemudi.
+        """
+        steering_camera = self.steering_camera
+        detector = self.detector
+        if detector is None or not self.apply_governor():
+            for packet in packets:
+                if packet.camera == steering_camera:
+                    det, gate, roi = self.last_results.get(packet.camera, (None, None, None))
+                    self.finish_frame(packet, det, gate, roi)
+            return
+        rois = [self.governed_roi(packet.camera, packet.frame) for packet in packets]
+        dets = detector.detect_batch([packet.frame for packet in packets], self.stats, rois,
+                                          slots=[packet.camera for packet in packets])
+        for packet, det, roi in zip(packets, dets, rois):
+            gate = self.apply_detections(packet, det)
+            self.last_results[packet.camera] = (det, gate, roi)
+            if packet.camera == steering_camera:
+                self.finish_frame(packet, det, gate, roi)
+        # Latensi batch ditentukan oleh frame tertua di dalamnya.
+        self.observe_latency(min(packets, key=lambda packet: packet.timestamp))
+
+    def apply_detections(self, packet, det):
+        """Menempelkan deteksi dan derajat gate ke FramePacket; mengembalikan GateResult."""
+        for *xyxy, conf, cls in det:
+            x1, y1, x2, y2 = map(int, xyxy)
+            packet.detections.append((self.names[int(cls)], float(conf), (x1, y1, x2, y2)))
+        gate = find_gate(det, self.names, packet.frame.shape[1])
+        packet.degree = gate.degree
+        return gate
+
+    def finish_frame(self, packet, det, gate, roi):
+        """Tahap setelah deteksi: rekaman, anotasi, dan pengecilan frame untuk tampilan."""
+        frame = packet.frame
+        recorder = self.recorder
+        record_raw = recorder is not None and recorder.wants('raw')
+        record_annotated = recorder is not None and recorder.wants('annotated')
+
+        # Tab video tersembunyi: hasil deteksi tetap dikirim, tapi tidak ada kerja tampilan
+        # (kecuali anotasi yang sedang direkam).
+        if not self.display_enabled and not record_annotated:
+            if record_raw:
+                recorder.submit(packet, {'raw': frame})
+            return
+
+        # Anotasi digambar langsung di atas frame kamera, jadi frame mentah untuk
+        # rekaman disalin dulu (hanya jika memang ada yang akan digambar).
+        raw_frame = frame.copy() if record_raw and det is not None else frame
+        # Frame dari kamera tidak dipakai lagi setelah preprocessing, jadi anotasi
+        # langsung digambar di atasnya tanpa salinan tambahan.
+        display_frame = frame
+        if det is not None:
+            start = time.perf_counter()
+            if roi is not None:
+                self.hud.draw_roi(display_frame, roi)
+            self.hud.draw_detections(display_frame, det, self.names)
+            self.stats.add('annotate', time.perf_counter() - start)
+            start = time.perf_counter()
+            self.hud.draw_gate(display_frame, gate)
+            self.stats.add('hud', time.perf_counter() - start)
+
+        if recorder is not None:
+            frames = {}
+            if record_raw:
+                frames['raw'] = raw_frame
+            if record_annotated:
+                frames['annotated'] = display_frame
+            recorder.submit(packet, frames)
+
+        if self.display_enabled:
+            start = time.perf_counter()
+            packet.display_frame = self.fit_to_display(display_frame)
+            self.stats.add('display_prep', time.perf_counter() - start)
+
+    def fit_to_display(self, frame):
+        """
+        Memperkecil frame ke ukuran tampilan (menjaga rasio aspek) dengan OpenCV,
+        sehingga thread GUI cukup melukisnya tanpa konversi atau skala ulang.
+        """
+        target_w, target_h = self.display_size
+        h, w = frame.shape[:2]
+        scale = min(target_w / w, target_h / h)
+        if scale <= 0 or abs(scale - 1.0) < 0.01:
+            return np.ascontiguousarray(frame)
+        size = (max(1, int(w * scale)), max(1, int(h * scale)))
+        # INTER_AREA untuk memperkecil (tanpa aliasing), INTER_LINEAR untuk memperbesar.
+        interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+        return cv2.resize(frame, size, interpolation=interpolation)
+
+    def on_gate_result(self, detections, degree, timestamp):
+        """Slot (thread GUI) yang menerima hasil deteksi beserta timestamp frame-nya."""
+        self.gate_result_ready.emit(detections, degree, timestamp)
+        if self.replay_expected is not None:
+            self.check_replay_done()
+        if self.track_engine is not None or self.motion_gate is not None:
+            self.update_skip_label()
+        if degree is not None and degree != self.current_degree:
+            self.current_degree = degree
+            self.degree_changed.emit(self.current_degree)
+
+    def on_camera_result(self, camera, detections, degree, timestamp):
+        """Slot (thread GUI) untuk hasil per kamera dalam mode multi-kamera."""
+        self.camera_degrees[camera] = degree
+        self.camera_status_label.setText(" | ".join(
+            f"{i}: {self.camera_degrees[i] if self.camera_degrees.get(i) is not None else '--'}"
+            + ("*" if i == self.steering_camera else "")
+            for i in range(len(self.camera_names))))
+        if camera == self.steering_camera:
+            self.on_gate_result(detections, degree, timestamp)
+
+    def display_latest_frame(self):
+        """Tahap tampilan: hanya melukis frame terbaru yang sudah selesai diproses."""
+        packet = self.display_queue.get(timeout=0) if self.display_queue else None
+        if packet is None or not self.is_camera_active:
+            return # Frame ini sudah digantikan oleh frame yang lebih baru
+        # Frame sudah BGR dan seukuran widget; tidak ada cvtColor, QPixmap, atau skala di sini.
+        self.label.set_frame(packet.display_frame)
+        self.stats.tick('display')
+
+    def update_perf_counters(self):
+        """Menyalin jumlah frame yang dibuang (per antrian dan perekam) ke StageStats."""
+        if self.capture_queue is not None:
+            dropped = self.capture_queue.dropped + sum(queue.dropped for _, _, queue in self.extra_captures)
+            self.stats.set_counter('capture', dropped)
+        if self.display_queue is not None:
+            self.stats.set_counter('display', self.display_queue.dropped)
+        if self.recorder is not None:
+            self.stats.set_counter('record', self.recorder.dropped)
+
+    def perf_lines(self):
+        """Baris ringkas statistik performa (dipakai overlay dan panel status)."""
+        if not self.stats.enabled:
+            return ["Performance timers disabled"]
+        lines = self.stats.compact_lines(rate_events=('capture', 'inference', 'display'),
+                                         counter_names=('capture', 'display', 'record', 'serial'))
+        if self.governor is not None:
+            lines.insert(0, f"gov  {self.governor.describe()}")
+        return lines
+
+    def refresh_perf_overlay(self):
+        """Dipanggil timer (2 Hz): memperbarui penghitung dan teks overlay jika aktif."""
+        self.update_perf_counters()
+        if self.governor is not None:
+            self.governor_label.setText(self.governor.describe())
+        if self.perf_overlay_checkbox.isChecked() and self.is_camera_active:
+            self.label.set_overlay_lines(self.perf_lines())
+        elif self.label.overlay_lines:
+            self.label.set_overlay_lines([])
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        if self.is_camera_active:
-            self.update_frame()
+        # Cukup catat ukuran baru; frame berikutnya akan diperkecil ke ukuran ini oleh InferenceWorker.
+        size = self.label.size()
+        self.display_size = (size.width(), size.height())
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.display_enabled = True
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        # Tab lain sedang aktif (atau jendela diminimalkan): lewati anotasi dan tampilan.
+        self.display_enabled = False
+
+    def shutdown(self):
+        """Menghentikan semua thread milik tab video sebelum aplikasi ditutup."""
+        self.stop_camera()
+        if self.camera_scan_thread and self.camera_scan_thread.isRunning():
+            self.camera_scan_thread.wait()
+        if self.model_loader and self.model_loader.isRunning():
+            print("Menunggu pemuatan model selesai...")
+            self.model_loader.wait()
 
     def closeEvent(self, event):
         self.stop_camera()
\ No newline at end of file
@@ -1,10 +1,20 @@
 # main.py
 
+import time
+# Titik awal pengukuran waktu startup, diambil sebelum impor pustaka berat.
+STARTUP_T0 = time.perf_counter()
+
 import sys
 from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import QFile, QTextStream
+from PyQt5.QtCore import QFile, QTextStream, QTimer
 from gui.views.dashboard import DashboardWindow
 
+def log_startup(stage):
+    """Mencetak waktu (ms) sejak proses dimulai hingga tahap startup tertentu."""
+    print(f"[STARTUP] {stage}: {(time.perf_counter() - STARTUP_T0) * 1000:.0f} ms")
+
+log_startup("Imports done")
+
 def load_stylesheet(app, stylesheet_path):
     """Loads a QSS stylesheet from the given path and applies it to the application."""
     qss_file = QFile(stylesheet_path)
@@ -24,9 +34,16 @@ if __name__ == "__main__":
     load_stylesheet(app, "gui/resources/dark_theme.qss")
 
     window = DashboardWindow()
+    log_startup("DashboardWindow constructed")
     window.show()
 
     # Pass the app instance to the dashboard for theme switching in header
     window.set_application(app)
 
+    # singleShot(0) baru dijalankan setelah event loop memproses tampilan pertama jendela.
+    QTimer.singleShot(0, lambda: log_startup("Window shown"))
+    # Model YOLO dimuat di thread latar; catat kapan deteksi benar-benar siap.
+    window.central_view.tab_video.model_loaded.connect(
+        lambda backend, seconds: log_startup(f"Model ready ({backend}, loaded in {seconds:.2f} s)"))
+
     sys.exit(app.exec_())
\ No newline at end of file
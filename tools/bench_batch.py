@@ -0,0 +1,115 @@
+# tools/bench_batch.py
+"""
+Benchmark inferensi multi-kamera: N panggilan detect() berurutan (satu per kamera)
+dibandingkan satu panggilan detect_batch() untuk frame semua kamera. Hasil kedua
+cara juga dibandingkan (jumlah deteksi dan selisih koordinat kotak).
+
+Contoh:
+    python -m tools.bench_batch rekaman/bow.mp4 rekaman/side.mp4
+    python -m tools.bench_batch --cameras 3 --ticks 50 --backend onnx
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from core.detector import YoloDetector, DEFAULT_WEIGHTS
+from core.backends import BACKEND_LABELS
+from core.frame_sources import iter_frames
+
+
+def load_camera_frames(sources, cameras, ticks, size):
+    """
+    Menyiapkan frame per kamera (semua diubah ke ukuran yang sama).
+
+    Tanpa sumber, dipakai frame acak. Jika sumber lebih sedikit dari kamera,
+    sumber dipakai ulang dengan offset frame berbeda agar isi tiap kamera tidak identik.
+    """
+    width, height = size
+    if not sources:
+        rng = np.random.default_rng(0)
+        return [[rng.integers(0, 255, (height, width, 3), dtype=np.uint8) for _ in range(ticks)]
+                for _ in range(cameras)]
+    per_camera = []
+    for camera in range(cameras):
+        offset = (camera // len(sources)) * ticks
+        frames = []
+        for i, frame in enumerate(iter_frames(sources[camera % len(sources)])):
+            if i >= offset:
+                frames.append(cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA))
+            if len(frames) >= ticks:
+                break
+        if not frames:
+            raise SystemExit(f"Error: {sources[camera % len(sources)]} has no frames after offset {offset}")
+        per_camera.append(frames)
+    ticks = min(len(frames) for frames in per_camera)
+    return [frames[:ticks] for frames in per_camera]
+
+
+def measure(name, fn, batches, cameras):
+    timings = []
+    results = []
+    for frames in batches:
+        start = time.perf_counter()
+        dets = fn(frames)
+        timings.append(time.perf_counter() - start)
+        results.append([det.clone() for det in dets])
+    timings_ms = np.array(timings) * 1000
+    fps = cameras * len(batches) / timings_ms.sum() * 1000
+    print(f"{name:<12} per tick median {np.median(timings_ms):8.2f} ms | p95 {np.percentile(timings_ms, 95):8.2f} ms"
+          f" | {fps:7.1f} frames/s")
+    return results, float(np.median(timings_ms))
+
+
+def compare(sequential, batched):
+    """Membandingkan hasil deteksi berurutan dan batch."""
+    count_mismatch, max_diff = 0, 0.0
+    for seq_tick, batch_tick in zip(sequential, batched):
+        for a, b in zip(seq_tick, batch_tick):
+            if len(a) != len(b):
+                count_mismatch += 1
+            elif len(a):
+                max_diff = max(max_diff, float((a[:, :4] - b[:, :4]).abs().max()))
+    return count_mismatch, max_diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inferensi batch multi-kamera.")
+    parser.add_argument('sources', nargs='*', help="File video atau folder gambar, satu per kamera.")
+    parser.add_argument('--cameras', type=int, default=0, help="Jumlah kamera (default: jumlah sumber, minimal 2).")
+    parser.add_argument('--ticks', type=int, default=100, help="Jumlah tick inferensi yang diukur.")
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--size', type=int, nargs=2, default=(640, 480), metavar=('W', 'H'),
+                        help="Resolusi frame setiap kamera.")
+    parser.add_argument('--weights', default=str(DEFAULT_WEIGHTS))
+    parser.add_argument('--device', default='', help="'' (otomatis), 'cpu', '0', ...")
+    parser.add_argument('--img-size', type=int, default=640)
+    parser.add_argument('--backend', choices=list(BACKEND_LABELS), default='pytorch')
+    args = parser.parse_args()
+
+    cameras = args.cameras or max(len(args.sources), 2)
+    detector = YoloDetector(args.weights, device=args.device, img_size=args.img_size, backend=args.backend)
+    if not detector.supports_batch:
+        print(f"Warning: backend {detector.backend} runs batch 1 only; detect_batch falls back to sequential calls.")
+    per_camera = load_camera_frames(args.sources, cameras, args.ticks + args.warmup, tuple(args.size))
+    batches = [list(frames) for frames in zip(*per_camera)]
+    warmup, batches = batches[:args.warmup], batches[args.warmup:]
+
+    for frames in warmup:
+        for frame in frames:
+            detector.detect(frame)
+        detector.detect_batch(frames)
+
+    print(f"{cameras} camera(s) x {len(batches)} ticks | {args.size[0]}x{args.size[1]} -> img {args.img_size}"
+          f" | backend {detector.backend}, device {detector.device}")
+    sequential, seq_ms = measure("sequential", lambda frames: [detector.detect(frame) for frame in frames],
+                                 batches, cameras)
+    batched, batch_ms = measure("batched", detector.detect_batch, batches, cameras)
+    mismatches, max_diff = compare(sequential, batched)
+    print(f"speedup {seq_ms / batch_ms:.2f}x | detection count mismatches {mismatches} | max box diff {max_diff:.2f} px")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# tools/bench_detectors.py
+"""
+Membandingkan detektor dasar pada rekaman yang sama: YOLOv5 dan threshold warna HSV.
+Untuk setiap detektor dicetak FPS dan persentil latensi per frame; derajat gate
+dibandingkan dengan detektor pertama (acuan, biasanya YOLO) untuk melihat seberapa
+sering keduanya sepakat.
+
+Contoh:
+    python -m tools.bench_detectors rekaman/misi1.mp4
+    python -m tools.bench_detectors rekaman/frames/ --engines hsv --hsv-size 320 640
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from core.color_detector import HsvBallDetector
+from core.frame_sources import iter_frames
+from core.gate_detection import find_gate
+
+
+def create_engines(args):
+    """Membuat daftar (nama, detektor). YOLO dilewati dengan peringatan jika gagal dimuat."""
+    engines = []
+    for engine in args.engines:
+        if engine == 'yolo':
+            try:
+                from core.detector import YoloDetector, DEFAULT_WEIGHTS
+                detector = YoloDetector(args.weights or DEFAULT_WEIGHTS, device=args.device, img_size=args.img_size,
+                                        backend=args.backend)
+            except Exception as e:
+                print(f"Warning: YOLOv5 could not be loaded ({e}); skipping it.")
+                continue
+            engines.append((f"yolo-{detector.backend}-{args.img_size}", detector))
+        else:
+            engines.extend((f"hsv-{size}", HsvBallDetector(img_size=size)) for size in args.hsv_size)
+    return engines
+
+
+def run_engine(detector, frames):
+    """Menjalankan detektor pada semua frame; mengembalikan (latensi detik, derajat per frame)."""
+    timings, degrees = [], []
+    for frame in frames:
+        start = time.perf_counter()
+        det = detector.detect(frame)
+        gate = find_gate(det, detector.names, frame.shape[1])
+        timings.append(time.perf_counter() - start)
+        degrees.append(gate.degree)
+    return np.array(timings), degrees
+
+
+def agreement(reference, degrees):
+    """(fraksi frame dengan status gate sama, rata-rata |selisih derajat| saat keduanya melihat gate)."""
+    same = sum((a is None) == (b is None) for a, b in zip(reference, degrees))
+    diffs = [abs(a - b) for a, b in zip(reference, degrees) if a is not None and b is not None]
+    return same / max(len(reference), 1), (float(np.mean(diffs)) if diffs else float('nan'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark detektor YOLOv5 vs threshold warna HSV.")
+    parser.add_argument('source', help="File video atau folder gambar.")
+    parser.add_argument('--engines', nargs='+', choices=('yolo', 'hsv'), default=['yolo', 'hsv'],
+                        help="Detektor yang dibandingkan; yang pertama menjadi acuan.")
+    parser.add_argument('--weights', default=None, help="Bobot YOLOv5 (default yolov5/best.pt).")
+    parser.add_argument('--device', default='', help="'' (otomatis), 'cpu', '0', ...")
+    parser.add_argument('--img-size', type=int, default=640, help="Ukuran input YOLO.")
+    parser.add_argument('--backend', default='pytorch', help="Backend YOLO (lihat core/backends.py).")
+    parser.add_argument('--hsv-size', type=int, nargs='+', default=[320], help="Sisi frame kerja HSV yang diuji.")
+    parser.add_argument('--max-frames', type=int, default=300)
+    args = parser.parse_args()
+
+    frames = []
+    for frame in iter_frames(args.source):
+        frames.append(frame)
+        if len(frames) >= args.max_frames:
+            break
+    if not frames:
+        raise SystemExit(f"Error: {args.source} has no frames")
+    engines = create_engines(args)
+    if not engines:
+        raise SystemExit("Error: no detector could be created")
+
+    print(f"{len(frames)} frames from {args.source} ({frames[0].shape[1]}x{frames[0].shape[0]})")
+    print(f"{'engine':<22}{'FPS':>8}{'p50 ms':>9}{'p95 ms':>9}{'gate %':>8}{'agree %':>9}{'|d deg|':>9}")
+    reference = None
+    for name, detector in engines:
+        detector.detect(frames[0]) # Warmup
+        timings, degrees = run_engine(detector, frames)
+        timings_ms = timings * 1000
+        seen = 100 * sum(d is not None for d in degrees) / len(degrees)
+        if reference is None:
+            reference = degrees
+            agree, diff = 1.0, 0.0
+        else:
+            agree, diff = agreement(reference, degrees)
+        print(f"{name:<22}{len(frames) / timings.sum():8.1f}{np.median(timings_ms):9.2f}"
+              f"{np.percentile(timings_ms, 95):9.2f}{seen:8.1f}{100 * agree:9.1f}{diff:9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# tools/bench_gate.py
+"""
+Micro-benchmark logika gate: loop Python per deteksi (versi lama di VideoView)
+dibandingkan core.gate_detection.find_gate yang tervektorisasi. Hasil keduanya
+juga dicek harus identik.
+
+Contoh:
+    python -m tools.bench_gate --detections 30 --frames 5000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import torch
+
+from core.gate_detection import GateResult, degree_from_x, find_gate
+
+NAMES = {0: 'Red_Ball', 1: 'Green_Ball', 2: 'Yellow_Ball'}
+
+
+def legacy_find_gate(det, names, frame_width):
+    """Salinan loop per deteksi dari VideoView.update_frame (tanpa kode gambar)."""
+    red_centers, green_centers = [], []
+    for *xyxy, conf, cls in det:
+        class_name = names[int(cls)]
+        x1, y1, x2, y2 = map(int, xyxy)
+        center = ((x1 + x2) // 2, (y1 + y2) // 2)
+        if "Red_Ball" in class_name:
+            red_centers.append(center)
+        elif "Green_Ball" in class_name:
+            green_centers.append(center)
+    result = GateResult()
+    if red_centers:
+        result.red = max(red_centers, key=lambda pt: pt[1])
+    if green_centers:
+        result.green = max(green_centers, key=lambda pt: pt[1])
+    if result.red and result.green:
+        result.midpoint = ((result.red[0] + result.green[0]) // 2, (result.red[1] + result.green[1]) // 2)
+        result.degree = degree_from_x(result.midpoint[0], frame_width)
+    return result
+
+
+def random_detections(rng, count, width, height):
+    """Membuat tensor hasil NMS (N, 6) acak dalam koordinat frame."""
+    xy = rng.uniform(0, [width - 40, height - 40], (count, 2))
+    wh = rng.uniform(10, 40, (count, 2))
+    conf = rng.uniform(0.4, 1.0, (count, 1))
+    cls = rng.integers(0, len(NAMES), (count, 1))
+    return torch.from_numpy(np.hstack([xy, xy + wh, conf, cls]).astype(np.float32))
+
+
+def measure(name, fn, dets, frame_width):
+    timings = []
+    for det in dets:
+        start = time.perf_counter()
+        fn(det, NAMES, frame_width)
+        timings.append(time.perf_counter() - start)
+    timings_us = np.array(timings) * 1e6
+    print(f"{name:<12} median {np.median(timings_us):8.1f} us | p95 {np.percentile(timings_us, 95):8.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark logika gate merah/hijau.")
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--detections', type=int, default=20, help="Jumlah deteksi per frame.")
+    parser.add_argument('--frames', type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    dets = [random_detections(rng, args.detections, args.width, args.height) for _ in range(args.frames)]
+
+    mismatches = 0
+    for det in dets:
+        old, new = legacy_find_gate(det, NAMES, args.width), find_gate(det, NAMES, args.width)
+        if (old.red, old.green, old.midpoint, old.degree) != (new.red, new.green, new.midpoint, new.degree):
+            mismatches += 1
+    print(f"{args.frames} frame, {args.detections} deteksi/frame | hasil berbeda: {mismatches}")
+    measure("legacy loop", legacy_find_gate, dets, args.width)
+    measure("vectorised", find_gate, dets, args.width)
+
+
+if __name__ == '__main__':
+    main()
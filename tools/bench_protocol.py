@@ -0,0 +1,136 @@
+# tools/bench_protocol.py
+"""
+Benchmark dan uji round-trip protokol serial: teks ("T:GPS,...;BAT,...") dibandingkan
+frame biner COBS + CRC16 (core/binary_protocol.py).
+
+Yang diperiksa:
+  - Round-trip: telemetri acak -> frame -> FrameDecoder -> TelemetryRecord harus sama
+    (dalam resolusi kuantisasi), COBS harus reversibel untuk data apa pun.
+  - Deteksi korupsi: satu byte frame diubah acak; frame rusak harus ditolak.
+  - Throughput: pesan/detik untuk framing + parsing di sisi GUI, byte per pesan,
+    kapasitas jalur serial (pesan/detik pada baud rate), dan decode batch NumPy.
+
+Contoh:
+    python -m tools.bench_protocol
+    python -m tools.bench_protocol --messages 50000
+"""
+
+import argparse
+import random
+import time
+
+from core.binary_protocol import (FrameDecoder, FrameEncoder, MSG_TELEMETRY, cobs_decode, cobs_encode,
+                                  decode_telemetry_batch, pack_telemetry)
+from core.line_framer import LineFramer
+from core.telemetry import TelemetryParser
+
+
+def random_sample(rng):
+    return {'lat': rng.uniform(-90, 90), 'lon': rng.uniform(-180, 180), 'sats': rng.randrange(0, 20),
+            'battery': rng.uniform(10, 13), 'heading': rng.uniform(0, 359.99), 'speed': rng.uniform(0, 5)}
+
+
+def text_line(sample):
+    """Baris telemetri teks dengan presisi yang sama seperti firmware."""
+    return (f"T:GPS,{sample['lat']:.4f},{sample['lon']:.4f},{sample['sats']};BAT,{sample['battery']:.1f};"
+            f"COMP,{sample['heading']:.0f};SPD,{sample['speed']:.1f}\n").encode()
+
+
+def check_round_trip(rng, count):
+    """Jumlah sampel yang tidak kembali utuh (seharusnya 0)."""
+    encoder, decoder, parser = FrameEncoder(), FrameDecoder(), TelemetryParser()
+    tolerances = {'lat': 1e-7, 'lon': 1e-7, 'battery': 1e-3, 'heading': 1e-2, 'speed': 1e-2}
+    failures = 0
+    for i in range(count):
+        sample = random_sample(rng)
+        frames = decoder.feed(encoder.encode(MSG_TELEMETRY, pack_telemetry(i, **sample)))
+        if len(frames) != 1:
+            failures += 1
+            continue
+        parser.merge_binary(frames[0][2])
+        state = parser.state
+        if state.sats != sample['sats'] or any(abs(getattr(state, key) - sample[key]) > tol
+                                               for key, tol in tolerances.items()):
+            failures += 1
+    for _ in range(count):
+        data = bytes(rng.choice((0, rng.randrange(256))) for _ in range(rng.randrange(0, 600)))
+        if cobs_decode(cobs_encode(data)) != data:
+            failures += 1
+    return failures
+
+
+def check_corruption(rng, count):
+    """(frame rusak yang ditolak, frame rusak yang lolos) dari `count` frame dengan satu byte diubah."""
+    encoder = FrameEncoder()
+    rejected = accepted = 0
+    for i in range(count):
+        frame = bytearray(encoder.encode(MSG_TELEMETRY, pack_telemetry(i, **random_sample(rng))))
+        pos = rng.randrange(len(frame) - 1) # Pembatas 0x00 di akhir tidak diubah
+        frame[pos] ^= rng.randrange(1, 256)
+        decoder = FrameDecoder()
+        if decoder.feed(bytes(frame)):
+            accepted += 1
+        else:
+            rejected += 1
+    return rejected, accepted
+
+
+def bench_text(stream, count, chunk):
+    framer, parser = LineFramer(), TelemetryParser()
+    start = time.perf_counter()
+    for pos in range(0, len(stream), chunk):
+        for line in framer.feed(stream[pos:pos + chunk]):
+            parser.parse(line)
+    return count / (time.perf_counter() - start)
+
+
+def bench_binary(stream, count, chunk):
+    decoder, parser = FrameDecoder(), TelemetryParser()
+    start = time.perf_counter()
+    for pos in range(0, len(stream), chunk):
+        for msg_type, _, payload in decoder.feed(stream[pos:pos + chunk]):
+            if msg_type == MSG_TELEMETRY:
+                parser.merge_binary(payload)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark protokol serial teks vs biner (COBS + CRC16).")
+    parser.add_argument('--messages', type=int, default=20000, help="Jumlah pesan telemetri per uji.")
+    parser.add_argument('--chunk', type=int, default=512, help="Ukuran potongan read() yang ditiru (byte).")
+    parser.add_argument('--baud', type=int, default=115200, help="Baud rate untuk menghitung kapasitas jalur.")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    failures = check_round_trip(rng, 2000)
+    print(f"Round-trip (telemetry + COBS): {'OK' if not failures else f'{failures} FAILURES'}")
+    rejected, accepted = check_corruption(rng, 5000)
+    print(f"Corrupted frames: {rejected} rejected, {accepted} accepted")
+
+    samples = [random_sample(rng) for _ in range(args.messages)]
+    text_stream = b"".join(text_line(sample) for sample in samples)
+    encoder = FrameEncoder()
+    payloads = [pack_telemetry(i, **sample) for i, sample in enumerate(samples)]
+    binary_stream = b"".join(encoder.encode(MSG_TELEMETRY, payload) for payload in payloads)
+
+    print(f"{'protocol':<10}{'bytes/msg':>11}{'parse msgs/s':>14}{f'link msgs/s @{args.baud}':>22}")
+    for name, stream, bench in (('text', text_stream, bench_text), ('binary', binary_stream, bench_binary)):
+        rate = bench(stream, args.messages, args.chunk)
+        size = len(stream) / args.messages
+        print(f"{name:<10}{size:11.1f}{rate:14.0f}{args.baud / 10 / size:22.0f}")
+
+    start = time.perf_counter()
+    batch = decode_telemetry_batch(payloads)
+    elapsed = time.perf_counter() - start
+    print(f"NumPy batch decode: {args.messages / elapsed:,.0f} msgs/s ({len(batch['lat'])} records)")
+
+    start = time.perf_counter()
+    for i in range(args.messages):
+        encoder.command(f"S1550;D{i % 180}\n")
+    print(f"Setpoint frame encode: {args.messages / (time.perf_counter() - start):,.0f} cmds/s "
+          f"({len(encoder.setpoint(1550, 90))} bytes vs {len(b'S1550;D90' + bytes(1))} text)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+# tools/bench_serial.py
+"""
+Benchmark thread pembaca serial: loop lama (cek in_waiting tanpa jeda + readline())
+dibandingkan SerialReader (read() memblokir dengan timeout + LineFramer).
+
+ESP32 ditiru dengan pasangan pseudo-terminal (Linux/macOS), sehingga tidak perlu
+perangkat keras. Diukur:
+  - CPU saat idle: waktu CPU proses selama port diam beberapa detik.
+  - Throughput: berapa baris telemetri per detik yang bisa dibaca dan diurai.
+  - Sinyal ke thread GUI: loop lama memancarkan satu sinyal per baris (dan GUI
+    mengurai setiap baris), SerialReader memancarkan snapshot telemetri berlaju terbatas.
+Juga dicek bahwa LineFramer memotong baris dengan benar saat data tiba dalam
+potongan acak dan ada baris sampah yang terlalu panjang.
+
+Contoh:
+    python -m tools.bench_serial
+    python -m tools.bench_serial --idle 5 --lines 50000
+"""
+
+import argparse
+import os
+import random
+import threading
+import time
+import tty
+
+import serial
+from PyQt5.QtCore import Qt
+
+from core.line_framer import LineFramer
+from core.serial_handler import SerialReader, READ_TIMEOUT
+
+SAMPLE_LINE = b"T:GPS,-6.914744,107.609810,9;COMP,187.5\n"
+
+
+class LegacySerialReader(SerialReader):
+    """Salinan loop SerialReader.run versi lama (tanpa print), sebagai pembanding."""
+    def run(self):
+        while self.running and self.ser and self.ser.is_open:
+            try:
+                if self.ser.in_waiting > 0:
+                    text = self.ser.readline().decode('utf-8', errors='ignore').strip()
+                    if text:
+                        self.lines_read += 1
+                        self.data_received.emit(text)
+            except serial.SerialException:
+                self.connection_lost.emit()
+                break
+
+
+def open_pty():
+    """Membuat pasangan pseudo-terminal: (fd master sisi 'ESP32', serial.Serial sisi GUI)."""
+    master, slave = os.openpty()
+    tty.setraw(master)
+    port = serial.Serial(os.ttyname(slave), 115200, timeout=READ_TIMEOUT)
+    os.close(slave)
+    return master, port
+
+
+def run_reader(reader_cls, idle_seconds, line_count):
+    """Mengukur satu kelas pembaca; mengembalikan (CPU idle %, baris/detik, baris diterima, sinyal ke GUI)."""
+    master, port = open_pty()
+    reader = reader_cls(port)
+    signals = [0]
+
+    def on_signal(_):
+        signals[0] += 1
+
+    # DirectConnection: slot dipanggil di thread pembaca (tidak butuh event loop Qt).
+    reader.data_received.connect(on_signal, Qt.DirectConnection)
+    reader.telemetry_received.connect(on_signal, Qt.DirectConnection)
+    thread = threading.Thread(target=reader.run, daemon=True)
+    thread.start()
+    try:
+        time.sleep(0.2)
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        time.sleep(idle_seconds)
+        idle_cpu = 100 * (time.process_time() - cpu_start) / (time.perf_counter() - wall_start)
+
+        payload = SAMPLE_LINE * 100
+        start = time.perf_counter()
+        for _ in range(line_count // 100):
+            os.write(master, payload)
+        deadline = start + 30
+        while reader.lines_read < line_count and time.perf_counter() < deadline:
+            time.sleep(0.001)
+        elapsed = time.perf_counter() - start
+        time.sleep(2 * READ_TIMEOUT) # Snapshot terakhir
+    finally:
+        reader.stop()
+        thread.join(timeout=2)
+        port.close()
+        os.close(master)
+    return idle_cpu, reader.lines_read / elapsed, reader.lines_read, signals[0]
+
+
+def check_framer(seed=0):
+    """Mengirim baris valid dan sampah dalam potongan acak; semua baris valid harus utuh."""
+    rng = random.Random(seed)
+    lines = [f"T:COMP,{i}.5".encode() for i in range(2000)]
+    stream = bytearray()
+    for i, line in enumerate(lines):
+        stream += line + b"\r\n"
+        if i % 200 == 0:
+            stream += bytes(rng.randrange(32, 127) for _ in range(5000)) + b"\n" # Sampah tanpa newline
+    framer = LineFramer(max_line=1024)
+    out = []
+    pos = 0
+    while pos < len(stream):
+        size = rng.randint(1, 300)
+        out.extend(framer.feed(bytes(stream[pos:pos + size])))
+        pos += size
+    expected = [line.decode() for line in lines]
+    return out == expected, framer.dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pembaca serial lama vs SerialReader.")
+    parser.add_argument('--idle', type=float, default=3.0, help="Durasi pengukuran CPU idle (detik).")
+    parser.add_argument('--lines', type=int, default=20000, help="Jumlah baris untuk uji throughput.")
+    args = parser.parse_args()
+
+    ok, dropped = check_framer()
+    print(f"LineFramer check: {'OK' if ok else 'MISMATCH'} ({dropped} oversized garbage lines dropped)")
+    print(f"{'reader':<10}{'idle CPU %':>12}{'lines/s':>12}{'received':>10}{'GUI signals':>13}")
+    for name, reader_cls in (('legacy', LegacySerialReader), ('bulk', SerialReader)):
+        idle_cpu, rate, received, signals = run_reader(reader_cls, args.idle, args.lines)
+        print(f"{name:<10}{idle_cpu:12.1f}{rate:12.0f}{received:>10}{signals:>13}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# tools/capture_latency.py
+"""
+Mengukur latensi kamera per profil capture (core/capture_profile.py).
+
+Untuk setiap profil, kamera dibuka ulang, dipanaskan beberapa frame, lalu N frame
+dibaca secepat mungkin (seperti CaptureThread). Dicetak: format yang benar-benar
+dinegosiasikan, FPS yang tercapai, lama read() memblokir (p50/p95), umur frame
+menurut timestamp driver (p50/p95, jika backend menyediakannya, mis. V4L2), dan
+jumlah frame basi yang dibuang oleh grab_newest.
+
+Agar umur frame mencerminkan pipeline sungguhan, --work menambahkan jeda per frame
+yang meniru inferensi; dengan buffer default kamera, frame akan menumpuk dan menua.
+
+Contoh:
+    python -m tools.capture_latency 0
+    python -m tools.capture_latency 0 --profiles default low_latency --frames 300 --work 0.05
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from core.capture_profile import CAPTURE_PROFILES, ProfiledCapture
+
+
+def measure(index, profile, frames, warmup, work):
+    """
+    Membuka kamera dengan satu profil dan membaca frame.
+
+    Returns:
+        dict | None: Hasil pengukuran, None jika kamera tidak bisa dibuka.
+    """
+    cap = ProfiledCapture(index, profile)
+    if not cap.isOpened():
+        return None
+    try:
+        for _ in range(warmup):
+            cap.read()
+        cap.drained = 0
+        reads, ages = [], []
+        start = time.perf_counter()
+        for _ in range(frames):
+            t0 = time.perf_counter()
+            ret, _ = cap.read()
+            if not ret:
+                break
+            reads.append(time.perf_counter() - t0)
+            if cap.last_age is not None:
+                ages.append(cap.last_age)
+            if work > 0:
+                time.sleep(work)
+        elapsed = time.perf_counter() - start
+    finally:
+        cap.release()
+    return {'negotiated': cap.negotiated, 'frames': len(reads), 'fps': len(reads) / elapsed if elapsed else 0.0,
+            'read_ms': np.array(reads) * 1000, 'age_ms': np.array(ages) * 1000, 'drained': cap.drained}
+
+
+def percentiles(values_ms):
+    if not len(values_ms):
+        return "     -      -"
+    return f"{np.median(values_ms):6.1f} {np.percentile(values_ms, 95):6.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latensi dan FPS kamera per profil capture.")
+    parser.add_argument('camera', type=int, nargs='?', default=0, help="Indeks kamera (default 0).")
+    parser.add_argument('--profiles', nargs='+', choices=list(CAPTURE_PROFILES), default=list(CAPTURE_PROFILES),
+                        help="Profil yang diukur (default semua).")
+    parser.add_argument('--frames', type=int, default=200, help="Jumlah frame yang diukur per profil.")
+    parser.add_argument('--warmup', type=int, default=30, help="Frame awal yang diabaikan (auto-exposure, dll.).")
+    parser.add_argument('--work', type=float, default=0.0,
+                        help="Jeda per frame (detik) yang meniru inferensi, mis. 0.05.")
+    args = parser.parse_args()
+
+    print(f"Camera {args.camera}, {args.frames} frames per profile, simulated work {args.work * 1000:.0f} ms")
+    print(f"{'profile':<18}{'negotiated':<24}{'FPS':>7}{'read p50/p95 ms':>17}{'age p50/p95 ms':>16}{'drained':>9}")
+    for key in args.profiles:
+        result = measure(args.camera, CAPTURE_PROFILES[key], args.frames, args.warmup, args.work)
+        if result is None:
+            print(f"{key:<18}camera {args.camera} could not be opened")
+            continue
+        neg = result['negotiated']
+        fmt = f"{neg['fourcc'] or '?'} {neg['width']}x{neg['height']}@{neg['fps']:g}"
+        print(f"{key:<18}{fmt:<24}{result['fps']:7.1f}{percentiles(result['read_ms']):>17}"
+              f"{percentiles(result['age_ms']):>16}{result['drained']:9d}")
+    print("age = time since the driver timestamped the frame (V4L2 only); '-' = backend gives no timestamp.")
+
+
+if __name__ == '__main__':
+    main()
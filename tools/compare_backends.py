@@ -0,0 +1,146 @@
+# tools/compare_backends.py
+"""
+Membandingkan backend inferensi CPU (PyTorch, TorchScript, ONNX Runtime, OpenVINO,
+opsional INT8) pada rekaman kita. Untuk setiap backend dilaporkan latensi dan
+pergeseran mAP terhadap keluaran PyTorch (dipakai sebagai acuan/pseudo ground truth).
+Hasilnya juga disimpan di samping bobot (best.backends.json) dan dipakai oleh
+mode backend 'auto' untuk memilih backend tercepat.
+
+Contoh:
+    python -m tools.compare_backends rekaman/frames/ --backends pytorch onnx openvino
+    python -m tools.compare_backends rekaman/misi1.mp4 --int8 --calibration rekaman/kalibrasi/
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from core.backends import BACKENDS, backend_available, report_path
+from core.detector import YoloDetector, DEFAULT_WEIGHTS
+from core.frame_sources import iter_frames
+
+
+def box_iou(box, boxes):
+    """IoU satu kotak [x1, y1, x2, y2] terhadap banyak kotak (M, 4)."""
+    x1 = np.maximum(box[0], boxes[:, 0])
+    y1 = np.maximum(box[1], boxes[:, 1])
+    x2 = np.minimum(box[2], boxes[:, 2])
+    y2 = np.minimum(box[3], boxes[:, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return inter / np.maximum(area + areas - inter, 1e-9)
+
+
+def map_against_reference(predictions, references, iou_thres=0.5):
+    """
+    mAP@iou_thres dari prediksi sebuah backend dengan deteksi PyTorch sebagai acuan.
+
+    Args:
+        predictions (list): Per frame, array (N, 6) [x1, y1, x2, y2, conf, cls].
+        references (list): Per frame, array (M, 6) dari backend acuan.
+
+    Returns:
+        float: Rata-rata AP semua kelas yang muncul di acuan (1.0 = identik).
+    """
+    classes = np.unique(np.concatenate([r[:, 5] for r in references])) if references else []
+    aps = []
+    for cls in classes:
+        scored = [] # (conf, benar/salah)
+        total_refs = 0
+        for pred, ref in zip(predictions, references):
+            ref_boxes = ref[ref[:, 5] == cls, :4]
+            total_refs += len(ref_boxes)
+            matched = np.zeros(len(ref_boxes), dtype=bool)
+            for p in pred[pred[:, 5] == cls][np.argsort(-pred[pred[:, 5] == cls][:, 4])]:
+                hit = False
+                if len(ref_boxes):
+                    ious = box_iou(p[:4], ref_boxes)
+                    ious[matched] = 0
+                    best = int(np.argmax(ious))
+                    if ious[best] >= iou_thres:
+                        matched[best] = True
+                        hit = True
+                scored.append((p[4], hit))
+        if total_refs == 0:
+            continue
+        scored.sort(key=lambda item: -item[0])
+        hits = np.array([hit for _, hit in scored], dtype=np.float64)
+        tp = np.cumsum(hits)
+        recall = np.concatenate([[0.0], tp / total_refs, [1.0]])
+        precision = np.concatenate([[1.0], tp / np.arange(1, len(hits) + 1), [0.0]])
+        precision = np.maximum.accumulate(precision[::-1])[::-1]
+        aps.append(float(np.sum(np.diff(recall) * precision[1:])))
+    return float(np.mean(aps)) if aps else float('nan')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan latensi dan mAP drift antar backend CPU.")
+    parser.add_argument('source', help="File video atau folder gambar rekaman.")
+    parser.add_argument('--weights', default=str(DEFAULT_WEIGHTS))
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument('--int8', action='store_true', help="Sertakan varian INT8 untuk ONNX/OpenVINO.")
+    parser.add_argument('--calibration', default=None, help="Rekaman untuk kalibrasi INT8 (default: source).")
+    parser.add_argument('--img-size', type=int, default=640)
+    parser.add_argument('--frames', type=int, default=200, help="Jumlah frame yang dievaluasi.")
+    args = parser.parse_args()
+
+    frames = []
+    for frame in iter_frames(args.source):
+        frames.append(frame)
+        if len(frames) >= args.frames:
+            break
+    if not frames:
+        raise SystemExit(f"Error: No frames found in {args.source}")
+
+    # PyTorch selalu dijalankan pertama karena menjadi acuan mAP drift.
+    variants = [('pytorch', False)] + [(name, False) for name in args.backends if name != 'pytorch']
+    if args.int8:
+        variants += [(name, True) for name in args.backends if name in ('onnx', 'openvino')]
+
+    results = []
+    reference = None
+    for name, int8 in variants:
+        label = f"{name}{' int8' if int8 else ''}"
+        if not backend_available(name):
+            print(f"{label:<18} dilewati: runtime tidak terpasang")
+            continue
+        try:
+            detector = YoloDetector(args.weights, device='cpu', img_size=args.img_size, backend=name,
+                                    int8=int8, calibration=args.calibration or args.source)
+        except Exception as e:
+            print(f"{label:<18} gagal dimuat/diekspor: {e}")
+            continue
+
+        timings, outputs = [], []
+        for frame in frames:
+            start = time.perf_counter()
+            det = detector.detect(frame)
+            timings.append(time.perf_counter() - start)
+            outputs.append(det.cpu().numpy().reshape(-1, 6))
+        if reference is None:
+            reference = outputs
+        timings_ms = np.array(timings[3:] or timings) * 1000 # Abaikan beberapa frame pertama
+        map_vs_ref = map_against_reference(outputs, reference)
+        result = {'backend': name, 'int8': int8, 'artefact': detector.weights,
+                  'median_ms': float(np.median(timings_ms)), 'p95_ms': float(np.percentile(timings_ms, 95)),
+                  'map50_vs_pytorch': map_vs_ref, 'map_drift': 1.0 - map_vs_ref}
+        results.append(result)
+
+    print()
+    print(f"{'backend':<18}{'median ms':>11}{'p95 ms':>10}{'FPS':>8}{'mAP50 vs pt':>13}{'drift':>8}")
+    for r in results:
+        label = f"{r['backend']}{' int8' if r['int8'] else ''}"
+        print(f"{label:<18}{r['median_ms']:>11.2f}{r['p95_ms']:>10.2f}{1000 / r['median_ms']:>8.1f}"
+              f"{r['map50_vs_pytorch']:>13.3f}{r['map_drift']:>8.3f}")
+
+    report = report_path(args.weights)
+    report.write_text(json.dumps({'source': str(args.source), 'frames': len(frames),
+                                  'img_size': args.img_size, 'results': results}, indent=2))
+    print(f"\nLaporan disimpan ke {report}")
+
+
+if __name__ == '__main__':
+    main()
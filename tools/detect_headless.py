@@ -0,0 +1,122 @@
+# tools/detect_headless.py
+"""
+Menjalankan detektor bola gate tanpa Qt pada file video atau folder gambar.
+Mencetak aliran derajat gate, FPS, dan persentil latensi per tahap sehingga
+model, ambang, dan backend bisa dibandingkan pada rekaman sebelum dipasang di kapal.
+
+Contoh:
+    python -m tools.detect_headless rekaman/misi1.mp4 --conf 0.4
+    python -m tools.detect_headless rekaman/frames/ --weights yolov5/best.pt --quiet
+    python -m tools.detect_headless rekaman/misi1.mp4 --engine hsv
+"""
+
+import argparse
+import time
+
+from core.frame_sources import iter_frames
+from core.gate_detection import find_gate
+from core.perf import StageStats
+from core.tracker import DetectThenTrack
+from core.motion_gate import MotionGate
+from core.roi import RoiSelector, ROI_MODES
+from core.color_detector import HsvBallDetector
+
+
+def create_detector(args):
+    """Membuat detektor dasar sesuai --engine; YOLOv5 (torch) hanya diimpor jika dipakai."""
+    if args.engine == 'hsv':
+        return HsvBallDetector(img_size=args.img_size or 320)
+    from core.detector import YoloDetector, DEFAULT_WEIGHTS
+    return YoloDetector(args.weights or DEFAULT_WEIGHTS, device=args.device, img_size=args.img_size or 640,
+                        conf_thres=args.conf, iou_thres=args.iou, roi_img_size=args.roi_img_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deteksi gate headless dan benchmark throughput.")
+    parser.add_argument('source', help="File video atau folder gambar.")
+    parser.add_argument('--engine', choices=('yolo', 'hsv'), default='yolo',
+                        help="Detektor dasar: YOLOv5 atau threshold warna HSV (tanpa model).")
+    parser.add_argument('--weights', default=None, help="Bobot YOLOv5 (default yolov5/best.pt).")
+    parser.add_argument('--device', default='', help="'' (otomatis), 'cpu', '0', ...")
+    parser.add_argument('--img-size', type=int, default=0,
+                        help="Ukuran input YOLO (default 640) atau sisi frame kerja HSV (default 320).")
+    parser.add_argument('--conf', type=float, default=0.4, help="Ambang confidence NMS.")
+    parser.add_argument('--iou', type=float, default=0.45, help="Ambang IoU NMS.")
+    parser.add_argument('--track-every', type=int, default=0,
+                        help="Mode detect+track: jalankan YOLO setiap N frame dan lacak di antaranya (0 = nonaktif).")
+    parser.add_argument('--track-min-conf', type=float, default=0.5,
+                        help="Deteksi ulang jika kepercayaan pelacak di bawah nilai ini.")
+    parser.add_argument('--track-reacquire', type=int, default=None,
+                        help="Interval deteksi saat tidak ada bola yang dilacak (default: sama dengan --track-every).")
+    parser.add_argument('--motion-threshold', type=float, default=0.0,
+                        help="Pakai ulang deteksi jika selisih thumbnail di bawah nilai ini (0 = nonaktif).")
+    parser.add_argument('--motion-max-skip', type=int, default=10,
+                        help="Maksimum frame berturut-turut yang boleh dilewati motion gate.")
+    parser.add_argument('--roi', choices=ROI_MODES, default='full', help="Batasi inferensi ke pita air.")
+    parser.add_argument('--roi-band', type=float, nargs=2, default=(0.35, 1.0), metavar=('TOP', 'BOTTOM'),
+                        help="Pita tetap untuk --roi band, sebagai fraksi tinggi frame.")
+    parser.add_argument('--roi-img-size', type=int, default=None, help="Ukuran input saat ROI aktif.")
+    parser.add_argument('--max-frames', type=int, default=0, help="0 = semua frame.")
+    parser.add_argument('--quiet', action='store_true', help="Jangan cetak aliran derajat per frame.")
+    args = parser.parse_args()
+
+    detector = create_detector(args)
+    roi_selector = RoiSelector(args.roi, band=tuple(args.roi_band))
+    engine = detector
+    if args.track_every > 0:
+        engine = tracker = DetectThenTrack(detector, interval=args.track_every, min_confidence=args.track_min_conf,
+                                          reacquire_interval=args.track_reacquire)
+    if args.motion_threshold > 0:
+        engine = MotionGate(engine, threshold=args.motion_threshold, max_skip=args.motion_max_skip)
+    stats = StageStats()
+    frames_done = 0
+    gates_seen = 0
+
+    frames = iter_frames(args.source)
+    start = time.perf_counter()
+    while True:
+        t0 = time.perf_counter()
+        frame = next(frames, None)
+        if frame is None:
+            break
+        stats.add('read', time.perf_counter() - t0)
+
+        with stats.measure('roi'):
+            roi = roi_selector.select(frame)
+        det = engine.detect(frame, stats, roi)
+        with stats.measure('gate'):
+            gate = find_gate(det, detector.names, frame.shape[1])
+        stats.add('total', time.perf_counter() - t0)
+
+        if gate.degree is not None:
+            gates_seen += 1
+        if not args.quiet:
+            degree = gate.degree if gate.degree is not None else '-'
+            print(f"frame {frames_done:6d} | detections {len(det):2d} | degree {degree}")
+
+        frames_done += 1
+        if args.max_frames and frames_done >= args.max_frames:
+            break
+    elapsed = time.perf_counter() - start
+
+    print()
+    print(f"Source : {args.source}")
+    if args.engine == 'hsv':
+        print(f"Model  : HSV colour thresholds (working size {detector.img_size})")
+    else:
+        print(f"Model  : {detector.weights} (img {detector.img_size}, conf {args.conf}, iou {args.iou}, "
+              f"device {detector.device})")
+    if args.roi != 'full':
+        roi_input = detector.roi_preprocessor.input_shape if args.engine == 'yolo' else detector.img_size
+        print(f"ROI    : {args.roi}, input {roi_input}")
+    print(f"Frames : {frames_done} in {elapsed:.2f} s -> {frames_done / elapsed if elapsed else 0:.1f} FPS")
+    print(f"Gate   : {gates_seen} frames ({100 * gates_seen / max(frames_done, 1):.1f}%) with a complete gate")
+    if args.track_every > 0:
+        print(f"Track  : {tracker.summary()}")
+    if isinstance(engine, MotionGate):
+        print(f"Motion : {engine.summary()}")
+    print(stats.report())
+
+
+if __name__ == '__main__':
+    main()
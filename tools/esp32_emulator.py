@@ -0,0 +1,362 @@
+# tools/esp32_emulator.py
+"""
+Emulator ESP32 di pseudo-terminal (Linux/macOS) untuk uji beban dan soak test
+stack serial tanpa perangkat keras.
+
+Emulator berbicara dengan protokol yang sama seperti firmware/esp32_asv_controller:
+telemetri teks "T:GPS,...;BAT,...;COMP,...;SPD,..." atau, setelah negosiasi "P:BIN1",
+frame biner COBS + CRC16 (core/binary_protocol.py). Perintah S<pwm>;D<derajat> (atau
+MSG_SETPOINT / MSG_ESTOP) menggerakkan model kapal sederhana: throttle dengan lag orde
+satu, laju belok sebanding kemudi dan kecepatan, posisi diintegrasikan ke lat/lon.
+
+Gangguan yang bisa disuntikkan:
+  --noise       derau sensor (GPS, kompas, kecepatan, baterai)
+  --corrupt     peluang satu pesan dirusak (byte diubah acak)
+  --disconnect-every / --downtime
+                port "dicabut" (pty ditutup, GUI melihat error baca), lalu pty baru
+                dibuat; dengan --link, symlink dipindahkan ke pty baru (seperti ttyUSB0
+                yang muncul kembali), sehingga SerialHandler bisa menyambung ulang.
+                Seperti board tanpa auto-reset, mode protokol bertahan; --reset-on-reconnect
+                meniru board yang ter-reset (kembali ke teks, banner dikirim ulang).
+
+Contoh:
+    python -m tools.esp32_emulator --link /tmp/ttyESP32
+    python -m tools.esp32_emulator --link /tmp/ttyESP32 --rate 2000 --noise 1 --corrupt 0.01 \\
+        --disconnect-every 30 --downtime 3 --duration 600
+Lalu hubungkan GUI (tab Connection) atau SerialHandler ke /tmp/ttyESP32.
+"""
+
+import argparse
+import math
+import os
+import random
+import select
+import time
+import tty
+
+from core.binary_protocol import (FrameDecoder, FrameEncoder, HELLO_ACK, HELLO_REQUEST, MSG_ESTOP, MSG_SETPOINT,
+                                  MSG_TELEMETRY, SETPOINT, TEXT_REQUEST, pack_telemetry)
+from core.line_framer import LineFramer
+
+ORIGIN = (-6.2088, 106.8456) # Sama dengan titik simulasi di firmware
+METERS_PER_DEG_LAT = 111320.0
+
+
+class BoatModel:
+    """
+    Model kapal 2D sederhana. Derajat servo < 90 membelok searah jarum jam (kanan),
+    sesuai konvensi navigation_loop dan set_servo_from_yolo; rudder_sign=-1 membaliknya.
+    """
+    def __init__(self, lat=ORIGIN[0], lon=ORIGIN[1], heading=0.0, max_speed=3.0, max_yaw_rate=30.0,
+                 speed_tau=2.0, rudder_sign=1.0):
+        self.lat, self.lon = lat, lon
+        self.heading = heading # Derajat, 0 = utara, searah jarum jam
+        self.speed = 0.0 # m/s
+        self.battery = 12.6 # V
+        self.max_speed = max_speed
+        self.max_yaw_rate = max_yaw_rate # deg/s pada kecepatan maksimum dan kemudi penuh
+        self.speed_tau = speed_tau
+        self.rudder_sign = rudder_sign
+        self.pwm, self.degree = 1500, 90
+
+    def apply_command(self, pwm, degree):
+        """Sama seperti firmware: PWM dibatasi 1500-2000, derajat 0-180."""
+        self.pwm = min(max(pwm, 1500), 2000)
+        self.degree = min(max(degree, 0), 180)
+
+    def step(self, dt):
+        throttle = (self.pwm - 1500) / 500.0
+        self.speed += (throttle * self.max_speed - self.speed) * min(1.0, dt / self.speed_tau)
+        rudder = self.rudder_sign * (90 - self.degree) / 90.0
+        self.heading = (self.heading + rudder * self.max_yaw_rate * (self.speed / self.max_speed) * dt) % 360.0
+        distance = self.speed * dt
+        rad = math.radians(self.heading)
+        self.lat += distance * math.cos(rad) / METERS_PER_DEG_LAT
+        self.lon += distance * math.sin(rad) / (METERS_PER_DEG_LAT * math.cos(math.radians(self.lat)))
+        self.battery = max(10.5, self.battery - (0.0005 + 0.004 * throttle) * dt)
+
+    def sample(self, rng, noise):
+        """Pembacaan sensor (dengan derau sebanding `noise`)."""
+        gps_sigma = 2.0 * noise / METERS_PER_DEG_LAT # ~2 m per satuan noise
+        return {'lat': self.lat + rng.gauss(0, gps_sigma), 'lon': self.lon + rng.gauss(0, gps_sigma),
+                'sats': max(0, 11 + int(rng.gauss(0, noise))),
+                'battery': self.battery + rng.gauss(0, 0.05 * noise),
+                'heading': (self.heading + rng.gauss(0, 2.0 * noise)) % 360.0,
+                'speed': max(0.0, self.speed + rng.gauss(0, 0.1 * noise))}
+
+
+def text_telemetry(sample):
+    return (f"T:GPS,{sample['lat']:.6f},{sample['lon']:.6f},{sample['sats']};BAT,{sample['battery']:.1f};"
+            f"COMP,{sample['heading']:.0f};SPD,{sample['speed']:.1f}\n").encode()
+
+
+def parse_text_command(line):
+    """Sama seperti processSerialCommand di firmware: S<pwm>;D<derajat>; None jika bukan perintah."""
+    s_pos, d_pos, semicolon = line.find('S'), line.find('D'), line.find(';')
+    if min(s_pos, d_pos, semicolon) < 0:
+        return None
+    try:
+        return int(line[s_pos + 1:semicolon]), int(line[d_pos + 1:])
+    except ValueError:
+        return None
+
+
+class Esp32Emulator:
+    """Satu ESP32 virtual pada pseudo-terminal; lihat docstring modul."""
+    def __init__(self, boat, rate=1.0, noise=0.0, corrupt=0.0, link=None, seed=None, reset_on_reconnect=False):
+        self.boat = boat
+        self.reset_on_reconnect = reset_on_reconnect
+        self.booted = False # True setelah port pertama dibuka (setara board menyala)
+        self.rate = rate
+        self.noise = noise
+        self.corrupt = corrupt
+        self.link = link
+        self.rng = random.Random(seed)
+        self.master = self.slave = None
+        self.device = None
+        self.outbox = bytearray()
+        self.stats = {'messages': 0, 'bytes': 0, 'dropped': 0, 'corrupted': 0, 'commands': 0,
+                      'estops': 0, 'disconnects': 0}
+        self._reset_protocol()
+
+    def _reset_protocol(self):
+        """Seperti ESP32 yang baru reset: kembali ke protokol teks."""
+        self.binary = False
+        self.framer = LineFramer()
+        self.decoder = FrameDecoder()
+        self.encoder = FrameEncoder()
+        self.raw_line = bytearray() # Baris teks mentah di antara frame biner
+        self.raw_valid = True
+
+    def open_port(self):
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.master)
+        tty.setraw(self.slave)
+        os.set_blocking(self.master, False)
+        self.device = os.ttyname(self.slave)
+        if self.link:
+            if os.path.lexists(self.link):
+                os.unlink(self.link)
+            os.symlink(self.device, self.link)
+        self.outbox.clear()
+        if self.reset_on_reconnect or not self.booted:
+            self.booted = True
+            self._reset_protocol()
+            self.write(b"ESP32 Siap Menerima Perintah...\r\n")
+        print(f"ESP32 emulator listening on {self.link or self.device}"
+              f"{f' -> {self.device}' if self.link else ''}")
+
+    def close_port(self):
+        """Mencabut port: pihak GUI mendapat error baca dan harus menyambung ulang."""
+        if self.link and os.path.lexists(self.link):
+            os.unlink(self.link)
+        for fd in (self.master, self.slave):
+            if fd is not None:
+                os.close(fd)
+        self.master = self.slave = None
+        self.stats['disconnects'] += 1
+
+    def write(self, data):
+        """Mengantrekan balasan kontrol (banner, HELLO_ACK); tidak pernah dibuang."""
+        self.outbox += data
+        self.flush()
+
+    def flush(self):
+        """Menulis isi outbox tanpa blokir; sisanya dikirim saat pty bisa ditulis lagi."""
+        if not self.outbox:
+            return
+        try:
+            written = os.write(self.master, self.outbox)
+        except BlockingIOError:
+            written = 0
+        del self.outbox[:written]
+        self.stats['bytes'] += written
+
+    def _maybe_corrupt(self, message):
+        if self.corrupt <= 0 or self.rng.random() >= self.corrupt:
+            return message
+        self.stats['corrupted'] += 1
+        data = bytearray(message)
+        for _ in range(self.rng.randint(1, 3)):
+            data[self.rng.randrange(len(data))] = self.rng.randrange(256)
+        return bytes(data)
+
+    def send_telemetry(self, count, now_ms):
+        """
+        Mengirim `count` pesan telemetri dalam satu write() (laju tinggi dikirim per batch).
+        Jika pty penuh (GUI tidak membaca), pesan dibuang utuh seperti buffer TX UART yang
+        penuh, sehingga aliran tidak pernah terpotong di tengah pesan.
+        """
+        self.flush()
+        if self.outbox:
+            self.stats['dropped'] += count
+            return
+        chunks = []
+        for _ in range(count):
+            sample = self.boat.sample(self.rng, self.noise)
+            if self.binary:
+                message = self.encoder.encode(MSG_TELEMETRY, pack_telemetry(now_ms, **sample))
+            else:
+                message = text_telemetry(sample)
+            chunks.append(self._maybe_corrupt(message))
+        self.stats['messages'] += count
+        self.outbox += b"".join(chunks)
+        self.flush()
+
+    def _enter_binary(self):
+        # Baris kosong dulu agar konfirmasi tetap satu baris utuh meski aliran biner sedang berjalan.
+        self.write(f"\r\n{HELLO_ACK}\r\n".encode())
+        self.binary = True
+        self.decoder.buffer.clear()
+        self.raw_line.clear()
+        self.raw_valid = True
+
+    def _apply_text_command(self, line):
+        command = parse_text_command(line)
+        if command is None:
+            return False
+        self.boat.apply_command(*command)
+        self.stats['commands'] += 1
+        return True
+
+    def _apply_frames(self, frames):
+        for msg_type, _, payload in frames:
+            if msg_type == MSG_SETPOINT and len(payload) == SETPOINT.size:
+                self.boat.apply_command(*SETPOINT.unpack(payload))
+                self.stats['commands'] += 1
+            elif msg_type == MSG_ESTOP:
+                self.boat.apply_command(1500, 90)
+                self.stats['estops'] += 1
+
+    def _handle_binary(self, data):
+        """
+        Sama seperti processBinaryInput di firmware: frame COBS, ditambah baris teks mentah
+        di antaranya ("P:BIN1" dijawab ulang, "P:TXT" kembali ke teks, setpoint teks dipakai).
+        """
+        start = 0
+        for pos, value in enumerate(data):
+            if value == 0x0A:
+                line = self.raw_line.decode() if self.raw_valid else ''
+                self.raw_line.clear()
+                self.raw_valid = True
+                is_text = line in (HELLO_REQUEST, TEXT_REQUEST) or (line.startswith('S')
+                                                                    and parse_text_command(line) is not None)
+                if not is_text:
+                    continue # Bukan baris teks: byte ini bagian dari frame
+                # Frame sebelum baris ini diproses dulu; byte baris teks dibuang dari buffer frame.
+                self._apply_frames(self.decoder.feed(data[start:pos]))
+                self.decoder.buffer.clear()
+                start = pos + 1
+                if line == HELLO_REQUEST:
+                    self._enter_binary()
+                elif line == TEXT_REQUEST:
+                    self.binary = False
+                    self.handle_input(data[start:])
+                    return
+                else:
+                    self._apply_text_command(line)
+            elif value == 0x00:
+                self.raw_line.clear()
+                self.raw_valid = True
+            elif value != 0x0D:
+                if 0x20 <= value < 0x7F and len(self.raw_line) < 31:
+                    self.raw_line.append(value)
+                else:
+                    self.raw_valid = False
+        self._apply_frames(self.decoder.feed(data[start:]))
+
+    def handle_input(self, data):
+        """Memproses byte dari GUI: negosiasi protokol dan perintah setpoint/e-stop."""
+        if self.binary:
+            self._handle_binary(data)
+            return
+        for line in self.framer.feed(data):
+            if line == HELLO_REQUEST:
+                self._enter_binary()
+                # Sisa byte setelah permintaan (jika ada) sudah berupa frame biner.
+                self.handle_input(self.framer.take_buffer())
+                return
+            self._apply_text_command(line)
+
+    def run(self, duration=None, disconnect_every=None, downtime=2.0, report_every=5.0):
+        self.open_port()
+        start = last = time.monotonic()
+        next_report = start + report_every
+        next_send = start
+        next_disconnect = start + disconnect_every if disconnect_every else None
+        interval = 1.0 / self.rate
+        try:
+            while duration is None or last - start < duration:
+                timeout = max(0.0, min(next_send - time.monotonic(), 0.05))
+                readable, writable, _ = select.select([self.master], [self.master] if self.outbox else [], [],
+                                                      timeout)
+                now = time.monotonic()
+                self.boat.step(now - last)
+                last = now
+                if readable:
+                    try:
+                        data = os.read(self.master, 4096)
+                    except (BlockingIOError, OSError):
+                        data = b''
+                    if data:
+                        self.handle_input(data)
+                if writable:
+                    self.flush()
+                if now >= next_send:
+                    due = int((now - next_send) / interval) + 1
+                    # Satu batch paling banyak 50 ms data; jika loop tertinggal lebih jauh,
+                    # sisanya dihitung sebagai pesan yang dibuang agar laporan soak tetap jujur.
+                    sent = min(due, max(1, int(self.rate * 0.05)))
+                    self.send_telemetry(sent, int((now - start) * 1000))
+                    self.stats['dropped'] += due - sent
+                    next_send += due * interval
+                if next_disconnect is not None and now >= next_disconnect:
+                    print(f"Emulator: disconnecting for {downtime:.1f} s")
+                    self.close_port()
+                    time.sleep(downtime)
+                    self.open_port()
+                    last = time.monotonic()
+                    next_send = last
+                    next_disconnect = last + disconnect_every
+                if now >= next_report:
+                    next_report = now + report_every
+                    self.report(now - start)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.report(time.monotonic() - start)
+            self.close_port()
+
+    def report(self, elapsed):
+        s, boat = self.stats, self.boat
+        print(f"[{elapsed:7.1f} s] {'binary' if self.binary else 'text'} | sent {s['messages']} msgs "
+              f"({s['messages'] / max(elapsed, 1e-9):.0f}/s, {s['dropped']} dropped, "
+              f"{s['corrupted']} corrupted) | {s['commands']} cmds, {s['estops']} e-stops, "
+              f"{s['disconnects']} disconnects | boat pwm {boat.pwm} servo {boat.degree} "
+              f"hdg {boat.heading:.0f} spd {boat.speed:.1f} m/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Emulator ESP32 di pseudo-terminal untuk uji stack serial.")
+    parser.add_argument('--link', default=None, help="Symlink stabil ke pty, mis. /tmp/ttyESP32.")
+    parser.add_argument('--rate', type=float, default=1.0, help="Laju telemetri (pesan/detik), 1 hingga ribuan.")
+    parser.add_argument('--noise', type=float, default=0.0, help="Skala derau sensor (0 = tanpa derau).")
+    parser.add_argument('--corrupt', type=float, default=0.0, help="Peluang sebuah pesan dirusak (0-1).")
+    parser.add_argument('--disconnect-every', type=float, default=None, help="Cabut port setiap N detik.")
+    parser.add_argument('--downtime', type=float, default=2.0, help="Lama port tercabut (detik).")
+    parser.add_argument('--duration', type=float, default=None, help="Berhenti setelah N detik (default: Ctrl+C).")
+    parser.add_argument('--rudder-sign', type=float, choices=(1.0, -1.0), default=1.0,
+                        help="1: servo < 90 belok kanan (konvensi navigasi otomatis), -1: kebalikannya.")
+    parser.add_argument('--reset-on-reconnect', action='store_true',
+                        help="Tiru board yang ter-reset saat port dibuka ulang (kembali ke protokol teks).")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    boat = BoatModel(rudder_sign=args.rudder_sign)
+    emulator = Esp32Emulator(boat, rate=args.rate, noise=args.noise, corrupt=args.corrupt, link=args.link,
+                             seed=args.seed, reset_on_reconnect=args.reset_on_reconnect)
+    emulator.run(args.duration, args.disconnect_every, args.downtime)
+
+
+if __name__ == '__main__':
+    main()